@@ -7,16 +7,38 @@ TASK: TASK-301
 
 import sys
 import os
-import json
 from pathlib import Path
-from typing import Dict, Any, Optional
-import tempfile
-import yaml
+from typing import Dict, Any, List, Optional, Union
 
 
 class EmergeAnalyzer:
     """Wrapper for Emerge code analysis engine"""
     
+    # Map language to file extensions
+    EXTENSION_MAP = {
+        'py': ['.py'],
+        'javascript': ['.js'],
+        'typescript': ['.ts'],
+        'java': ['.java'],
+        'cpp': ['.cpp', '.cc', '.cxx'],
+        'c': ['.c', '.h'],
+        'go': ['.go'],
+        'ruby': ['.rb'],
+    }
+    
+    # Map file extension to language
+    LANGUAGE_BY_EXTENSION = {
+        extension: language
+        for language, extensions in EXTENSION_MAP.items()
+        for extension in extensions
+    }
+    
+    # Languages below this share of the repository's source bytes are not analyzed
+    MIN_LANGUAGE_SHARE = 0.01
+    
+    # Directories that are never analyzed (VCS metadata, dependencies, virtual environments)
+    IGNORE_DIRECTORIES = ['.git', 'node_modules', '.venv', 'venv', '__pycache__']
+    
     def __init__(self, emerge_path: Optional[str] = None):
         """
         Initialize Emerge analyzer
@@ -37,33 +59,36 @@ class EmergeAnalyzer:
         # Add emerge to Python path
         if str(self.emerge_path) not in sys.path:
             sys.path.insert(0, str(self.emerge_path))
+        
+        self._inventory = None
     
-    def create_config(self, repo_path: str, language: str = 'py') -> str:
+    def create_config(
+        self,
+        repo_path: str,
+        language: Union[str, List[str]] = 'py',
+        only_files: Optional[List[str]] = None,
+        export_dir: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Create Emerge config file for analysis
+        Create Emerge config for analysis
+        
+        All given languages are analyzed in one filesystem scan.
         
         Args:
             repo_path: Path to repository to analyze
-            language: Primary language (py, javascript, java, etc.)
+            language: Language or list of languages (py, javascript, java, etc.)
+            only_files: Only scan these files, relative to repo_path (optional)
+            export_dir: Also export JSON/GraphML results to this directory (optional)
             
         Returns:
-            str: Path to config file
-        """
-        output_dir = tempfile.mkdtemp(prefix='emerge_output_')
-        
-        # Map language to file extensions
-        extension_map = {
-            'py': ['.py'],
-            'javascript': ['.js'],
-            'typescript': ['.ts'],
-            'java': ['.java'],
-            'cpp': ['.cpp', '.cc', '.cxx'],
-            'c': ['.c', '.h'],
-            'go': ['.go'],
-            'ruby': ['.rb'],
-        }
-        
-        extensions = extension_map.get(language, ['.py'])
+            dict: Emerge config (same structure as an Emerge YAML config)
+        """
+        languages = [language] if isinstance(language, str) else list(language)
+        extensions = [
+            extension
+            for name in languages
+            for extension in self.EXTENSION_MAP.get(name, ['.py'])
+        ]
         
         config = {
             'project_name': 'analysis',
@@ -72,100 +97,96 @@ class EmergeAnalyzer:
                 {
                     'analysis_name': 'code_analysis',
                     'source_directory': str(repo_path),
-                    'only_permit_languages': [language],
+                    'only_permit_languages': languages,
                     'only_permit_file_extensions': extensions,
+                    'ignore_directories_containing': list(self.IGNORE_DIRECTORIES),
                     'file_scan': [
                         'number_of_methods',
                         'source_lines_of_code',
                         'dependency_graph',
                     ],
-                    'export': [
-                        {'directory': output_dir},
-                        'json',
-                        'graphml',
-                    ]
                 }
             ]
         }
         
-        config_file = tempfile.NamedTemporaryFile(
-            mode='w',
-            suffix='.yaml',
-            delete=False
-        )
-        yaml.dump(config, config_file)
-        config_file.close()
+        # Results are handed over in-process, exporting to disk is opt-in
+        if export_dir:
+            config['analyses'][0]['export'] = [
+                {'directory': export_dir},
+                'json',
+                'graphml',
+            ]
         
-        return config_file.name
+        # Restrict the scan to a subset of files, e.g. for incremental analysis
+        if only_files is not None:
+            config['analyses'][0]['only_permit_files_matching_absolute_path'] = [
+                os.path.join(str(repo_path), file_path) for file_path in only_files
+            ]
+        
+        # Reuse parsed files of unchanged sources across analyses (optional)
+        parse_cache_dir = os.getenv('EMERGE_PARSE_CACHE_DIR', '').strip()
+        if parse_cache_dir:
+            config['analyses'][0]['parse_cache_directory'] = parse_cache_dir
+        
+        return config
     
-    def run_analysis(self, repo_path: str, language: str = 'py') -> Dict[str, Any]:
+    def run_analysis(
+        self,
+        repo_path: str,
+        language: Union[str, List[str]] = 'py',
+        only_files: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Run Emerge analysis on repository
         
         Args:
             repo_path: Path to repository
-            language: Primary language
+            language: Language or list of languages
+            only_files: Only scan these files, relative to repo_path (optional)
             
         Returns:
             dict: Analysis results with metrics and graph data
         """
-        # Create config
-        config_file = self.create_config(repo_path, language)
+        export_dir = os.getenv('EMERGE_EXPORT_DIR', '').strip() or None
+        config = self.create_config(repo_path, language, only_files, export_dir)
         
-        try:
-            # Import Emerge
-            from emerge.appear import Emerge
-            
-            # Run analysis
-            emerge = Emerge()
-            emerge.load_config(config_file)
-            emerge.start_analyzing()  # Use start_analyzing() not start()
-            
-            # Parse output
-            output_dir = self._get_output_dir(config_file)
-            results = self._parse_output(output_dir)
-            
-            return results
-            
-        finally:
-            # Cleanup config file
-            if os.path.exists(config_file):
-                os.unlink(config_file)
-    
-    def _get_output_dir(self, config_file: str) -> str:
-        """Extract output directory from config"""
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
-        return config['analyses'][0]['export'][0]['directory']
+        # Import Emerge
+        from emerge.appear import Emerge
+        
+        # Run analysis in-process, results are read from the returned analysis
+        emerge = Emerge()
+        inventory = self.create_inventory(repo_path)
+        analyses = emerge.analyze(config, inventories={inventory.root_directory: inventory})
+        
+        return self._parse_analysis(analyses[0])
     
-    def _parse_output(self, output_dir: str) -> Dict[str, Any]:
+    def _parse_analysis(self, analysis) -> Dict[str, Any]:
         """
-        Parse Emerge output files
+        Transform an Emerge analysis to our result format
         
         Args:
-            output_dir: Directory containing Emerge output
+            analysis: Completed Emerge analysis
             
         Returns:
             dict: Parsed analysis results with dependencies
         """
-        # Find JSON output file
-        output_path = Path(output_dir)
-        json_files = list(output_path.glob('*.json'))
+        from emerge.export import JSONExporter
+        from emerge.graph import GraphType
         
-        if not json_files:
-            raise FileNotFoundError(f"No JSON output found in {output_dir}")
-        
-        # Load JSON
-        with open(json_files[0], 'r') as f:
-            data = json.load(f)
+        # Same structure as Emerge's JSON export
+        data = JSONExporter.statistics_and_metrics_as_dict(
+            analysis.get_statistics(),
+            analysis.get_overall_metric_results(),
+            analysis.get_local_metric_results(),
+            analysis.analysis_name
+        )
         
-        # Parse GraphML for dependencies
-        dependencies = {}
         # Use filesystem graph (has folder structure edges)
-        graphml_files = list(output_path.glob('*filesystem*.graphml'))
-        
-        if graphml_files:
-            dependencies = self._parse_graphml_dependencies(graphml_files[0])
+        dependencies: Dict[str, list] = {}
+        filesystem_graph = analysis.graph_representations.get(GraphType.FILESYSTEM_GRAPH.name.lower())
+        if filesystem_graph is not None:
+            for source, target in filesystem_graph.digraph.edges():
+                dependencies.setdefault(source, []).append(target)
         
         # Transform to our format
         result = {
@@ -178,41 +199,26 @@ class EmergeAnalyzer:
         
         return result
     
-    def _parse_graphml_dependencies(self, graphml_file: Path) -> Dict[str, list]:
+    def create_inventory(self, repo_path: str):
         """
-        Parse GraphML file to extract dependencies
+        Walk the repository once, the inventory is reused by language detection and Emerge
         
         Args:
-            graphml_file: Path to GraphML file
+            repo_path: Path to repository
             
         Returns:
-            dict: Map of source -> [targets]
+            RepositoryInventory: Directory structure and per-language file statistics
         """
-        import xml.etree.ElementTree as ET
+        from emerge.inventory import RepositoryInventory
         
-        dependencies = {}
+        if self._inventory is None or not self._inventory.matches(str(repo_path), self.IGNORE_DIRECTORIES, []):
+            self._inventory = RepositoryInventory.scan(
+                str(repo_path),
+                ignore_directories_containing=self.IGNORE_DIRECTORIES,
+                language_extensions=self.LANGUAGE_BY_EXTENSION
+            )
         
-        try:
-            tree = ET.parse(graphml_file)
-            root = tree.getroot()
-            
-            # GraphML namespace
-            ns = {'g': 'http://graphml.graphdrawing.org/xmlns'}
-            
-            # Find all edges
-            for edge in root.findall('.//g:edge', ns):
-                source = edge.get('source')
-                target = edge.get('target')
-                
-                if source and target:
-                    if source not in dependencies:
-                        dependencies[source] = []
-                    dependencies[source].append(target)
-        
-        except Exception as e:
-            print(f"Warning: Could not parse GraphML: {e}")
-        
-        return dependencies
+        return self._inventory
     
     def detect_language(self, repo_path: str) -> str:
         """
@@ -224,29 +230,56 @@ class EmergeAnalyzer:
         Returns:
             str: Detected language (py, javascript, java, etc.)
         """
-        # Simple detection based on file extensions
-        path = Path(repo_path)
-        
-        extensions = {
-            '.py': 'py',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.java': 'java',
-            '.cpp': 'cpp',
-            '.c': 'c',
-            '.go': 'go',
-            '.rb': 'ruby',
-        }
+        # Language with most files, from a single walk of the repository
+        return self.detect_languages(repo_path)[0]
+    
+    def detect_languages(self, repo_path: str) -> List[str]:
+        """
+        Auto-detect all languages worth analyzing in repository
+        
+        Args:
+            repo_path: Path to repository
+            
+        Returns:
+            list: Languages, primary language (most files) first
+        """
+        inventory = self.create_inventory(repo_path)
+        primary = inventory.primary_language(self.EXTENSION_MAP.keys())
+        if primary is None:
+            return ['py']  # Default
         
-        counts = {}
-        for ext, lang in extensions.items():
-            count = len(list(path.rglob(f'*{ext}')))
-            if count > 0:
-                counts[lang] = count
+        total_bytes = sum(stats.bytes for stats in inventory.languages.values())
+        languages = [
+            language for language in self.EXTENSION_MAP
+            if language in inventory.languages and (
+                language == primary or
+                total_bytes == 0 or
+                inventory.languages[language].bytes / total_bytes >= self.MIN_LANGUAGE_SHARE
+            )
+        ]
         
-        if not counts:
-            return 'py'  # Default
+        # Most files first, ties keep the order of EXTENSION_MAP (like detect_language)
+        return sorted(languages, key=lambda language: -inventory.languages[language].files)
+    
+    def calculate_language_shares(self, sloc_by_file: Dict[str, int], languages: List[str]) -> Dict[str, float]:
+        """
+        Calculate each language's share of the analyzed source lines
         
-        # Return language with most files
-        return max(counts, key=counts.get)
-
+        Args:
+            sloc_by_file: Source lines of code by file path
+            languages: Analyzed languages
+            
+        Returns:
+            dict: Percentage of source lines by language
+        """
+        totals = {language: 0 for language in languages}
+        for file_path, sloc in sloc_by_file.items():
+            language = self.LANGUAGE_BY_EXTENSION.get(os.path.splitext(file_path)[1])
+            if language in totals:
+                totals[language] += sloc or 0
+        
+        total = sum(totals.values())
+        return {
+            language: round(100 * sloc / total, 1) if total else 0.0
+            for language, sloc in totals.items()
+        }
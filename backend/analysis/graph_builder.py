@@ -5,7 +5,7 @@ PRD Reference: PRD.md p.45, Graph Data
 TASK: TASK-303
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Optional
 
 
 class GraphBuilder:
@@ -48,6 +48,126 @@ class GraphBuilder:
             'edges': edges
         }
     
+    @staticmethod
+    def patch_graph(
+        graph_data: Dict[str, Any],
+        removed_files: Iterable[str],
+        file_metrics: Dict[str, Dict[str, int]],
+        dependencies: Optional[Dict[str, List[str]]] = None,
+        existing_directories: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Patch a previously built graph with the results of a partial analysis
+        
+        Nodes of removed files and their edges are dropped, nodes and edges of the
+        (re-)analyzed files are added. Directory edges are taken from the partial
+        analysis, which always scans the complete directory tree. If no partial
+        analysis ran, directory edges are kept for all existing directories.
+        
+        Args:
+            graph_data: Graph data of the previous analysis
+            removed_files: Node ids of deleted and re-analyzed files
+            file_metrics: File-level metrics of the partial analysis
+            dependencies: File dependencies of the partial analysis (optional)
+            existing_directories: Node ids of all current directories (optional)
+            
+        Returns:
+            dict: Graph data with nodes and edges
+        """
+        removed = set(removed_files)
+        nodes = [node for node in graph_data.get('nodes', []) if node['id'] not in removed]
+        node_ids = {node['id'] for node in nodes}
+        
+        edges = []
+        if dependencies:
+            # keep edges to unchanged files, directory edges come with the partial analysis
+            edges = [edge for edge in graph_data.get('edges', []) if edge['target'] in node_ids]
+        elif existing_directories is not None:
+            directories = set(existing_directories)
+            edges = [
+                edge for edge in graph_data.get('edges', [])
+                if edge['target'] not in removed and edge['source'] not in removed
+                and (edge['target'] in node_ids or edge['target'] in directories)
+            ]
+        
+        patch = GraphBuilder.build_graph_from_emerge(file_metrics, dependencies)
+        nodes.extend(node for node in patch['nodes'] if node['id'] not in node_ids)
+        
+        edge_ids = {edge['id'] for edge in edges}
+        for edge in patch['edges']:
+            if edge['id'] not in edge_ids:
+                edge_ids.add(edge['id'])
+                edges.append(edge)
+        
+        return {
+            'nodes': nodes,
+            'edges': edges
+        }
+    
+    @staticmethod
+    def rename_root(graph_data: Dict[str, Any], old_root: str, new_root: str) -> Dict[str, Any]:
+        """
+        Move all node and edge ids of a graph to a new root directory name
+        
+        Args:
+            graph_data: Graph data with ids relative to old_root's parent
+            old_root: Previous name of the repository directory
+            new_root: Current name of the repository directory
+            
+        Returns:
+            dict: Graph data with renamed ids
+        """
+        if old_root == new_root:
+            return graph_data
+        
+        def rename(node_id: str) -> str:
+            if node_id == old_root:
+                return new_root
+            if node_id.startswith(old_root + '/'):
+                return new_root + node_id[len(old_root):]
+            return node_id
+        
+        nodes = []
+        for node in graph_data.get('nodes', []):
+            node_id = rename(node['id'])
+            nodes.append({**node, 'id': node_id, 'data': {**node['data'], 'path': node_id}})
+        
+        edges = [
+            GraphBuilder._create_edge(rename(edge['source']), rename(edge['target']))
+            for edge in graph_data.get('edges', [])
+        ]
+        
+        return {
+            'nodes': nodes,
+            'edges': edges
+        }
+    
+    @staticmethod
+    def calculate_overall_metrics(graph_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Calculate the overall file metrics from the nodes of a graph
+        
+        Mirrors the aggregates of Emerge's SLOC and number of methods metrics.
+        
+        Args:
+            graph_data: Graph data with nodes
+            
+        Returns:
+            dict: Overall metrics
+        """
+        nodes = graph_data.get('nodes', [])
+        if not nodes:
+            return {}
+        
+        total_loc = sum(node['data'].get('loc', 0) for node in nodes)
+        total_methods = sum(node['data'].get('methods', 0) for node in nodes)
+        
+        return {
+            'avg-sloc-in-file': round(total_loc / len(nodes), 2),
+            'total-sloc-in-files': total_loc,
+            'avg-number-of-methods-in-file': round(total_methods / len(nodes), 2),
+        }
+    
     @staticmethod
     def _create_node(file_path: str, metrics: Dict[str, int]) -> Dict[str, Any]:
         """
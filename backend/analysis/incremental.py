@@ -0,0 +1,216 @@
+"""
+Incremental re-analysis of a repository
+
+Re-analyzes a new commit based on a previous analysis of the same repository:
+only added and modified files are parsed again, deleted files are dropped and
+the stored graph is patched and the overall metrics are recomputed from it.
+
+PRD Reference: PRD.md p.41, Analysis Engine Flow
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy.orm import Session
+
+from analysis.emerge_wrapper import EmergeAnalyzer
+from analysis.graph_builder import GraphBuilder
+from database.models import Analysis
+from github.client import GitHubClient
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalAnalyzer:
+    """Patch the results of a previous analysis with the changes of a new commit"""
+
+    # Fall back to a full analysis if more files changed than this share of the graph
+    MAX_CHANGE_RATIO = float(os.getenv('INCREMENTAL_MAX_CHANGE_RATIO', '0.3'))
+
+    def __init__(self, emerge_analyzer: EmergeAnalyzer):
+        self.emerge_analyzer = emerge_analyzer
+
+    def analyze(
+        self,
+        db: Session,
+        github_url: str,
+        repo_path: str,
+        commit_sha: str,
+        languages: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Analyze a cloned repository, incrementally if a previous analysis exists
+
+        Falls back to a full analysis if there is no previous analysis, too many
+        files changed or the incremental analysis fails.
+
+        Args:
+            db: Database session
+            github_url: GitHub repository URL
+            repo_path: Path to cloned repository
+            commit_sha: Commit SHA of the cloned repository
+            languages: Analyzed languages, primary language first
+
+        Returns:
+            dict: total_files, total_loc, metrics, languages and graph_data
+        """
+        previous = self.find_previous_analysis(db, github_url, commit_sha, languages)
+        if previous:
+            try:
+                summary = self.run(repo_path, previous, languages)
+                if summary is not None:
+                    return summary
+            except Exception as e:
+                logger.warning(f"Incremental analysis failed ({e}), running full analysis")
+
+        results = self.emerge_analyzer.run_analysis(repo_path, languages)
+        sloc_by_file = {
+            file_path: metrics.get('sloc-in-file', 0)
+            for file_path, metrics in results['file_metrics'].items()
+        }
+
+        return {
+            'total_files': results['statistics'].get('scanned_files', 0),
+            'total_loc': results['overall_metrics'].get('total-sloc-in-files', 0),
+            'metrics': results['overall_metrics'],
+            'languages': self.emerge_analyzer.calculate_language_shares(sloc_by_file, languages),
+            # Transform to graph format (include dependencies)
+            'graph_data': GraphBuilder.build_graph_from_emerge(
+                results['file_metrics'],
+                results.get('dependencies', {})
+            ),
+        }
+
+    @staticmethod
+    def find_previous_analysis(
+        db: Session,
+        github_url: str,
+        commit_sha: str,
+        languages: List[str]
+    ) -> Optional[Analysis]:
+        """
+        Find the latest completed analysis of the same repository at another commit
+
+        Args:
+            db: Database session
+            github_url: GitHub repository URL
+            commit_sha: Commit SHA of the new analysis
+            languages: Analyzed languages of the new analysis, primary language first
+
+        Returns:
+            Analysis: Previous analysis, or None if there is none to start from
+        """
+        previous = db.query(Analysis).filter(
+            Analysis.github_url == github_url,
+            Analysis.status == 'completed',
+            Analysis.commit_sha.isnot(None),
+            Analysis.commit_sha != commit_sha,
+            Analysis.primary_language == languages[0],
+            Analysis.graph_data.isnot(None),
+        ).order_by(Analysis.completed_at.desc()).first()
+
+        # The previous analysis must have covered the same languages
+        if previous is not None:
+            previous_languages = set(previous.languages or [previous.primary_language])
+            if previous_languages != set(languages):
+                return None
+
+        return previous
+
+    def run(self, repo_path: str, previous: Analysis, languages: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Re-analyze the checked out commit based on a previous analysis
+
+        Args:
+            repo_path: Path to cloned repository (checked out at the new commit)
+            previous: Completed analysis of an earlier commit
+            languages: Analyzed languages
+
+        Returns:
+            dict: total_files, total_loc, metrics, languages and graph_data, or None if
+                  a full analysis is required
+        """
+        if not GitHubClient.fetch_commit(repo_path, previous.commit_sha):
+            logger.info(f"Commit {previous.commit_sha} not available, running full analysis")
+            return None
+
+        changes = GitHubClient.get_changed_files(repo_path, previous.commit_sha)
+        extensions = tuple(
+            extension
+            for language in languages
+            for extension in self.emerge_analyzer.EXTENSION_MAP.get(language, ['.py'])
+        )
+        added = [path for path in changes['added'] if path.endswith(extensions)]
+        modified = [path for path in changes['modified'] if path.endswith(extensions)]
+        deleted = [path for path in changes['deleted'] if path.endswith(extensions)]
+
+        graph_data = previous.graph_data or {}
+        previous_nodes = graph_data.get('nodes', [])
+        changed_files = len(added) + len(modified) + len(deleted)
+
+        if changed_files > max(1, len(previous_nodes)) * self.MAX_CHANGE_RATIO:
+            logger.info(f"{changed_files} changed files, running full analysis")
+            return None
+
+        # Node ids are relative to the parent of the repository directory
+        root_name = Path(repo_path).name
+        if previous_nodes:
+            previous_root = previous_nodes[0]['id'].split('/')[0]
+            graph_data = GraphBuilder.rename_root(graph_data, previous_root, root_name)
+
+        logger.info(
+            f"Incremental analysis from {previous.commit_sha}: "
+            f"{len(added)} added, {len(modified)} modified, {len(deleted)} deleted"
+        )
+
+        # Re-analyze added and modified files only
+        file_metrics: Dict[str, Dict[str, int]] = {}
+        dependencies: Dict[str, List[str]] = {}
+        scanned_files = 0
+        if added or modified:
+            results = self.emerge_analyzer.run_analysis(repo_path, languages, only_files=added + modified)
+            file_metrics = results['file_metrics']
+            dependencies = results.get('dependencies', {})
+            scanned_files = results['statistics'].get('scanned_files', 0)
+
+        removed_files = [f"{root_name}/{path}" for path in deleted + modified + added]
+        existing_directories = self._list_directories(repo_path)
+
+        previous_node_ids = {node['id'] for node in graph_data.get('nodes', [])}
+        removed_scanned_files = sum(1 for node_id in removed_files if node_id in previous_node_ids)
+
+        graph_data = GraphBuilder.patch_graph(
+            graph_data,
+            removed_files,
+            file_metrics,
+            dependencies,
+            existing_directories
+        )
+
+        # Recompute every overall metric of the full analysis from the patched graph,
+        # metrics of the previous analysis that can't be recomputed are dropped instead of going stale
+        metrics = GraphBuilder.calculate_overall_metrics(graph_data)
+
+        sloc_by_file = {node['id']: node['data'].get('loc', 0) for node in graph_data['nodes']}
+
+        return {
+            'total_files': max(0, (previous.total_files or 0) - removed_scanned_files + scanned_files),
+            'total_loc': metrics.get('total-sloc-in-files', 0),
+            'metrics': metrics,
+            'languages': self.emerge_analyzer.calculate_language_shares(sloc_by_file, languages),
+            'graph_data': graph_data,
+        }
+
+    def _list_directories(self, repo_path: str) -> List[str]:
+        """List all directory node ids of a repository, like Emerge's filesystem graph"""
+        inventory = self.emerge_analyzer.create_inventory(repo_path)
+        parent = f"{Path(repo_path).parent}/"
+
+        directories = [Path(repo_path).name]
+        for root, dirs, _ in inventory.walk():
+            relative_root = root.replace(parent, "", 1)
+            directories.extend(f"{relative_root}/{directory}" for directory in dirs)
+
+        return directories
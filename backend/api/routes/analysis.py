@@ -13,8 +13,10 @@ from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 
 from api.schemas.analysis import AnalyzeRequest, AnalyzeResponse, AnalysisStatus
+from database.cache import AnalysisResultCache
 from database.db import get_db
 from database.models import Analysis
+from github.client import GitHubClient
 from github.validators import validate_github_url, GitHubURLError
 
 router = APIRouter(prefix="/api", tags=["analysis"])
@@ -48,16 +50,32 @@ async def start_analysis(
     except GitHubURLError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    # Resolve the remote head commit without cloning
+    commit_sha = GitHubClient.get_remote_head_sha(request.github_url)
+
     # Create analysis record
     analysis = Analysis(
         id=str(uuid.uuid4()),
         github_url=request.github_url,
         repository_name=repository_name,
+        commit_sha=commit_sha,
         status='pending'
     )
 
-    db.add(analysis)
-    db.commit()
+    if commit_sha:
+        # Reuse a completed or running analysis of the same commit (single-flight)
+        cached = AnalysisResultCache.claim(db, analysis, commit_sha, request.options)
+        if cached.id != analysis.id:
+            completed = cached.status == 'completed'
+            return AnalyzeResponse(
+                analysis_id=cached.id,
+                status=cached.status,
+                estimated_time=0 if completed else 45,
+                message="Analysis loaded from cache" if completed else "Analysis already in progress"
+            )
+    else:
+        db.add(analysis)
+        db.commit()
     db.refresh(analysis)
 
     # Queue Celery task (or run synchronously if Celery not available)
@@ -75,9 +93,8 @@ async def start_analysis(
 
     if not queued:
         # Import analysis functions only when needed
-        from github.client import GitHubClient
         from analysis.emerge_wrapper import EmergeAnalyzer
-        from analysis.graph_builder import GraphBuilder
+        from analysis.incremental import IncrementalAnalyzer
         from datetime import datetime
 
         repo_path = None
@@ -87,22 +104,26 @@ async def start_analysis(
             db.commit()
 
             # Clone and analyze
-            repo_path = GitHubClient.clone_repository(request.github_url)
-            commit_sha = GitHubClient.get_commit_sha(repo_path)
+            repo_path = GitHubClient.clone_repository(request.github_url, commit_sha=commit_sha)
+            checked_out_sha = GitHubClient.get_commit_sha(repo_path)
+
+            # The cache entry of the requested commit must only ever point to results of that commit
+            if commit_sha and checked_out_sha != commit_sha:
+                raise ValueError(f"Checked out commit {checked_out_sha} instead of {commit_sha}")
+            commit_sha = checked_out_sha
 
             analyzer = EmergeAnalyzer()
-            language = analyzer.detect_language(repo_path)
-            results = analyzer.run_analysis(repo_path, language)
+            languages = analyzer.detect_languages(repo_path)
+            summary = IncrementalAnalyzer(analyzer).analyze(db, request.github_url, repo_path, commit_sha, languages)
 
             # Store results
             analysis.commit_sha = commit_sha
-            analysis.primary_language = language
-            analysis.total_files = results['statistics'].get('scanned_files', 0)
-            analysis.total_loc = results['overall_metrics'].get('total-sloc-in-files', 0)
-            analysis.metrics = results['overall_metrics']
-
-            graph_data = GraphBuilder.build_graph_from_emerge(results['file_metrics'])
-            analysis.graph_data = graph_data
+            analysis.primary_language = languages[0]
+            analysis.languages = summary['languages']
+            analysis.total_files = summary['total_files']
+            analysis.total_loc = summary['total_loc']
+            analysis.metrics = summary['metrics']
+            analysis.graph_data = summary['graph_data']
 
             analysis.status = 'completed'
             analysis.completed_at = datetime.utcnow()
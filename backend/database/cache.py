@@ -0,0 +1,141 @@
+"""
+Commit-SHA result cache
+
+Maps (repository, commit SHA, options) to a single analysis, so that duplicate
+requests reuse a completed or running analysis instead of starting a new one.
+
+PRD Reference: PRD.md p.42 (Database Schema, analysis_cache)
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from database.models import Analysis, AnalysisCache
+from github.validators import validate_github_url, GitHubURLError
+
+
+class AnalysisResultCache:
+    """Look up and claim analyses by repository commit"""
+
+    # Pending or processing analyses older than this are treated as failed, e.g. after a worker crashed
+    # (Celery kills an analysis after 10 minutes, the rest is slack for queueing)
+    STALE_AFTER_SECONDS = int(os.getenv('ANALYSIS_STALE_AFTER_SECONDS', '1800'))
+
+    @staticmethod
+    def normalize_url(github_url: str) -> str:
+        """
+        Normalize a GitHub URL, so HTTPS/SSH and case variants share cache entries
+
+        Args:
+            github_url: GitHub repository URL
+
+        Returns:
+            str: Normalized URL (https://github.com/org/repo)
+        """
+        try:
+            org, repo = validate_github_url(github_url)
+        except GitHubURLError:
+            return github_url
+        return f"https://github.com/{org}/{repo}".lower()
+
+    @staticmethod
+    def hash_options(options: Optional[Dict[str, Any]]) -> str:
+        """
+        Hash analysis options independent of key order
+
+        Args:
+            options: Analysis options of the request
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+        payload = json.dumps(options or {}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def is_stale(analysis: Analysis) -> bool:
+        """
+        Check if a pending or processing analysis has been running for too long to still finish
+
+        Args:
+            analysis: Existing analysis
+
+        Returns:
+            bool: True if the analysis should be treated as failed
+        """
+        if analysis.status not in ('pending', 'processing') or analysis.created_at is None:
+            return False
+        return analysis.created_at < datetime.utcnow() - timedelta(seconds=AnalysisResultCache.STALE_AFTER_SECONDS)
+
+    @staticmethod
+    def claim(
+        db: Session,
+        analysis: Analysis,
+        commit_sha: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Analysis:
+        """
+        Register a new analysis for a commit, or return the one that already exists
+
+        The cache table's primary key makes this a single-flight operation:
+        only one of several concurrent requests can insert the entry, all others
+        get the analysis that won. Entries of failed and stale analyses are replaced,
+        stale analyses are marked as failed.
+
+        Args:
+            db: Database session
+            analysis: New (not yet committed) analysis
+            commit_sha: Commit SHA the analysis will run on
+            options: Analysis options of the request
+
+        Returns:
+            Analysis: The given analysis if it was claimed (and committed),
+                      otherwise the existing analysis for the commit
+        """
+        key = {
+            'github_url': AnalysisResultCache.normalize_url(analysis.github_url),
+            'commit_sha': commit_sha,
+            'options_hash': AnalysisResultCache.hash_options(options),
+        }
+
+        for _ in range(3):
+            db.add(analysis)
+            db.add(AnalysisCache(analysis_id=analysis.id, **key))
+            try:
+                db.commit()
+                return analysis
+            except IntegrityError:
+                db.rollback()
+
+            entry = db.query(AnalysisCache).filter_by(**key).first()
+            if entry is None:
+                # Entry was removed in the meantime, try again
+                continue
+
+            existing = db.query(Analysis).filter(Analysis.id == entry.analysis_id).first()
+            if existing is not None and existing.status != 'failed':
+                if not AnalysisResultCache.is_stale(existing):
+                    return existing
+                existing.status = 'failed'
+                existing.error_message = 'Analysis did not finish in time'
+                existing.completed_at = datetime.utcnow()
+
+            # Replace the entry of a failed or stale analysis, unless another request already did
+            db.add(analysis)
+            db.flush()
+            replaced = db.query(AnalysisCache).filter_by(analysis_id=entry.analysis_id, **key).update(
+                {'analysis_id': analysis.id},
+                synchronize_session=False
+            )
+            if replaced:
+                db.commit()
+                return analysis
+            db.rollback()
+
+        raise RuntimeError(f"Could not claim analysis cache entry for {key['github_url']}@{commit_sha}")
@@ -4,7 +4,7 @@ Database models
 PRD Reference: PRD.md p.42 (Database Schema)
 """
 
-from sqlalchemy import Column, String, Integer, Text, TIMESTAMP, CheckConstraint, Index
+from sqlalchemy import Column, String, Integer, Text, TIMESTAMP, CheckConstraint, Index, ForeignKey
 from sqlalchemy.sql import func
 import uuid
 
@@ -51,3 +51,19 @@ class Analysis(Base):
         Index('idx_analyses_github_url', 'github_url'),
     )
 
+
+
+class AnalysisCache(Base):
+    """
+    Maps a repository commit (and analysis options) to its analysis,
+    to avoid re-analyzing the same commit
+    
+    PRD Reference: PRD.md p.42
+    """
+    __tablename__ = "analysis_cache"
+    
+    github_url = Column(String(500), primary_key=True)
+    commit_sha = Column(String(40), primary_key=True)
+    options_hash = Column(String(64), primary_key=True)
+    analysis_id = Column(String(36), ForeignKey('analyses.id'), nullable=False)
+    cached_at = Column(TIMESTAMP, server_default=func.now())
@@ -5,48 +5,69 @@ PRD Reference: PRD.md p.41
 TASK: TASK-202
 """
 
-from git import Repo
+from git import Repo, Git
 import os
 import tempfile
 import shutil
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, List
+
+from github.validators import validate_github_url, GitHubURLError
+
+
+TEMP_DIR_PREFIX = 'codemapper_'
 
 
 class GitHubClient:
     """Handle GitHub repository operations"""
     
     @staticmethod
-    def clone_repository(github_url: str, timeout: int = 300) -> str:
+    def clone_repository(github_url: str, timeout: int = 300, commit_sha: Optional[str] = None) -> str:
         """
         Clone a GitHub repository to a temporary directory.
         
         Args:
             github_url: GitHub repository URL (HTTPS or SSH)
             timeout: Clone timeout in seconds (default: 5 minutes)
+            commit_sha: Check out this commit instead of the default branch head (optional)
             
         Returns:
             str: Path to cloned repository
             
         Raises:
-            Exception: If cloning fails
+            Exception: If cloning fails or the given commit can't be checked out
             
         PRD Reference: PRD.md p.41
         """
-        temp_dir = tempfile.mkdtemp(prefix='codemapper_')
+        temp_dir = tempfile.mkdtemp(prefix=TEMP_DIR_PREFIX)
+        
+        # Clone into a directory named after the repository (not the random temp dir),
+        # so Emerge result names and its parse cache keys are stable across runs
+        try:
+            _, repo_name = validate_github_url(github_url)
+        except GitHubURLError:
+            repo_name = 'repository'
+        repo_path = os.path.join(temp_dir, repo_name)
         
         try:
             # Clone with depth=1 for faster cloning
             Repo.clone_from(
                 github_url,
-                temp_dir,
+                repo_path,
                 depth=1,
                 single_branch=True
             )
-            return temp_dir
+            
+            # The branch may have moved on since the commit was resolved
+            if commit_sha and GitHubClient.get_commit_sha(repo_path) != commit_sha:
+                if not GitHubClient.fetch_commit(repo_path, commit_sha):
+                    raise Exception(f"Commit {commit_sha} is not available")
+                Repo(repo_path).git.checkout(commit_sha)
+            
+            return repo_path
         except Exception as e:
             # Clean up on failure
-            GitHubClient.cleanup(temp_dir)
+            GitHubClient.cleanup(repo_path)
             raise Exception(f"Failed to clone repository: {str(e)}")
     
     @staticmethod
@@ -57,6 +78,11 @@ class GitHubClient:
         Args:
             directory: Directory path to remove
         """
+        # Repositories are cloned into a subdirectory of a temp dir, remove both
+        parent = Path(directory).parent
+        if parent.name.startswith(TEMP_DIR_PREFIX):
+            directory = str(parent)
+        
         if os.path.exists(directory):
             try:
                 shutil.rmtree(directory)
@@ -79,4 +105,76 @@ class GitHubClient:
             return repo.head.commit.hexsha
         except Exception:
             return None
-
+    
+    @staticmethod
+    def get_remote_head_sha(github_url: str) -> Optional[str]:
+        """
+        Get the commit SHA of the remote default branch head without cloning.
+        
+        Args:
+            github_url: GitHub repository URL (HTTPS or SSH)
+            
+        Returns:
+            str: Commit SHA or None if failed
+        """
+        try:
+            # Never block on credential prompts, e.g. for private repositories
+            output = Git().ls_remote(
+                github_url,
+                'HEAD',
+                kill_after_timeout=30,
+                env={'GIT_TERMINAL_PROMPT': '0'}
+            )
+            return output.split()[0] if output else None
+        except Exception:
+            return None
+    
+    @staticmethod
+    def fetch_commit(repo_path: str, commit_sha: str) -> bool:
+        """
+        Fetch a single commit into a shallow clone, e.g. to diff against it.
+        
+        Args:
+            repo_path: Path to git repository
+            commit_sha: Commit SHA to fetch
+            
+        Returns:
+            bool: True if the commit is available afterwards
+        """
+        try:
+            repo = Repo(repo_path)
+            repo.git.fetch('--depth=1', 'origin', commit_sha)
+            repo.commit(commit_sha)
+            return True
+        except Exception:
+            return False
+    
+    @staticmethod
+    def get_changed_files(repo_path: str, base_sha: str, head_sha: str = 'HEAD') -> Dict[str, List[str]]:
+        """
+        Get files changed between two commits.
+        
+        Renames are reported as a deleted and an added file.
+        
+        Args:
+            repo_path: Path to git repository
+            base_sha: Commit SHA to compare against
+            head_sha: Commit SHA with the changes (default: HEAD)
+            
+        Returns:
+            dict: Relative paths by change type ('added', 'modified', 'deleted')
+        """
+        repo = Repo(repo_path)
+        output = repo.git.diff('--name-status', '--no-renames', '-z', base_sha, head_sha)
+        
+        changes = {'added': [], 'modified': [], 'deleted': []}
+        fields = [field for field in output.split('\0') if field]
+        for status, path in zip(fields[0::2], fields[1::2]):
+            if status.startswith('A'):
+                changes['added'].append(path)
+            elif status.startswith('D'):
+                changes['deleted'].append(path)
+            else:
+                changes['modified'].append(path)
+        
+        return changes
@@ -8,7 +8,7 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from database.db import Base
-from database.models import Analysis
+from database.models import Analysis, AnalysisCache
 
 # Alembic Config object
 config = context.config
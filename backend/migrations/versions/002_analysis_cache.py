@@ -0,0 +1,34 @@
+"""Analysis cache
+
+Revision ID: 002
+Revises: 001
+Create Date: 2025-10-18
+
+PRD Reference: PRD.md p.42 (Database Schema)
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create analysis cache table (to avoid re-analyzing same commit)
+    op.create_table('analysis_cache',
+        sa.Column('github_url', sa.String(500), nullable=False),
+        sa.Column('commit_sha', sa.String(40), nullable=False),
+        sa.Column('options_hash', sa.String(64), nullable=False),
+        sa.Column('analysis_id', UUID(as_uuid=True), sa.ForeignKey('analyses.id'), nullable=False),
+        sa.Column('cached_at', sa.TIMESTAMP, server_default=sa.func.now()),
+        
+        sa.PrimaryKeyConstraint('github_url', 'commit_sha', 'options_hash'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('analysis_cache')
@@ -58,7 +58,7 @@ def analyze_repository_task(self, analysis_id: str, github_url: str):
     Flow:
     1. Clone repository
     2. Detect language
-    3. Run Emerge analysis
+    3. Run Emerge analysis (incremental if a previous analysis exists)
     4. Parse results
     5. Store in database
     6. Cleanup
@@ -87,40 +87,40 @@ def analyze_repository_task(self, analysis_id: str, github_url: str):
         
         # Step 1: Clone repository
         logger.info(f"Cloning repository: {github_url}")
-        repo_path = GitHubClient.clone_repository(github_url)
+        repo_path = GitHubClient.clone_repository(github_url, commit_sha=analysis.commit_sha)
         logger.info(f"Repository cloned to: {repo_path}")
         
         # Step 2: Get commit SHA
         commit_sha = GitHubClient.get_commit_sha(repo_path)
         logger.info(f"Commit SHA: {commit_sha}")
+        
+        # The cache entry of the requested commit must only ever point to results of that commit
+        if analysis.commit_sha and commit_sha != analysis.commit_sha:
+            raise ValueError(f"Checked out commit {commit_sha} instead of {analysis.commit_sha}")
         analysis.commit_sha = commit_sha
         db.commit()
         
         # Step 3: Detect language
         emerge_analyzer = EmergeAnalyzer()
-        language = emerge_analyzer.detect_language(repo_path)
-        logger.info(f"Detected language: {language}")
+        languages = emerge_analyzer.detect_languages(repo_path)
+        language = languages[0]
+        logger.info(f"Detected languages: {', '.join(languages)}")
         analysis.primary_language = language
         db.commit()
         
-        # Step 4: Run Emerge analysis
+        # Step 4: Run Emerge analysis (only on changed files if a previous analysis exists)
+        from analysis.incremental import IncrementalAnalyzer
+        
         logger.info("Running Emerge analysis...")
-        results = emerge_analyzer.run_analysis(repo_path, language)
+        summary = IncrementalAnalyzer(emerge_analyzer).analyze(db, github_url, repo_path, commit_sha, languages)
         logger.info(f"Analysis complete")
         
         # Step 5: Store results
-        from analysis.graph_builder import GraphBuilder
-        
-        analysis.total_files = results['statistics'].get('scanned_files', 0)
-        analysis.total_loc = results['overall_metrics'].get('total-sloc-in-files', 0)
-        analysis.metrics = results['overall_metrics']
-        
-            # Transform to graph format (include dependencies)
-            graph_data = GraphBuilder.build_graph_from_emerge(
-                results['file_metrics'],
-                results.get('dependencies', {})
-            )
-            analysis.graph_data = graph_data
+        analysis.total_files = summary['total_files']
+        analysis.total_loc = summary['total_loc']
+        analysis.metrics = summary['metrics']
+        analysis.languages = summary['languages']
+        analysis.graph_data = summary['graph_data']
         
         analysis.status = 'completed'
         analysis.completed_at = datetime.utcnow()
@@ -0,0 +1,118 @@
+"""
+Tests for the commit-SHA result cache
+
+PRD Reference: PRD.md p.42
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.cache import AnalysisResultCache
+from database.db import Base
+from database.models import Analysis, AnalysisCache
+
+GITHUB_URL = "https://github.com/facebook/react"
+COMMIT_SHA = "a" * 40
+
+
+def _new_analysis(github_url: str = GITHUB_URL) -> Analysis:
+    return Analysis(
+        id=str(uuid.uuid4()),
+        github_url=github_url,
+        repository_name="facebook/react",
+        commit_sha=COMMIT_SHA,
+        status='pending'
+    )
+
+
+class TestAnalysisResultCache:
+    """Test claiming analyses by repository commit"""
+
+    @pytest.fixture
+    def session_factory(self):
+        temp_dir = tempfile.mkdtemp()
+        engine = create_engine(f"sqlite:///{os.path.join(temp_dir, 'test.db')}")
+        Base.metadata.create_all(bind=engine)
+        yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        engine.dispose()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_duplicate_request_returns_existing_analysis(self, session_factory):
+        """Test a second request for the same commit gets the first analysis"""
+        db = session_factory()
+        first = AnalysisResultCache.claim(db, _new_analysis(), COMMIT_SHA)
+        second = AnalysisResultCache.claim(db, _new_analysis("git@github.com:Facebook/react.git"), COMMIT_SHA)
+
+        assert second.id == first.id
+        assert db.query(Analysis).count() == 1
+
+    def test_different_options_create_new_analysis(self, session_factory):
+        """Test analysis options are part of the cache key"""
+        db = session_factory()
+        first = AnalysisResultCache.claim(db, _new_analysis(), COMMIT_SHA, {"max_files": 10})
+        second = AnalysisResultCache.claim(db, _new_analysis(), COMMIT_SHA, {"max_files": 20})
+
+        assert second.id != first.id
+
+    def test_failed_analysis_is_replaced(self, session_factory):
+        """Test a failed analysis does not block a new one"""
+        db = session_factory()
+        failed = AnalysisResultCache.claim(db, _new_analysis(), COMMIT_SHA)
+        failed.status = 'failed'
+        db.commit()
+
+        retry = AnalysisResultCache.claim(db, _new_analysis(), COMMIT_SHA)
+
+        assert retry.id != failed.id
+        assert db.query(AnalysisCache).one().analysis_id == retry.id
+
+    def test_stale_analysis_is_replaced(self, session_factory):
+        """Test a pending or processing analysis of a crashed worker does not block a new one"""
+        db = session_factory()
+        running = AnalysisResultCache.claim(db, _new_analysis(), COMMIT_SHA)
+        running.status = 'processing'
+        db.commit()
+
+        assert AnalysisResultCache.claim(db, _new_analysis(), COMMIT_SHA).id == running.id
+
+        running.created_at = datetime.utcnow() - timedelta(seconds=AnalysisResultCache.STALE_AFTER_SECONDS + 60)
+        db.commit()
+
+        retry = AnalysisResultCache.claim(db, _new_analysis(), COMMIT_SHA)
+
+        assert retry.id != running.id
+        assert db.query(AnalysisCache).one().analysis_id == retry.id
+        assert db.query(Analysis).filter(Analysis.id == running.id).one().status == 'failed'
+
+    def test_concurrent_requests_claim_once(self, session_factory):
+        """Test ten concurrent requests for the same commit share one analysis"""
+        claimed_ids = []
+        lock = threading.Lock()
+
+        def request():
+            db = session_factory()
+            try:
+                analysis = AnalysisResultCache.claim(db, _new_analysis(), COMMIT_SHA)
+                with lock:
+                    claimed_ids.append(analysis.id)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=request) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        db = session_factory()
+        assert len(claimed_ids) == 10
+        assert len(set(claimed_ids)) == 1
+        assert db.query(Analysis).count() == 1
@@ -0,0 +1,77 @@
+"""
+Tests for the Emerge analysis wrapper
+
+PRD Reference: PRD.md p.24, F2.0
+TASK: TASK-301
+"""
+
+import os
+
+from analysis.emerge_wrapper import EmergeAnalyzer
+
+
+def _write(repo_dir, files: dict) -> None:
+    for path, content in files.items():
+        full_path = os.path.join(repo_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w') as f:
+            f.write(content)
+
+
+class TestDetectLanguage:
+    """Test primary language detection"""
+
+    def test_ignores_dependency_directories(self, tmp_path):
+        """Test vendored dependencies do not decide the language"""
+        _write(tmp_path, {
+            'app.py': 'print(1)\n',
+            'lib/util.py': 'x = 1\n',
+            'node_modules/a/index.js': '',
+            'node_modules/b/index.js': '',
+            'node_modules/c/index.js': '',
+        })
+        assert EmergeAnalyzer().detect_language(str(tmp_path)) == 'py'
+
+    def test_defaults_to_python(self, tmp_path):
+        """Test repositories without known source files"""
+        _write(tmp_path, {'README.md': '# test\n'})
+        assert EmergeAnalyzer().detect_language(str(tmp_path)) == 'py'
+
+    def test_inventory_is_reused(self, tmp_path):
+        """Test the repository is only walked once per checkout"""
+        _write(tmp_path, {'main.go': 'package main\n'})
+        analyzer = EmergeAnalyzer()
+        assert analyzer.detect_language(str(tmp_path)) == 'go'
+        assert analyzer.create_inventory(str(tmp_path)) is analyzer.create_inventory(str(tmp_path))
+
+
+class TestMultiLanguageAnalysis:
+    """Test analyzing several languages in one run"""
+
+    def test_detect_languages(self, tmp_path):
+        """Test all languages above the minimum share are detected, primary first"""
+        _write(tmp_path, {
+            'server/app.py': 'def main():\n    return 1\n',
+            'web/index.ts': 'export const a = 1;\n',
+            'web/util.ts': 'export const b = 2;\n',
+        })
+        assert EmergeAnalyzer().detect_languages(str(tmp_path)) == ['typescript', 'py']
+
+    def test_run_analysis_with_several_languages(self, tmp_path):
+        """Test files of all languages end up in one result with their line shares"""
+        _write(tmp_path, {
+            'server/app.py': 'import os\n\ndef main():\n    return os.getcwd()\n',
+            'web/index.ts': 'import { b } from "./util";\nexport const a = b;\n',
+            'web/util.ts': 'export const b = 2;\n',
+        })
+        analyzer = EmergeAnalyzer()
+        results = analyzer.run_analysis(str(tmp_path), ['typescript', 'py'])
+        extensions = {os.path.splitext(path)[1] for path in results['file_metrics']}
+        shares = analyzer.calculate_language_shares(
+            {path: metrics.get('sloc-in-file', 0) for path, metrics in results['file_metrics'].items()},
+            ['typescript', 'py']
+        )
+
+        assert extensions == {'.py', '.ts'}
+        assert set(shares) == {'typescript', 'py'}
+        assert round(sum(shares.values())) == 100
@@ -0,0 +1,54 @@
+"""
+Tests for cloning repositories at a commit
+
+PRD Reference: PRD.md p.41
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+from git import Repo
+
+from github.client import GitHubClient
+
+
+def _commit(repo: Repo, path: str, content: str, message: str) -> str:
+    with open(os.path.join(repo.working_dir, path), 'w') as f:
+        f.write(content)
+    repo.git.add('-A')
+    repo.git.commit('-m', message, env={
+        'GIT_AUTHOR_NAME': 'Test', 'GIT_AUTHOR_EMAIL': 'test@example.com',
+        'GIT_COMMITTER_NAME': 'Test', 'GIT_COMMITTER_EMAIL': 'test@example.com',
+    })
+    return repo.head.commit.hexsha
+
+
+class TestCloneRepository:
+    """Test checking out the requested commit of a clone"""
+
+    @pytest.fixture
+    def origin(self):
+        temp_dir = tempfile.mkdtemp()
+        origin = Repo.init(os.path.join(temp_dir, 'origin'))
+        yield origin
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_clone_checks_out_older_commit(self, origin):
+        """Test an older commit is fetched into the shallow clone and checked out"""
+        base_sha = _commit(origin, 'app.py', 'print(1)\n', 'base')
+        _commit(origin, 'app.py', 'print(2)\n', 'head')
+
+        repo_path = GitHubClient.clone_repository(f"file://{origin.working_dir}", commit_sha=base_sha)
+        try:
+            assert GitHubClient.get_commit_sha(repo_path) == base_sha
+        finally:
+            GitHubClient.cleanup(repo_path)
+
+    def test_clone_fails_for_unavailable_commit(self, origin):
+        """Test the branch head is not analyzed instead of a commit that can't be fetched"""
+        _commit(origin, 'app.py', 'print(1)\n', 'base')
+
+        with pytest.raises(Exception, match='not available'):
+            GitHubClient.clone_repository(f"file://{origin.working_dir}", commit_sha='0' * 40)
@@ -0,0 +1,130 @@
+"""
+Tests for incremental re-analysis
+
+PRD Reference: PRD.md p.41
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+from git import Repo
+
+from analysis.emerge_wrapper import EmergeAnalyzer
+from analysis.graph_builder import GraphBuilder
+from analysis.incremental import IncrementalAnalyzer
+from database.models import Analysis
+
+
+def _write(repo_dir: str, files: dict) -> None:
+    for path, content in files.items():
+        full_path = os.path.join(repo_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w') as f:
+            f.write(content)
+
+
+def _commit(repo: Repo, message: str) -> str:
+    repo.git.add('-A')
+    repo.git.commit('-m', message, env={
+        'GIT_AUTHOR_NAME': 'Test', 'GIT_AUTHOR_EMAIL': 'test@example.com',
+        'GIT_COMMITTER_NAME': 'Test', 'GIT_COMMITTER_EMAIL': 'test@example.com',
+    })
+    return repo.head.commit.hexsha
+
+
+class TestGraphBuilderPatch:
+    """Test patching of stored graph data"""
+
+    def test_rename_root(self):
+        """Test moving node and edge ids to a new repository directory"""
+        graph = GraphBuilder.build_graph_from_emerge(
+            {'old/pkg/a.py': {'sloc-in-file': 3}},
+            {'old': ['old/pkg'], 'old/pkg': ['old/pkg/a.py']}
+        )
+        renamed = GraphBuilder.rename_root(graph, 'old', 'new')
+
+        assert [node['id'] for node in renamed['nodes']] == ['new/pkg/a.py']
+        assert renamed['nodes'][0]['data']['path'] == 'new/pkg/a.py'
+        assert {edge['id'] for edge in renamed['edges']} == {'new___new/pkg', 'new/pkg___new/pkg/a.py'}
+
+    def test_patch_without_partial_analysis(self):
+        """Test dropping deleted files and their directories"""
+        graph = GraphBuilder.build_graph_from_emerge(
+            {'r/a.py': {'sloc-in-file': 3}, 'r/pkg/b.py': {'sloc-in-file': 5}},
+            {'r': ['r/a.py', 'r/pkg'], 'r/pkg': ['r/pkg/b.py']}
+        )
+        patched = GraphBuilder.patch_graph(graph, ['r/pkg/b.py'], {}, {}, existing_directories=['r'])
+
+        assert [node['id'] for node in patched['nodes']] == ['r/a.py']
+        assert [edge['id'] for edge in patched['edges']] == ['r___r/a.py']
+        assert GraphBuilder.calculate_overall_metrics(patched)['total-sloc-in-files'] == 3
+
+
+class TestIncrementalAnalyzer:
+    """Test incremental analysis against a full analysis of the same commit"""
+
+    @pytest.fixture
+    def repositories(self):
+        temp_dir = tempfile.mkdtemp()
+        origin_dir = os.path.join(temp_dir, 'origin')
+        os.makedirs(origin_dir)
+        yield temp_dir, origin_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_incremental_analysis_matches_full_analysis(self, repositories, monkeypatch):
+        """Test added, modified and deleted files are patched into the previous results"""
+        temp_dir, origin_dir = repositories
+        origin = Repo.init(origin_dir)
+
+        _write(origin_dir, {
+            'app.py': 'import os\n\ndef main():\n    return os.getcwd()\n',
+            'pkg/__init__.py': '',
+            'pkg/util.py': 'def one():\n    return 1\n\ndef two():\n    return 2\n',
+            'old/legacy.py': 'def legacy():\n    pass\n',
+            'README.md': '# test\n',
+        })
+        base_sha = _commit(origin, 'base')
+
+        emerge_analyzer = EmergeAnalyzer()
+        base_results = emerge_analyzer.run_analysis(origin_dir, 'py')
+        previous = Analysis(
+            github_url='https://github.com/test/origin',
+            repository_name='test/origin',
+            status='completed',
+            commit_sha=base_sha,
+            primary_language='py',
+            total_files=base_results['statistics'].get('scanned_files', 0),
+            # an overall metric the incremental analysis can't recompute
+            metrics={**base_results['overall_metrics'], 'louvain-modularity-dependency-graph': 0.5},
+            graph_data=GraphBuilder.build_graph_from_emerge(
+                base_results['file_metrics'],
+                base_results['dependencies']
+            ),
+        )
+
+        _write(origin_dir, {
+            'pkg/util.py': 'def one():\n    return 1\n',
+            'pkg/extra.py': 'from pkg.util import one\n\ndef extra():\n    return one()\n',
+            'README.md': '# changed\n',
+        })
+        shutil.rmtree(os.path.join(origin_dir, 'old'))
+        _commit(origin, 'head')
+
+        # a clone under another directory name, like a fresh clone of the same repository
+        repo_path = os.path.join(temp_dir, 'clone')
+        Repo.clone_from(origin_dir, repo_path)
+
+        monkeypatch.setattr(IncrementalAnalyzer, 'MAX_CHANGE_RATIO', 1.0)
+        summary = IncrementalAnalyzer(emerge_analyzer).run(repo_path, previous, ['py'])
+        full_results = emerge_analyzer.run_analysis(repo_path, 'py')
+        full_graph = GraphBuilder.build_graph_from_emerge(full_results['file_metrics'], full_results['dependencies'])
+
+        assert summary is not None
+        assert sorted(summary['graph_data']['nodes'], key=lambda node: node['id']) == \
+            sorted(full_graph['nodes'], key=lambda node: node['id'])
+        assert {edge['id'] for edge in summary['graph_data']['edges']} == {edge['id'] for edge in full_graph['edges']}
+        assert summary['total_files'] == full_results['statistics']['scanned_files']
+        assert summary['total_loc'] == full_results['overall_metrics']['total-sloc-in-files']
+        assert summary['metrics'] == full_results['overall_metrics']
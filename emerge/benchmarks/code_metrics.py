@@ -0,0 +1,82 @@
+"""
+Measures the code metric calculation of Analysis.calculate_code_metrics (one pass over all results for all metrics) on the test data of all languages,
+compared to calculating every metric on its own with calculate_from_results.
+
+Run from the emerge project directory, e.g.: python -m benchmarks.code_metrics [copies] [metric ...]
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import List
+
+import logging
+import sys
+import time
+
+from emerge.analysis import Analysis
+from emerge.registry import MetricType, PARSER_CLASSES, metric_class, parser_class
+from emerge.tests.testdata.c import C_TEST_FILES
+from emerge.tests.testdata.cpp import CPP_TEST_FILES
+from emerge.tests.testdata.groovy import GROOVY_TEST_FILES
+from emerge.tests.testdata.java import JAVA_TEST_FILES
+from emerge.tests.testdata.javascript import JAVASCRIPT_TEST_FILES
+from emerge.tests.testdata.kotlin import KOTLIN_TEST_FILES
+from emerge.tests.testdata.objc import OBJC_TEST_FILES
+from emerge.tests.testdata.py import PYTHON_TEST_FILES
+from emerge.tests.testdata.ruby import RUBY_TEST_FILES
+from emerge.tests.testdata.swift import SWIFT_TEST_FILES
+from emerge.tests.testdata.typescript import TYPESCRIPT_TEST_FILES
+
+COPIES = 20
+METRICS = [MetricType.NUMBER_OF_METHODS, MetricType.SOURCE_LINES_OF_CODE, MetricType.WS_COMPLEXITY]
+
+TEST_FILES = {
+    'C_PARSER': C_TEST_FILES, 'CPP_PARSER': CPP_TEST_FILES, 'GROOVY_PARSER': GROOVY_TEST_FILES, 'JAVA_PARSER': JAVA_TEST_FILES,
+    'JAVASCRIPT_PARSER': JAVASCRIPT_TEST_FILES, 'KOTLIN_PARSER': KOTLIN_TEST_FILES, 'OBJC_PARSER': OBJC_TEST_FILES, 'PYTHON_PARSER': PYTHON_TEST_FILES,
+    'RUBY_PARSER': RUBY_TEST_FILES, 'SWIFT_PARSER': SWIFT_TEST_FILES, 'TYPESCRIPT_PARSER': TYPESCRIPT_TEST_FILES
+}
+
+
+def create_analysis(copies: int, metric_types: List[MetricType]) -> Analysis:
+    analysis = Analysis()
+    analysis.source_directory = '/tests'
+    for parser_name, test_files in TEST_FILES.items():
+        if parser_name not in PARSER_CLASSES:
+            continue
+        parser = parser_class(parser_name)()
+        for copy in range(copies):
+            for file_name, file_content in test_files.items():
+                parser.generate_file_result_from_analysis(analysis, file_name=file_name, full_file_path=f'/tests/copy{copy}/{file_name}', file_content=file_content)
+        analysis.collect_results_from_parser(parser)
+
+    for metric_type in metric_types:
+        metric = metric_class(metric_type)(analysis)
+        analysis.metrics_for_file_results[metric.metric_name] = metric
+    return analysis
+
+
+def main():
+    logging.disable(logging.WARNING)
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else COPIES
+    metric_types = [MetricType[x.upper()] for x in sys.argv[2:]] or METRICS
+
+    separate_analysis = create_analysis(copies, metric_types)
+    start = time.perf_counter()
+    for metric in separate_analysis.metrics_for_file_results.values():
+        separate_analysis.calculate_metric(metric)
+    separate = time.perf_counter() - start
+
+    fused_analysis = create_analysis(copies, metric_types)
+    start = time.perf_counter()
+    fused_analysis.calculate_code_metrics(list(fused_analysis.metrics_for_file_results.values()))
+    fused = time.perf_counter() - start
+
+    identical = separate_analysis.local_metric_results == fused_analysis.local_metric_results and \
+        separate_analysis.overall_metric_results == fused_analysis.overall_metric_results
+    print(f'{len(fused_analysis.file_results)} files, {len(metric_types)} metrics ({", ".join(x.name.lower() for x in metric_types)}): '
+          f'separate {separate * 1000:.1f} ms   one pass {fused * 1000:.1f} ms   speedup: {separate / fused:.1f}x   identical: {identical}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Measures the entity scan of FileResult.generate_entity_results_from_scopes on the swift/kotlin test data (repeated to larger files),
+compared to the previous scan that sliced the remaining tokens and joined them into a string at every entity keyword.
+
+Run from the emerge project directory, e.g.: python -m benchmarks.entity_scopes [repetitions ...]
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Dict, List
+
+import logging
+import sys
+import time
+
+from emerge.analysis import Analysis
+from emerge.languages.abstractparser import CoreParsingKeyword, ParsingMixin
+from emerge.languages.kotlinparser import KotlinParser
+from emerge.languages.swiftparser import SwiftParser
+from emerge.results import FileResult
+from emerge.tests.testdata.kotlin import KOTLIN_TEST_FILES
+from emerge.tests.testdata.swift import SWIFT_TEST_FILES
+
+REPETITIONS = [1, 4, 8]
+
+
+def scan_scopes_by_read_ahead(result: FileResult, entity_keywords, entity_expression, comment_keywords) -> Dict[str, List[str]]:
+    """The previous implementation, returns the tokens by entity name.
+    """
+    found_entities: Dict[str, List[str]] = {}
+    source_string_no_comments = result._filter_source_tokens_without_comments(  # pylint: disable=protected-access
+        result.scanned_tokens, comment_keywords[CoreParsingKeyword.LINE_COMMENT.value],
+        comment_keywords[CoreParsingKeyword.START_BLOCK_COMMENT.value], comment_keywords[CoreParsingKeyword.STOP_BLOCK_COMMENT.value])
+    source_string_no_comments = source_string_no_comments.replace("{}", "").replace("{ }", "")
+    filtered_list_no_comments = result.preprocess_file_content_and_generate_token_list(source_string_no_comments)
+
+    for _, obj, following in ParsingMixin._gen_word_read_ahead(filtered_list_no_comments):  # pylint: disable=protected-access
+        if obj in entity_keywords:
+            try:
+                parsing_result = entity_expression.parseString(ParsingMixin.create_read_ahead_string(obj, following))
+            except Exception:  # pylint: disable=broad-except
+                continue
+
+            scope_level = 0
+            found_entities[parsing_result.entity_name] = []
+            for token in [obj] + following:
+                if token == CoreParsingKeyword.OPENING_CURVED_BRACKET.value:
+                    scope_level += 1
+                if token == CoreParsingKeyword.CLOSING_CURVED_BRACKET.value:
+                    scope_level -= 1
+                    if scope_level == 0:
+                        break
+                found_entities[parsing_result.entity_name].append(token)
+
+    return found_entities
+
+
+def main():
+    logging.disable(logging.WARNING)
+    repetitions = [int(x) for x in sys.argv[1:]] or REPETITIONS
+
+    for parser_type, test_files in [(SwiftParser, SWIFT_TEST_FILES), (KotlinParser, KOTLIN_TEST_FILES)]:
+        for repetition in repetitions:
+            # capture the arguments every file result is scanned with, then scan the same file results again with the previous implementation
+            scans = []
+            original_scan = FileResult.generate_entity_results_from_scopes
+
+            def capturing_scan(result, *args, scans=scans, original_scan=original_scan):
+                start = time.perf_counter()
+                entity_results = original_scan(result, *args)
+                scans.append((result, args, time.perf_counter() - start, {x.entity_name: list(x.scanned_tokens) for x in entity_results}))
+                return entity_results
+
+            parser = parser_type()
+            analysis = Analysis()
+            analysis.source_directory = '/tests'
+            for file_name, file_content in test_files.items():
+                parser.generate_file_result_from_analysis(analysis, file_name=file_name, full_file_path=f'/tests/{file_name}',
+                                                          file_content='\n'.join([file_content] * repetition))
+
+            FileResult.generate_entity_results_from_scopes = capturing_scan
+            try:
+                parser.generate_entity_results_from_analysis(analysis)
+            finally:
+                FileResult.generate_entity_results_from_scopes = original_scan
+
+            indexed = sum(x[2] for x in scans)
+            start = time.perf_counter()
+            previous_entities = [scan_scopes_by_read_ahead(result, *args) for result, args, _, _ in scans]
+            read_ahead = time.perf_counter() - start
+
+            number_of_tokens = sum(len(x.scanned_tokens) for x in parser.results.values() if isinstance(x, FileResult))
+            identical = previous_entities == [x[3] for x in scans]
+            print(f'{parser_type.__name__:>12} {number_of_tokens:>8} tokens: indexed {indexed * 1000:9.1f} ms   read ahead {read_ahead * 1000:10.1f} ms   '
+                  f'speedup: {read_ahead / indexed:6.1f}x   identical: {identical}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Measures GitMetrics on a synthetic git repository, mined without and with a warm git history cache,
+and with and without reading the contents of changed files (whitespace complexity/sloc).
+Also compares the exported size of the commit metrics with the links of every commit (git_export_commit_links)
+to the size of the commit metrics without links and the aggregated change coupling graph, that replaces them by default.
+
+Run from the emerge project directory, e.g.: python -m benchmarks.git_history [commits] [files]
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Tuple
+
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from networkx.readwrite import json_graph
+
+from emerge.analysis import Analysis
+from emerge.graph import GraphType
+from emerge.metrics.git.git import GitMetrics
+from emerge.metrics.whitespace.whitespace import WhitespaceMetric
+
+COMMITS = 500
+FILES = 200
+FILES_PER_COMMIT = 5
+
+
+def create_repository(git_directory: str, number_of_commits: int, number_of_files: int, seed: int = 0) -> None:
+    random_generator = random.Random(seed)
+    environment = dict(os.environ, GIT_AUTHOR_NAME='emerge', GIT_AUTHOR_EMAIL='emerge@example.com',
+                       GIT_COMMITTER_NAME='emerge', GIT_COMMITTER_EMAIL='emerge@example.com')
+    os.makedirs(os.path.join(git_directory, 'src'))
+    subprocess.run(['git', '-C', git_directory, 'init', '-q'], check=True)
+
+    # write all commits with a single fast-import stream instead of one git commit call per commit
+    stream = []
+    for commit in range(number_of_commits):
+        message = f'commit {commit}'
+        stream.append(f'commit refs/heads/master\ncommitter emerge <emerge@example.com> {1600000000 + commit * 60} +0000\ndata {len(message)}\n{message}\n')
+        for file_number in random_generator.sample(range(number_of_files), FILES_PER_COMMIT):
+            content = ''.join(f'{"    " * random_generator.randint(0, 3)}line {line} of commit {commit}\n' for line in range(random_generator.randint(10, 200)))
+            stream.append(f'M 100644 inline src/file{file_number}.py\ndata {len(content.encode("utf-8"))}\n{content}\n')
+    subprocess.run(['git', '-C', git_directory, 'fast-import', '--quiet'], input=''.join(stream), text=True, check=True, env=environment)
+
+
+def calculate(git_directory: str, cache_directory: str, number_of_commits: int, number_of_files: int, reads_file_contents: bool,
+              export_commit_links: bool = False) -> Tuple[float, Analysis, GitMetrics]:
+    analysis = Analysis()
+    analysis.source_directory = os.path.join(git_directory, 'src')
+    analysis.git_directory = git_directory
+    analysis.git_commit_limit = number_of_commits
+    analysis.only_permit_file_extensions = ['.py']
+    analysis.parse_cache_directory = cache_directory
+    analysis.git_export_commit_links = export_commit_links
+    if reads_file_contents:
+        ws_complexity_metric = WhitespaceMetric(analysis)
+        analysis.metrics_for_file_results[ws_complexity_metric.metric_name] = ws_complexity_metric
+
+    git_metrics = GitMetrics(analysis)
+    start = time.perf_counter()
+    git_metrics.calculate_from_results({f'src/file{i}.py': None for i in range(number_of_files)})
+    return time.perf_counter() - start, analysis, git_metrics
+
+
+def main():
+    logging.disable(logging.WARNING)
+    number_of_commits = int(sys.argv[1]) if len(sys.argv) > 1 else COMMITS
+    number_of_files = int(sys.argv[2]) if len(sys.argv) > 2 else FILES
+
+    with tempfile.TemporaryDirectory() as root:
+        git_directory = os.path.join(root, 'repo')
+        create_repository(git_directory, number_of_commits, number_of_files)
+
+        for reads_file_contents in [False, True]:
+            cache_directory = os.path.join(root, f'cache-{reads_file_contents}')
+            uncached, _, _ = calculate(git_directory, None, number_of_commits, number_of_files, reads_file_contents)
+            calculate(git_directory, cache_directory, number_of_commits, number_of_files, reads_file_contents)
+            cached, analysis, git_metrics = calculate(git_directory, cache_directory, number_of_commits, number_of_files, reads_file_contents)
+            print(f'{number_of_commits} commits, {"with" if reads_file_contents else "without"} file contents: '
+                  f'no cache {uncached * 1000:8.1f} ms   warm cache {cached * 1000:8.1f} ms   speedup: {uncached / cached:5.1f}x')
+
+        change_coupling_graph = analysis.graph_representations[GraphType.FILE_RESULT_CHANGE_COUPLING_GRAPH.name.lower()].digraph
+        commit_metrics_size = len(json.dumps(git_metrics.overall_data[GitMetrics.Keys.COMMIT_METRICS.value]))
+        change_coupling_graph_size = len(json.dumps(json_graph.node_link_data(change_coupling_graph)))
+
+        _, _, git_metrics_with_links = calculate(git_directory, cache_directory, number_of_commits, number_of_files, True, export_commit_links=True)
+        commit_metrics_with_links_size = len(json.dumps(git_metrics_with_links.overall_data[GitMetrics.Keys.COMMIT_METRICS.value]))
+        print(f'commit metrics with links {commit_metrics_with_links_size / 1024:8.1f} KiB   '
+              f'without links {commit_metrics_size / 1024:8.1f} KiB + change coupling graph {change_coupling_graph_size / 1024:8.1f} KiB '
+              f'({change_coupling_graph.number_of_nodes()} nodes, {change_coupling_graph.number_of_edges()} edges)')
+
+
+if __name__ == '__main__':
+    main()
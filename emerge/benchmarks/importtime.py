@@ -0,0 +1,62 @@
+"""
+Measures the cold start of emerge: the import time of a module (default: emerge.appear) with python -X importtime in fresh interpreters,
+the slowest imported modules and the time to create an Emerge instance.
+
+Run from the emerge project directory, e.g.: python -m benchmarks.importtime [module] [--top N]
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Dict, List, Tuple
+
+import argparse
+import subprocess
+import sys
+
+REPEAT = 5
+
+CREATE_EMERGE = 'import time; start = time.perf_counter(); from emerge.appear import Emerge; Emerge(); print(time.perf_counter() - start)'
+
+
+def measure_import_time(module: str) -> Dict[str, Tuple[int, int]]:
+    """Imports a module in a fresh interpreter and returns the self and cumulative import time (in microseconds) of every imported module.
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], capture_output=True, text=True, check=True)
+    import_times: Dict[str, Tuple[int, int]] = {}
+
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, cumulative_time, name = line[len('import time:'):].split('|', 2)
+        import_times[name.strip()] = (int(self_time), int(cumulative_time))
+
+    return import_times
+
+
+def measure_emerge_creation() -> float:
+    process = subprocess.run([sys.executable, '-c', CREATE_EMERGE], capture_output=True, text=True, check=True)
+    return float(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description='measure the cold start import time of emerge')
+    argument_parser.add_argument('module', nargs='?', default='emerge.appear')
+    argument_parser.add_argument('--top', type=int, default=15, help='number of slowest modules to show')
+    args = argument_parser.parse_args()
+
+    runs: List[Dict[str, Tuple[int, int]]] = [measure_import_time(args.module) for _ in range(REPEAT)]
+    best_run = min(runs, key=lambda x: x[args.module][1])
+
+    print(f'import {args.module}: {best_run[args.module][1] / 1000:.1f} ms (best of {REPEAT} fresh interpreters, {len(best_run)} modules)')
+
+    # only show top level packages and emerge modules, nested modules of third-party packages are included in their package
+    relevant = [(name, times) for name, times in best_run.items() if '.' not in name or name.startswith('emerge')]
+    for name, (_, cumulative_time) in sorted(relevant, key=lambda x: x[1][1], reverse=True)[1:args.top + 1]:
+        print(f'  {cumulative_time / 1000:8.1f} ms  {name}')
+
+    print(f'import and create Emerge(): {min(measure_emerge_creation() for _ in range(REPEAT)) * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Measures the dependency curation of JavaParser.after_generated_file_results on synthetic java projects with 1k/10k/50k files,
+compared to the previous linear scan over all file results for every dependency.
+
+Run from the emerge project directory, e.g.: python -m benchmarks.java_dependencies [sizes ...]
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Dict, List
+
+import random
+import sys
+import time
+
+from emerge.analysis import Analysis
+from emerge.languages.abstractparser import LanguageType
+from emerge.languages.javaparser import JavaParser
+from emerge.results import FileResult
+
+SIZES = [1000, 10000, 50000]
+
+INTERNAL_IMPORTS_PER_FILE = 6
+EXTERNAL_IMPORTS = ['java.util.List', 'java.util.Map', 'java.io.File', 'javax.annotation.Nullable']
+
+# the linear scan is only measured on a sample of files and extrapolated to all files
+LINEAR_SCAN_SAMPLE = 200
+
+
+def create_parser(analysis: Analysis, number_of_files: int, seed: int = 0) -> JavaParser:
+    random_generator = random.Random(seed)
+    packages = [f'com/example/module{i // 500}/package{i // 25}' for i in range(number_of_files)]
+    class_names = [f'{packages[i]}/Class{i}' for i in range(number_of_files)]
+
+    parser = JavaParser()
+    for class_name in class_names:
+        relative_path = f'{class_name}.java'
+        file_result = FileResult.create_file_result(
+            analysis=analysis,
+            scanned_file_name=class_name.rsplit('/', 1)[-1] + '.java',
+            relative_file_path_to_analysis=relative_path,
+            absolute_name=f'/src/{relative_path}',
+            display_name=class_name.rsplit('/', 1)[-1] + '.java',
+            module_name='',
+            scanned_by=JavaParser.parser_name(),
+            scanned_language=LanguageType.JAVA,
+            scanned_tokens=[],
+            source='',
+            preprocessed_source=''
+        )
+        imported_classes = random_generator.sample(class_names, min(INTERNAL_IMPORTS_PER_FILE, number_of_files))
+        file_result.scanned_import_dependencies = [x.replace('/', '.') for x in imported_classes] + list(EXTERNAL_IMPORTS)
+        parser.results[file_result.unique_name] = file_result
+
+    return parser
+
+
+def curate_by_linear_scan(results: Dict[str, FileResult], sample: List[FileResult]) -> None:
+    """The previous implementation, every dependency is compared to every file result name.
+    """
+    for result in sample:
+        curated_dependencies = []
+        for dependency in result.scanned_import_dependencies:
+            curated = False
+            haystack = dependency.replace(".", "/") + ".java"
+            for needle in results:
+                if needle in haystack:
+                    curated = True
+                    curated_dependencies.append(needle)
+                    break
+            if not curated:
+                curated_dependencies.append(dependency)
+        result.scanned_import_dependencies = curated_dependencies
+
+
+def main():
+    sizes = [int(x) for x in sys.argv[1:]] or SIZES
+    for number_of_files in sizes:
+        analysis = Analysis()
+        analysis.source_directory = '/src/com'
+
+        parser = create_parser(analysis, number_of_files)
+        start = time.perf_counter()
+        parser.after_generated_file_results(analysis)
+        indexed = time.perf_counter() - start
+
+        linear_parser = create_parser(analysis, number_of_files)
+        results = dict(linear_parser.results)
+        sample = list(results.values())[:LINEAR_SCAN_SAMPLE]
+        start = time.perf_counter()
+        curate_by_linear_scan(results, sample)
+        linear = (time.perf_counter() - start) * number_of_files / len(sample)
+
+        identical = all(linear_parser.results[x.unique_name].scanned_import_dependencies == parser.results[x.unique_name].scanned_import_dependencies
+                        for x in sample)
+        print(f'{number_of_files:>6} files: indexed {indexed * 1000:9.1f} ms   linear scan (extrapolated) {linear * 1000:11.1f} ms   '
+              f'speedup: {linear / indexed:7.1f}x   identical: {identical}')
+
+
+if __name__ == '__main__':
+    main()
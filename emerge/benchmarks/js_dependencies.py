@@ -0,0 +1,110 @@
+"""
+Measures the dependency resolution of JavaScriptParser/TypeScriptParser.try_resolve_dependency on synthetic projects on disk,
+compared to the previous resolution that probed the filesystem (os.path.exists, Path.resolve) for every import.
+
+Run from the emerge project directory, e.g.: python -m benchmarks.js_dependencies [sizes ...]
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import List, Tuple
+from pathlib import Path
+from unittest import mock
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from emerge.analysis import Analysis
+from emerge.languages.abstractparser import LanguageType, ParsingMixin
+from emerge.languages.javascriptparser import JavaScriptParser
+from emerge.languages.typescriptparser import TypeScriptParser
+from emerge.languages.moduleresolver import ScannedFileResolver
+from emerge.results import FileResult
+
+SIZES = [1000, 10000]
+
+IMPORTS_PER_FILE = 10
+EXTERNAL_IMPORTS = ['react', 'lodash', '@angular/core', 'fs']
+
+
+class FilesystemResolver(ScannedFileResolver):
+    """The previous resolution, every check and relative path is resolved on the filesystem and nothing is remembered.
+    """
+
+    @classmethod
+    def for_analysis(cls, analysis, resolver):
+        return cls(analysis)
+
+    def exists(self, relative_analysis_path: str) -> bool:
+        return os.path.exists(f'{Path(self.source_directory).parent}/{relative_analysis_path}')
+
+    def resolve_relative_dependency_path(self, dependency: str, importing_directory: str) -> str:
+        return ParsingMixin.resolve_relative_dependency_path(dependency, importing_directory, self.source_directory)
+
+
+def create_project(root: str, number_of_files: int, extension: str, seed: int = 0) -> Tuple[Analysis, List[Tuple[FileResult, List[str]]]]:
+    random_generator = random.Random(seed)
+    source_directory = os.path.join(root, 'src')
+    analysis = Analysis()
+    analysis.source_directory = source_directory
+
+    modules = [(f'src/module{i // 200}/package{i // 20}', 'index' if i % 10 == 0 else f'file{i}') for i in range(number_of_files)]
+    for directory, name in modules:
+        os.makedirs(os.path.join(root, directory), exist_ok=True)
+        relative_path = f'{directory}/{name}.{extension}'
+        with open(os.path.join(root, relative_path), 'w', encoding='utf-8'):
+            pass
+        analysis.absolute_scanned_file_names.add(relative_path)
+
+    imports = []
+    for directory, name in modules:
+        file_result = FileResult.create_file_result(
+            analysis=analysis,
+            scanned_file_name=f'{name}.{extension}',
+            relative_file_path_to_analysis=f'{directory}/{name}.{extension}',
+            absolute_name=f'{directory}/{name}.{extension}',
+            display_name=f'{name}.{extension}',
+            module_name='',
+            scanned_by='',
+            scanned_language=LanguageType.JAVASCRIPT if extension == 'js' else LanguageType.TYPESCRIPT,
+            scanned_tokens=[],
+            source='',
+            preprocessed_source=''
+        )
+        dependencies = []
+        for imported_directory, imported_name in random_generator.sample(modules, IMPORTS_PER_FILE):
+            relative_path = os.path.relpath(f'{imported_directory}/{imported_name}', directory)
+            dependencies.append(relative_path if relative_path.startswith('..') else f'./{relative_path}')
+            dependencies.append(f'@scope/{imported_directory[len("src/"):]}')
+        imports.append((file_result, dependencies + EXTERNAL_IMPORTS))
+
+    return analysis, imports
+
+
+def resolve(parser, analysis: Analysis, imports: List[Tuple[FileResult, List[str]]]) -> Tuple[float, List[str]]:
+    start = time.perf_counter()
+    resolved = [parser.try_resolve_dependency(dependency, file_result, analysis) for file_result, dependencies in imports for dependency in dependencies]
+    return time.perf_counter() - start, resolved
+
+
+def main():
+    sizes = [int(x) for x in sys.argv[1:]] or SIZES
+    for parser_type, extension in [(JavaScriptParser, 'js'), (TypeScriptParser, 'ts')]:
+        for number_of_files in sizes:
+            with tempfile.TemporaryDirectory() as root:
+                analysis, imports = create_project(root, number_of_files, extension)
+                indexed, indexed_dependencies = resolve(parser_type(), analysis, imports)
+
+                with mock.patch(f'{parser_type.__module__}.ScannedFileResolver', FilesystemResolver):
+                    probed, probed_dependencies = resolve(parser_type(), analysis, imports)
+
+            print(f'{parser_type.__name__:>16} {number_of_files:>6} files: indexed {indexed * 1000:8.1f} ms   '
+                  f'filesystem probes {probed * 1000:8.1f} ms   speedup: {probed / indexed:5.1f}x   identical: {indexed_dependencies == probed_dependencies}')
+
+
+if __name__ == '__main__':
+    main()
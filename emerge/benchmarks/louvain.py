@@ -0,0 +1,93 @@
+"""
+Measures LouvainModularityMetric on a synthetic dependency graph with serial and parallel optimization runs and with every available community detection backend,
+and the community size calculation of a single partition compared to the previous calculation that counted every community on its own.
+
+Run from the emerge project directory, e.g.: python -m benchmarks.louvain [nodes] [workers]
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Dict, Any, Tuple
+from collections import Counter
+
+import importlib.util
+import logging
+import os
+import sys
+import time
+
+import networkx as nx
+
+from emerge.analysis import Analysis
+from emerge.graph import GraphRepresentation, GraphType
+from emerge.metrics.modularity.modularity import LouvainModularityMetric
+from emerge.metrics.modularity.communities import COMMUNITY_DETECTION_BACKENDS, LouvainBackend
+
+NODES = 20000
+EDGES_PER_NODE = 1.5
+
+
+def create_dependency_graph(number_of_nodes: int, seed: int = 0) -> GraphRepresentation:
+    digraph = nx.gnm_random_graph(number_of_nodes, int(number_of_nodes * EDGES_PER_NODE), seed=seed, directed=True)
+    dependency_graph = GraphRepresentation(GraphType.FILE_RESULT_DEPENDENCY_GRAPH)
+    dependency_graph.digraph = nx.relabel_nodes(digraph, {node: f'src/file{node}.py' for node in digraph})
+    return dependency_graph
+
+
+def calculate(dependency_graph: GraphRepresentation, workers: int, backend: str = 'louvain') -> Tuple[float, LouvainModularityMetric]:
+    analysis = Analysis()
+    analysis.louvain_workers = workers
+    analysis.louvain_backend = backend
+    metric = LouvainModularityMetric(analysis, {GraphType.FILE_RESULT_DEPENDENCY_GRAPH.name.lower(): dependency_graph})
+
+    start = time.perf_counter()
+    metric.calculate_from_results({})
+    return time.perf_counter() - start, metric
+
+
+def community_sizes_per_community(partition: Dict[Any, int]) -> Dict[int, int]:
+    """The previous implementation, counts every community with its own pass over the partition.
+    """
+    community_sizes = {}
+    for i in range(max(partition.values()) + 1):
+        community_sizes[i] = sum(map((i).__eq__, partition.values()))
+    return community_sizes
+
+
+def main():
+    logging.disable(logging.WARNING)
+    number_of_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else NODES
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    dependency_graph = create_dependency_graph(number_of_nodes)
+
+    serial, serial_metric = calculate(dependency_graph, 1)
+    parallel, parallel_metric = calculate(dependency_graph, workers)
+    identical = serial_metric.local_data == parallel_metric.local_data and serial_metric.overall_data == parallel_metric.overall_data
+    print(f'{number_of_nodes} nodes: serial {serial * 1000:9.1f} ms   {workers} workers {parallel * 1000:9.1f} ms   '
+          f'speedup: {serial / parallel:5.1f}x   identical: {identical}')
+
+    for backend in COMMUNITY_DETECTION_BACKENDS:
+        if backend == 'leiden' and importlib.util.find_spec('leidenalg') is None:
+            print(f'{backend:>17}: skipped, the optional package leidenalg is not installed')
+            continue
+        elapsed, metric = calculate(dependency_graph, 1, backend)
+        print(f'{backend:>17}: {elapsed * 1000:9.1f} ms   speedup: {serial / elapsed:5.1f}x   '
+              f'modularity: {metric.overall_data[LouvainModularityMetric.Keys.LOUVAIN_MODULARITY_DEPENDENCY_GRAPH.value]:.2f}   '
+              f'communities: {metric.overall_data[LouvainModularityMetric.Keys.LOUVAIN_COMMUNITIES_DEPENDENCY_GRAPH.value]}')
+
+    partition, _ = LouvainBackend(dependency_graph.digraph.to_undirected()).partition(0)
+    start = time.perf_counter()
+    community_sizes = Counter(partition.values())
+    counted = time.perf_counter() - start
+
+    start = time.perf_counter()
+    previous_community_sizes = community_sizes_per_community(partition)
+    per_community = time.perf_counter() - start
+    print(f'{len(community_sizes)} communities: counter {counted * 1000:9.2f} ms   per community {per_community * 1000:9.1f} ms   '
+          f'speedup: {per_community / counted:7.1f}x   identical: {dict(community_sizes) == previous_community_sizes}')
+
+
+if __name__ == '__main__':
+    main()
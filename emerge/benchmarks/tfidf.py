@@ -0,0 +1,93 @@
+"""
+Measures TFIDFMetric.calculate_tfidf on synthetic token documents (zipf distributed words),
+compared to the previous calculation that transformed every result on its own and sorted its scores in python.
+
+Run from the emerge project directory, e.g.: python -m benchmarks.tfidf [sizes ...]
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Dict
+
+import logging
+import math
+import random
+import sys
+import time
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from emerge.analysis import Analysis
+from emerge.metrics.tfidf.tfidf import TFIDFMetric
+
+SIZES = [1000, 5000]
+
+VOCABULARY_SIZE = 20000
+TOKENS_PER_DOCUMENT = 400
+
+
+def calculate_tfidf_per_result(result_tokens: Dict[str, str]) -> Dict[str, Dict]:
+    """The previous implementation, returns the local data by result name.
+    """
+    local_data: Dict[str, Dict] = {}
+    tfidf = TfidfVectorizer()
+    tfidf.fit_transform(result_tokens.values())
+    feature_names = tfidf.get_feature_names_out()
+
+    for name, tokens in result_tokens.items():
+        scores = {}
+        response = tfidf.transform([tokens])
+        for col in response.nonzero()[1]:
+            scores[feature_names[col]] = response[0, col]
+
+        tfidf_metric_token_dict = {}
+        count_tokens = 1
+        for key, value in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+            if 0.2 < value and count_tokens <= 7:
+                tfidf_metric_token_dict['tag_' + key] = value
+                count_tokens += 1
+        local_data[name] = tfidf_metric_token_dict
+    return local_data
+
+
+def same_tokens(local_data: Dict[str, Dict], previous_local_data: Dict[str, Dict]) -> bool:
+    """The fitted matrix and a transform of a single result may differ in the last bit of a score (normalized in another summation order),
+    so compare the selected tokens in order and their scores up to rounding.
+    """
+    return local_data.keys() == previous_local_data.keys() and all(
+        list(local_data[name]) == list(tokens) and all(math.isclose(local_data[name][tag], score, rel_tol=1e-12) for tag, score in tokens.items())
+        for name, tokens in previous_local_data.items())
+
+
+def create_documents(number_of_documents: int, seed: int = 0) -> Dict[str, str]:
+    random_generator = random.Random(seed)
+    vocabulary = [f'word{chr(97 + i % 26)}{chr(97 + i // 26 % 26)}{chr(97 + i // 676 % 26)}' for i in range(VOCABULARY_SIZE)]
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY_SIZE)]
+    return {f'file{i}': ''.join(f'{word} ' for word in random_generator.choices(vocabulary, weights, k=random_generator.randint(1, TOKENS_PER_DOCUMENT)))
+            for i in range(number_of_documents)}
+
+
+def main():
+    logging.disable(logging.WARNING)
+    sizes = [int(x) for x in sys.argv[1:]] or SIZES
+
+    for number_of_documents in sizes:
+        result_tokens = create_documents(number_of_documents)
+
+        metric = TFIDFMetric(Analysis())
+        metric.result_tokens = result_tokens
+        start = time.perf_counter()
+        metric.calculate_tfidf()
+        batched = time.perf_counter() - start
+
+        start = time.perf_counter()
+        previous_local_data = calculate_tfidf_per_result(result_tokens)
+        per_result = time.perf_counter() - start
+
+        print(f'{number_of_documents:>7} results: batched {batched * 1000:9.1f} ms   per result {per_result * 1000:10.1f} ms   '
+              f'speedup: {per_result / batched:6.1f}x   same tokens: {same_tokens(metric.local_data, previous_local_data)}')
+
+
+if __name__ == '__main__':
+    main()
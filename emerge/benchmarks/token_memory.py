@@ -0,0 +1,58 @@
+"""
+Compares the memory that is retained by token lists and by compact TokenSequences for all source files of a directory.
+
+Run from the emerge project directory, e.g.: python -m benchmarks.token_memory /path/to/repository
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import List
+import os
+import sys
+import tracemalloc
+
+from emerge.content import read_file_content
+from emerge.files import LanguageExtension
+from emerge.languages.abstractparser import ParsingMixin
+from emerge.tokens import TokenSequence, TokenTable
+
+
+def source_files(directory: str) -> List[str]:
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [x for x in dirs if not x.startswith('.') and x != 'node_modules']
+        for file_name in files:
+            if LanguageExtension.value_exists(os.path.splitext(file_name)[1]):
+                paths.append(os.path.join(root, file_name))
+    return paths
+
+
+def retained_bytes(paths: List[str], compact: bool) -> int:
+    tracemalloc.start()
+    retained = []
+    token_table = TokenTable()
+    for path in paths:
+        tokens = ParsingMixin.preprocess_file_content_and_generate_token_list(read_file_content(path))
+        retained.append(TokenSequence(tokens, token_table) if compact else tokens)
+        del tokens
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), '..', 'emerge')
+    paths = source_files(directory)
+
+    token_count = sum(len(ParsingMixin.preprocess_file_content_and_generate_token_list(read_file_content(path))) for path in paths)
+    list_bytes = retained_bytes(paths, compact=False)
+    compact_bytes = retained_bytes(paths, compact=True)  # includes all interned tokens of the token table
+
+    print(f'{len(paths)} files, {token_count} tokens in {os.path.abspath(directory)}')
+    print(f'list of str:   {list_bytes / 1024 / 1024:8.2f} MB')
+    print(f'TokenSequence: {compact_bytes / 1024 / 1024:8.2f} MB ({100 * (1 - compact_bytes / max(1, list_bytes)):.1f}% less)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Compares the single-pass tokenizer with the chained str.replace tokenizer on the test data corpora of all parsers.
+
+Run from the emerge project directory, e.g.: python -m benchmarks.tokenizer
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+import timeit
+
+from emerge.tests.testdata.c import C_TEST_FILES
+from emerge.tests.testdata.cpp import CPP_TEST_FILES
+from emerge.tests.testdata.go import GO_TEST_FILES
+from emerge.tests.testdata.groovy import GROOVY_TEST_FILES
+from emerge.tests.testdata.java import JAVA_TEST_FILES
+from emerge.tests.testdata.javascript import JAVASCRIPT_TEST_FILES
+from emerge.tests.testdata.kotlin import KOTLIN_TEST_FILES
+from emerge.tests.testdata.objc import OBJC_TEST_FILES
+from emerge.tests.testdata.py import PYTHON_TEST_FILES
+from emerge.tests.testdata.ruby import RUBY_TEST_FILES
+from emerge.tests.testdata.swift import SWIFT_TEST_FILES
+from emerge.tests.testdata.typescript import TYPESCRIPT_TEST_FILES
+
+from emerge.languages.abstractparser import ParsingMixin
+from emerge.languages.goparser import GoParser
+from emerge.languages.javascriptparser import JavaScriptParser
+from emerge.languages.pyparser import PythonParser
+from emerge.languages.swiftparser import SwiftParser
+from emerge.tokens import Tokenizer
+
+TEST_CORPORA = [C_TEST_FILES, CPP_TEST_FILES, GO_TEST_FILES, GROOVY_TEST_FILES, JAVA_TEST_FILES, JAVASCRIPT_TEST_FILES,
+                KOTLIN_TEST_FILES, OBJC_TEST_FILES, PYTHON_TEST_FILES, RUBY_TEST_FILES, SWIFT_TEST_FILES, TYPESCRIPT_TEST_FILES]
+
+# parsers with distinct token mappings (the other parsers use the same mapping as PythonParser)
+PARSERS = [GoParser, JavaScriptParser, PythonParser, SwiftParser]
+
+REPEAT = 5
+NUMBER = 20
+
+
+def main():
+    contents = [content for corpus in TEST_CORPORA for content in corpus.values()]
+    total_size = sum(len(content) for content in contents)
+    mappings = {'default': ParsingMixin.DEFAULT_TOKEN_MAPPINGS}
+    mappings.update({parser.__name__: parser()._token_mappings for parser in PARSERS})
+
+    print(f'{len(contents)} files, {total_size / 1024:.0f} KB, best of {REPEAT} x {NUMBER} runs')
+    for name, mapping in mappings.items():
+        tokenizer = Tokenizer(mapping)
+        replacements = min(timeit.repeat(lambda: [tokenizer.tokenize_by_replacements(x) for x in contents], repeat=REPEAT, number=NUMBER))
+        single_pass = min(timeit.repeat(lambda: [tokenizer.tokenize(x) for x in contents], repeat=REPEAT, number=NUMBER))
+        print(f'{name:<18} replacements: {replacements * 1000 / NUMBER:7.2f} ms   single pass: {single_pass * 1000 / NUMBER:7.2f} ms   '
+              f'speedup: {replacements / single_pass:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -23,6 +23,9 @@ from emerge.stats import Statistics
 from emerge.log import Logger
 from emerge.core import format_timedelta
 from emerge.files import truncate_directory, LanguageExtension
+from emerge.inventory import RepositoryInventory
+from emerge.content import FileContentCache
+from emerge.tokens import TokenTable
 
 from emerge.export import GraphExporter, TableExporter, JSONExporter, D3Exporter
 
@@ -47,6 +50,33 @@ class Analysis:
         self.include_git_metrics: Optional[bool] = False
         self.git_commit_limit: Optional[int] = 150
         self.git_exclude_merge_commits: Optional[bool] = True
+        self.git_max_files_per_commit: int = 500
+        self.git_export_commit_links: bool = False
+
+        # number of worker processes for file result creation, None falls back to EMERGE_PARSE_WORKERS or a serial scan
+        self.parse_workers: Optional[int] = None
+
+        # seed of the louvain optimization runs (every run uses seed + its index) and their number of worker processes,
+        # None falls back to EMERGE_LOUVAIN_WORKERS or serial runs
+        self.louvain_seed: int = 0
+        self.louvain_workers: Optional[int] = None
+
+        # community detection backend of the louvain modularity metric: louvain, leiden (optional dependency) or label_propagation
+        self.louvain_backend: str = 'louvain'
+
+        # on-disk cache for parsed file results, only used if a cache directory is configured
+        self.parse_cache_directory: Optional[str] = None
+        self.parse_cache_max_size: int = 512  # megabytes
+
+        # bounded cache of file contents, files are read on demand instead of being kept in memory for the whole analysis
+        self.file_content_cache_max_size: int = 64  # megabytes
+        self._file_content_cache: Optional[FileContentCache] = None
+
+        # interned tokens of all file results, released together with this analysis instead of growing for the lifetime of the process
+        self.token_table: TokenTable = TokenTable()
+
+        # inventory of the source directory, reused if it was already created outside of emerge (e.g. for language detection)
+        self.inventory: Optional[RepositoryInventory] = None
 
         self.export_directory: Optional[str] = None
         self.export_graphml: bool = False
@@ -124,7 +154,8 @@ class Analysis:
             GraphType.ENTITY_RESULT_DEPENDENCY_GRAPH.name.lower(): None,
             GraphType.ENTITY_RESULT_INHERITANCE_GRAPH.name.lower(): None,
             GraphType.FILE_RESULT_DEPENDENCY_GRAPH.name.lower(): None,
-            GraphType.FILESYSTEM_GRAPH.name.lower(): None
+            GraphType.FILESYSTEM_GRAPH.name.lower(): None,
+            GraphType.FILE_RESULT_CHANGE_COUPLING_GRAPH.name.lower(): None
         }
 
         self._start_time: datetime = None
@@ -133,6 +164,57 @@ class Analysis:
 
         self.statistics = Statistics()
 
+    # configuration attributes that parsers need to create file results, see create_parsing_context()
+    PARSING_CONTEXT_ATTRIBUTES = [
+        'analysis_name',
+        'project_name',
+        'source_directory',
+        'emerge_version',
+        'only_permit_languages',
+        'only_permit_file_extensions',
+        'ignore_dependencies_containing',
+        'ignore_dependencies_matching',
+        'ignore_entities_containing',
+        'ignore_entities_matching',
+        'import_aliases_available',
+        'import_aliases',
+        'override_resolve_dependencies',
+        'override_do_not_resolve_dependencies',
+        'absolute_scanned_file_names',
+        'scanned_files_nodes_in_directories'
+    ]
+
+    def create_parsing_context(self) -> 'Analysis':
+        """Creates a lightweight copy of this analysis that only contains the configuration needed by parsers to create file results.
+        The copy does not carry any results, graphs or metrics, so it can be cheaply handed over to worker processes.
+
+        Returns:
+            Analysis: A new analysis instance with the parsing relevant configuration.
+        """
+        context = Analysis()
+        for attribute in self.PARSING_CONTEXT_ATTRIBUTES:
+            setattr(context, attribute, getattr(self, attribute))
+        return context
+
+    @property
+    def file_content_cache(self) -> FileContentCache:
+        if self._file_content_cache is None:
+            self._file_content_cache = FileContentCache(self.file_content_cache_max_size * 1024 * 1024)
+        return self._file_content_cache
+
+    def read_file_content(self, path: str, size: Optional[int] = None, mtime: Optional[float] = None) -> str:
+        """Reads the content of a scanned file through the file content cache of this analysis.
+
+        Args:
+            path (str): Path of the file on disk.
+            size (Optional[int]): Known size of the file.
+            mtime (Optional[float]): Known modification time of the file.
+
+        Returns:
+            str: The file content.
+        """
+        return self.file_content_cache.read(path, size, mtime)
+
     def add_results(self, results) -> None:
         """Add results to this analysis.
 
@@ -271,6 +353,39 @@ class Analysis:
 
         self.statistics.add(key=Statistics.Key.RUNTIME, value=metric_runtime, prefix=metric.metric_name)
 
+    def calculate_code_metrics(self, metrics: List[AbstractCodeMetric]) -> None:
+        """Calculates code metrics with the same results as calculate_metric for every metric, but visits all entity results and all file results only once
+        for all metrics, so that every result is only read/joined/split once.
+
+        Args:
+            metrics (List[AbstractCodeMetric]): Code metrics in the order they would be calculated by calculate_metric.
+        """
+        from emerge.metrics.metrics import CodeMetricPass  # pylint: disable=import-outside-toplevel
+
+        runtimes: Dict[AbstractCodeMetric, float] = {metric: 0.0 for metric in metrics}
+
+        # like calculate_metric, entity results are calculated before file results
+        for result_filter, contains_metric in [(MetricResultFilter.ENTITY_RESULTS, self.contains_metric_for_entity_results),
+                                               (MetricResultFilter.FILE_RESULTS, self.contains_metric_for_file_results)]:
+            metric_pass = CodeMetricPass([metric for metric in metrics if contains_metric(metric.metric_name)])
+            if metric_pass.metrics:
+                metric_pass.calculate_from_results(self.filtered_results(result_filter))
+                for metric, runtime in metric_pass.runtimes.items():
+                    runtimes[metric] += runtime
+
+        for metric in metrics:
+            if self.contains_metric_for_entity_results(metric.metric_name) or self.contains_metric_for_file_results(metric.metric_name):
+                self.collect_local_metric_results(metric.local_data)
+                self.collect_overall_metric_results(metric.overall_data)
+            self.statistics.add(key=Statistics.Key.RUNTIME, value=timedelta(seconds=runtimes[metric]), prefix=metric.metric_name)
+
+    @property
+    def contains_export(self) -> bool:
+        """Checks if any export was configured within this analysis.
+        """
+        return any([self.export_graphml, self.export_d3, self.export_tabular_file, self.export_json,
+                    self.export_tabular_console_overall, self.export_tabular_console])
+
     def export(self) -> None:
         """Triggers all exports that are configured within this analysis. Collects statistics, metric results and exports them to the configured outputs.
         """
@@ -421,7 +536,7 @@ class Analysis:
     def create_filesystem_graph(self) -> None:
         """Creates a filesystem graph which is basically a graph representation of the project filesystem tree.
         This filesystem graph is used for further calculations and metric results.
-        The filesystem graph does NOT contain file content, only the graph structure. The content is stored in the self.filesyste_nodes dict.
+        The filesystem graph does NOT contain file content, only the graph structure. The file nodes in the self.filesyste_nodes dict only know the path, size and modification time of a file, its content is read on demand.
         """
 
         if self.source_directory is None:
@@ -450,7 +565,11 @@ class Analysis:
             display_name=filesystem_root_node.absolute_name
         )
 
-        for root, dirs, files in os.walk(self.source_directory):
+        # walk the source directory only once, or reuse an existing inventory of it
+        if self.inventory is None or not self.inventory.matches(self.source_directory, self.ignore_directories_containing, self.ignore_files_containing):
+            self.inventory = RepositoryInventory.scan(self.source_directory, self.ignore_directories_containing, self.ignore_files_containing)
+
+        for root, dirs, files in self.inventory.walk():
             # exclude directories and scans
 
             if self.ignore_directories_containing:
@@ -534,22 +653,23 @@ class Analysis:
                 else:
                     self.scanned_files_nodes_in_directories[relative_root].append(relative_file_path_to_analysis)
 
-                with open(absolute_path_to_file, encoding="ISO-8859-1") as file:
-                    file_content = file.read()
-                    file_node = FileSystemNode(FileSystemNodeType.FILE, relative_file_path_to_analysis, file_content)
-                    filesystem_graph.filesystem_nodes[file_node.absolute_name] = file_node
-
-                    filesystem_graph.digraph.add_node(
-                        file_node.absolute_name,
-                        directory=False,
-                        file=True,
-                        display_name=Path(file_node.absolute_name).name,
-                        result_name=relative_file_path_to_analysis
-                    )
+                # only remember where to read the file from, its content is read when the file gets parsed
+                stat_result = os.stat(absolute_path_to_file)
+                file_node = FileSystemNode(FileSystemNodeType.FILE, relative_file_path_to_analysis,
+                                           path=absolute_path_to_file, size=stat_result.st_size, mtime=stat_result.st_mtime)
+                filesystem_graph.filesystem_nodes[file_node.absolute_name] = file_node
+
+                filesystem_graph.digraph.add_node(
+                    file_node.absolute_name,
+                    directory=False,
+                    file=True,
+                    display_name=Path(file_node.absolute_name).name,
+                    result_name=relative_file_path_to_analysis
+                )
 
-                    filesystem_graph.digraph.add_edge(relative_root, file_node.absolute_name)
+                filesystem_graph.digraph.add_edge(relative_root, file_node.absolute_name)
 
-                    scanned_files += 1
+                scanned_files += 1
 
         scanning_stops = datetime.now()
 
@@ -7,35 +7,88 @@ Defines 'Analyzer' which brings together the current configuration, analyses, pa
 
 import os
 import logging
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Tuple, Optional
 from pathlib import Path
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 
 from datetime import datetime
 import coloredlogs
 
 from emerge.metrics.abstractmetric import AbstractCodeMetric, AbstractGraphMetric, AbstractMetric
 from emerge.languages.abstractparser import AbstractParser
+from emerge.abstractresult import AbstractFileResult
 
 from emerge.graph import GraphType, FileSystemNode, FileSystemNodeType
 from emerge.config import Configuration
 from emerge.analysis import Analysis
 from emerge.stats import Statistics
 from emerge.files import FileScanMapper
+from emerge.cache import ParseCache
+from emerge.content import read_file_content
 from emerge.log import Logger
-from emerge.core import format_timedelta
+from emerge.core import format_timedelta, resolve_worker_count
 
 LOGGER = Logger(logging.getLogger('analysis'))
 coloredlogs.install(level='E', logger=LOGGER.logger(), fmt=Logger.log_format)
 
+PARSE_WORKERS_ENVIRONMENT_VARIABLE = 'EMERGE_PARSE_WORKERS'
+
+# a scan job is given by (parser name, file name, full file path, path of the file on disk), the file content is read when the job is processed
+ScanJob = Tuple[str, str, str, str]
+
+# parser instances and parsing context of a worker process, set up once by _initialize_parse_worker
+_worker_parsers: Dict[str, AbstractParser] = {}
+_worker_analysis: Any = None
+
+
+def _initialize_parse_worker(parser_types: Dict[str, Any], analysis: Analysis) -> None:
+    """Instantiates all needed parsers once per worker process.
+    """
+    global _worker_analysis  # pylint: disable=global-statement
+    _worker_analysis = analysis
+    _worker_parsers.clear()
+    for parser_name, parser_type in parser_types.items():
+        _worker_parsers[parser_name] = parser_type()
+
+
+def _generate_file_results_in_worker(scan_jobs: List[Tuple[int, ScanJob]]) -> Tuple[List[Tuple[int, Any]], Statistics]:
+    """Creates file results for a chunk of indexed scan jobs within a worker process.
+    The results are detached from the worker analysis and returned by the index of their scan job, together with the gathered statistics.
+    """
+    _worker_analysis.statistics = Statistics()
+    generated_file_results: List[Tuple[int, Any]] = []
+
+    for index, (parser_name, file_name, full_file_path, file_path) in scan_jobs:
+        parser = _worker_parsers[parser_name]
+        parser.results.clear()
+        parser.generate_file_result_from_analysis(
+            _worker_analysis,
+            file_name=file_name,
+            full_file_path=full_file_path,
+            file_content=read_file_content(file_path)
+        )
+        for _, file_result in parser.results.items():
+            file_result.analysis = None
+            file_result.release_source()
+            generated_file_results.append((index, file_result))
+        parser.results.clear()
+
+    return generated_file_results, _worker_analysis.statistics
+
 
 class Analyzer:
     def __init__(self, config: Configuration, parsers):
         self._config: Configuration = config
         self._parsers = parsers
         self._results: Dict[str, Any] = {}
+        self._parse_cache: Optional[ParseCache] = None
 
-    def start_analyzing(self):
+    def start_analyzing(self) -> List[Analysis]:
         """Starts every analysis found in the current configuration.
+
+        Returns:
+            List[Analysis]: All analyses with their statistics, metric results and graph representations.
         """
         analyses_names = [x.analysis_name for x in self._config.analyses]
         LOGGER.info_start(f'starting to analyze {self._config.project_name}')
@@ -53,6 +106,8 @@ class Analyzer:
             analysis.statistics.add(key=Statistics.Key.ANALYSIS_RUNTIME, value=analysis.duration())
             self._clear_all_parsers()
 
+        return self._config.analyses
+
     def start_scanning(self, analysis: Analysis):
         """Starts the scanning phase of a given analysis, depending on the current configuration:
         - Creates file/entity results
@@ -89,6 +144,11 @@ class Analyzer:
         if analysis.contains_code_metrics:
             self._calculate_code_metric_results(analysis)
 
+        self._close_parse_cache(analysis)
+
+        # file contents are not needed anymore after all code metrics are calculated
+        analysis.file_content_cache.clear()
+
         if analysis.contains_graph_metrics:
             analysis.calculate_graph_representations()
             self._calculate_graph_metric_results(analysis)
@@ -100,7 +160,9 @@ class Analyzer:
         delta_total_runtime = stop_time - start_time
         analysis.total_runtime = format_timedelta(delta_total_runtime, '%H:%M:%S + %s ms')
         analysis.statistics.add(key=Statistics.Key.TOTAL_RUNTIME, value=analysis.total_runtime)
-        analysis.export()
+
+        if analysis.contains_export:
+            analysis.export()
 
         LOGGER.info_done(f'total runtime of analysis: {analysis.total_runtime}')
 
@@ -122,6 +184,7 @@ class Analyzer:
 
         filesystem_graph = analysis.graph_representations[GraphType.FILESYSTEM_GRAPH.name.lower()]
 
+        scan_jobs: List[ScanJob] = []
         project_node: FileSystemNode
         for _, filesystem_node in filesystem_graph.filesystem_nodes.items():
             project_node = filesystem_node
@@ -133,23 +196,61 @@ class Analyzer:
                 parser_name = FileScanMapper.choose_parser(file_extension, analysis.only_permit_languages)
 
                 if parser_name in self._parsers:
-                    parser: AbstractParser = self._parsers[parser_name]
-
-                    file_content = project_node.content
-
-                    if file_content is None:
-                        raise Exception(f'file content is None for file: {project_node.absolute_name}')
-                    
+                    if project_node.path is None:
+                        raise Exception(f'file path is None for file: {project_node.absolute_name}')
+
+                    scan_jobs.append((parser_name, file_name, project_node.absolute_name, project_node.path))
+
+        # restore file results of unchanged files from the parse cache, if one is configured
+        parse_cache = ParseCache.from_analysis(analysis)
+        cached_file_results: Dict[int, AbstractFileResult] = {}
+        if parse_cache is not None:
+            cached_file_results = parse_cache.load_file_results(analysis, scan_jobs, self._parsers)
+            LOGGER.info(f'restored {len(cached_file_results)}/{len(scan_jobs)} file results from the parse cache')
+
+        missing_scan_jobs = [(index, scan_job) for index, scan_job in enumerate(scan_jobs) if index not in cached_file_results]
+
+        workers = min(resolve_worker_count(analysis.parse_workers, PARSE_WORKERS_ENVIRONMENT_VARIABLE), len(missing_scan_jobs))
+        analysis.statistics.add(key=Statistics.Key.PARSE_WORKERS, value=max(1, workers))
+
+        if workers > 1:
+            generated_file_results = self._generate_file_results_in_parallel(analysis, missing_scan_jobs, workers)
+
+            # merge all results in scan order, so the outcome is the same as in a serial scan
+            for index, (parser_name, _, _, _) in enumerate(scan_jobs):
+                file_result = cached_file_results.get(index, generated_file_results.get(index))
+                if file_result is not None:
+                    self._parsers[parser_name].results[file_result.unique_name] = file_result
+                    analysis.add_results({file_result.unique_name: file_result})
+        else:
+            for index, (parser_name, file_name, full_file_path, file_path) in enumerate(scan_jobs):
+                parser: AbstractParser = self._parsers[parser_name]
+
+                if index in cached_file_results:
+                    cached_file_result = cached_file_results[index]
+                    parser.results[cached_file_result.unique_name] = cached_file_result
+                else:
+                    number_of_results = len(parser.results)
                     parser.generate_file_result_from_analysis(
                         analysis,
                         file_name=file_name,
-                        full_file_path=project_node.absolute_name,
-                        file_content=file_content
+                        full_file_path=full_file_path,
+                        file_content=analysis.read_file_content(file_path)
                     )
-                    
-                    results = self._parsers[parser_name].results
-                    analysis.add_results(results)
 
+                    # only keep the content of a parsed file in the bounded file content cache
+                    for file_result in islice(reversed(parser.results.values()), len(parser.results) - number_of_results):
+                        file_result.release_source()
+
+                results = self._parsers[parser_name].results
+                analysis.add_results(results)
+
+        # cache new results before any post-processing changes their dependencies
+        if parse_cache is not None:
+            parse_cache.store_file_results(analysis.file_results.values())
+            self._parse_cache = parse_cache
+
+        # the post-processing (e.g. dependency curation across all results) is still done serially
         for parser_name, parser in self._parsers.items():
             if bool(parser.results):
                 parser.after_generated_file_results(analysis)
@@ -159,6 +260,36 @@ class Analyzer:
         analysis.statistics.add(key=Statistics.Key.EXTRACTED_FILE_RESULTS, value=analysis.number_of_file_results)
         analysis.statistics.add(key=Statistics.Key.FILE_RESULTS_CREATION_RUNTIME, value=file_result_creation_stops - file_result_creation_starts)
 
+    def _generate_file_results_in_parallel(self, analysis: Analysis, scan_jobs: List[Tuple[int, ScanJob]], workers: int) -> Dict[int, AbstractFileResult]:
+        """Shards the given indexed scan jobs across a pool of worker processes that tokenize the files and extract their imports.
+
+        Args:
+            analysis (Analysis): A given analysis.
+            scan_jobs (List[Tuple[int, ScanJob]]): Scan jobs given by (parser name, file name, full file path, path of the file on disk) and their index.
+            workers (int): The number of worker processes.
+
+        Returns:
+            Dict[int, AbstractFileResult]: The generated file results (attached to the given analysis) by the index of their scan job.
+        """
+        LOGGER.info(f'creating file results with {workers} worker processes')
+
+        parser_types = {parser_name: type(self._parsers[parser_name]) for _, (parser_name, _, _, _) in scan_jobs}
+
+        # use a few chunks per worker to balance uneven file sizes without paying too much inter-process overhead
+        chunk_size = max(1, len(scan_jobs) // (workers * 4))
+        chunks = [scan_jobs[i:i + chunk_size] for i in range(0, len(scan_jobs), chunk_size)]
+
+        generated_file_results: Dict[int, AbstractFileResult] = {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_parse_worker,
+                                 initargs=(parser_types, analysis.create_parsing_context())) as executor:
+            for chunk_file_results, statistics in executor.map(_generate_file_results_in_worker, chunks):
+                for index, file_result in chunk_file_results:
+                    file_result.analysis = analysis
+                    generated_file_results[index] = file_result
+                analysis.statistics.merge(statistics)
+
+        return generated_file_results
+
     def _create_entity_results(self, analysis: Analysis):
         """Creates entity results from the file results of a given analysis for every active parser.
         After the results are stored in the analysis, statistics are added.
@@ -186,14 +317,11 @@ class Analyzer:
 
         code_file_metrics = {k: v for (k, v) in analysis.metrics_for_file_results.items() if isinstance(v, AbstractCodeMetric)}
         code_entity_metrics = {k: v for (k, v) in analysis.metrics_for_entity_results.items() if isinstance(v, AbstractCodeMetric)}
-        ordered_metric_calculations: List = [code_file_metrics, code_entity_metrics]
+        ordered_metrics: List[AbstractCodeMetric] = list(code_file_metrics.values()) + list(code_entity_metrics.values())
 
-        for metric_mapping in ordered_metric_calculations:
-            if bool(metric_mapping):
-                metric: AbstractMetric
-                for _, metric in metric_mapping.items():
-                    LOGGER.info(f'calculating code metric results for: {metric.pretty_metric_name}')
-                    analysis.calculate_metric(metric)
+        # all code metrics are calculated in one pass over the results
+        LOGGER.info(f'calculating code metric results for: {", ".join(metric.pretty_metric_name for metric in ordered_metrics)}')
+        analysis.calculate_code_metrics(ordered_metrics)
 
         LOGGER.info_done('done calculating code metric results')
 
@@ -219,6 +347,19 @@ class Analyzer:
 
         LOGGER.info_done('done calculating graph metric results')
 
+    def _close_parse_cache(self, analysis: Analysis):
+        """Adds the per-file code metrics to the parse cache of the given analysis (if any) and closes it.
+
+        Args:
+            analysis (Analysis): A given analysis.
+        """
+        if self._parse_cache is None:
+            return
+
+        self._parse_cache.store_file_metrics(analysis.file_results.values())
+        self._parse_cache.close()
+        self._parse_cache = None
+
     def _collect_all_results(self):
         """Collects results from all configured analyses.
         """
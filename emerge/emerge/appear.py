@@ -5,27 +5,18 @@ All analyses get started from here.
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import Dict
+from typing import Dict, List, Optional
 import logging
 
 import coloredlogs
 
 from emerge.languages.abstractparser import AbstractParser
-from emerge.languages.javaparser import JavaParser
-from emerge.languages.swiftparser import SwiftParser
-from emerge.languages.cparser import CParser
-from emerge.languages.cppparser import CPPParser
-from emerge.languages.groovyparser import GroovyParser
-from emerge.languages.javascriptparser import JavaScriptParser
-from emerge.languages.typescriptparser import TypeScriptParser
-from emerge.languages.kotlinparser import KotlinParser
-from emerge.languages.objcparser import ObjCParser
-from emerge.languages.rubyparser import RubyParser
-from emerge.languages.pyparser import PythonParser
-from emerge.languages.goparser import GoParser
 
 from emerge.config import Configuration
+from emerge.analysis import Analysis
 from emerge.analyzer import Analyzer
+from emerge.inventory import RepositoryInventory
+from emerge.registry import ParserRegistry, supported_languages
 from emerge.abstractresult import AbstractResult
 from emerge.log import Logger, LogLevel
 
@@ -38,28 +29,16 @@ __updated__ = '2023-05-27 12:47:04'
 
 class Emerge:
     _version: str = f'{__version__}'
-    config = Configuration(_version)
 
     def __init__(self):
-        """Initialize all collected results, available parsers and set the log level.
+        """Initialize all collected results, a registry of available parsers and set the log level.
         """
+        self.config = Configuration(self._version)
         self._results: Dict[str, AbstractResult] = {}
-        self._parsers: Dict[str, AbstractParser] = {
-            JavaParser.parser_name(): JavaParser(),
-            SwiftParser.parser_name(): SwiftParser(),
-            CParser.parser_name(): CParser(),
-            CPPParser.parser_name(): CPPParser(),
-            GroovyParser.parser_name(): GroovyParser(),
-            JavaScriptParser.parser_name(): JavaScriptParser(),
-            TypeScriptParser.parser_name(): TypeScriptParser(),
-            KotlinParser.parser_name(): KotlinParser(),
-            ObjCParser.parser_name(): ObjCParser(),
-            RubyParser.parser_name(): RubyParser(),
-            PythonParser.parser_name(): PythonParser(),
-            GoParser.parser_name(): GoParser()
-        }
-
-        self.config.supported_languages = [x.language_type() for x in self._parsers.values()]
+        # parsers are only imported and instantiated once an analysis finds a file of their language
+        self._parsers: Dict[str, AbstractParser] = ParserRegistry()
+
+        self.config.supported_languages = supported_languages()
         self.config.setup_commang_line_arguments()
         self.set_log_level(LogLevel.ERROR)
 
@@ -69,6 +48,9 @@ class Emerge:
     def load_config(self, path):
         self.config.load_config_from_yaml_file(path)
 
+    def load_config_from_dict(self, config: Dict):
+        self.config.load_config_from_dict(config)
+
     def print_config(self):
         self.config.print_config_as_yaml()
         self.config.print_config_dict()
@@ -105,11 +87,35 @@ class Emerge:
     def set_log_level(self, level: LogLevel):
         Logger.set_log_level(level)
 
-    def start_analyzing(self):
+    def start_analyzing(self) -> List[Analysis]:
         """Starts with the first analysis on an Analyzer instance.
+
+        Returns:
+            List[Analysis]: All performed analyses.
         """
         analyzer = Analyzer(self.config, self._parsers)
-        analyzer.start_analyzing()
+        return analyzer.start_analyzing()
+
+    def analyze(self, config: Dict, inventories: Optional[Dict[str, RepositoryInventory]] = None) -> List[Analysis]:
+        """Runs all analyses of an in-memory configuration and returns them, without the need for a yaml config file.
+        The analyses contain their statistics, metric results and graph representations, exports are only done if configured.
+
+        Args:
+            config (Dict): A configuration with the same structure as a yaml config.
+            inventories (Optional[Dict[str, RepositoryInventory]]): Existing inventories by source directory, reused instead of walking it again.
+
+        Returns:
+            List[Analysis]: All performed analyses.
+        """
+        self.load_config_from_dict(config)
+        if not self.config.valid:
+            raise ValueError(f'invalid configuration: {config}')
+
+        for analysis in self.config.analyses:
+            if inventories and analysis.source_directory in inventories:
+                analysis.inventory = inventories[analysis.source_directory]
+
+        return self.start_analyzing()
 
     @staticmethod
     def get_version() -> str:
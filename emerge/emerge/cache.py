@@ -0,0 +1,313 @@
+"""
+Contains a size-bounded on-disk cache and a parse cache that stores file results across analyses.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Any, Dict, List, Optional, Tuple, Iterable
+from pathlib import Path
+
+import os
+import time
+import pickle
+import hashlib
+import sqlite3
+import logging
+import coloredlogs
+
+from emerge.results import FileResult
+from emerge.abstractresult import AbstractFileResult
+from emerge.stats import Statistics
+from emerge.log import Logger
+from emerge.files import LanguageExtension
+
+LOGGER = Logger(logging.getLogger('analysis'))
+coloredlogs.install(level='E', logger=LOGGER.logger(), fmt=Logger.log_format)
+
+# bump this whenever the layout of cached entries or the parsing behaviour changes in an incompatible way
+PARSE_CACHE_FORMAT_VERSION = '3'
+
+PARSE_CACHE_FILE_NAME = 'parse-cache.sqlite3'
+
+# per-file code metrics that only depend on the content of a file and can be restored from the parse cache
+CACHEABLE_FILE_METRICS = ['sloc-in-file', 'number-of-methods-in-file', 'ws-complexity-in-file']
+
+
+class DiskCache:
+    """A small key/value store backed by a SQLite database.
+    Once the stored values exceed the given maximum size, the least recently used entries are evicted.
+    """
+
+    def __init__(self, database_path: str, max_size: int):
+        self._database_path = database_path
+        self._max_size = max_size
+        self._accessed_keys: Dict[str, float] = {}
+        self._connection = sqlite3.connect(database_path, timeout=30)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS entries '
+            '(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)'
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access)')
+        self._connection.commit()
+
+    @property
+    def database_path(self) -> str:
+        return self._database_path
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._connection.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        # only remember the access here, the access times are written in a single batch on commit()
+        self._accessed_keys[key] = time.time()
+        return row[0]
+
+    def put(self, key: str, value: bytes) -> None:
+        self._connection.execute(
+            'INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)', (key, value, len(value), time.time())
+        )
+        self._accessed_keys.pop(key, None)
+
+    @property
+    def size(self) -> int:
+        return self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def evict(self) -> int:
+        """Deletes the least recently used entries until the cache fits into its maximum size again.
+
+        Returns:
+            int: The number of evicted entries.
+        """
+        exceeding_size = self.size - self._max_size
+        if exceeding_size <= 0:
+            return 0
+
+        evicted_keys: List[Tuple[str]] = []
+        for key, size in self._connection.execute('SELECT key, size FROM entries ORDER BY last_access ASC'):
+            if exceeding_size <= 0:
+                break
+            evicted_keys.append((key,))
+            exceeding_size -= size
+
+        self._connection.executemany('DELETE FROM entries WHERE key = ?', evicted_keys)
+        return len(evicted_keys)
+
+    def commit(self) -> int:
+        """Writes pending access times, evicts entries if the cache got too large and commits all changes.
+
+        Returns:
+            int: The number of evicted entries.
+        """
+        self._connection.executemany(
+            'UPDATE entries SET last_access = ? WHERE key = ?', [(accessed, key) for key, accessed in self._accessed_keys.items()]
+        )
+        self._accessed_keys.clear()
+        evicted_entries = self.evict()
+        self._connection.commit()
+        return evicted_entries
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class ParseCache:
+    """Stores the outcome of parsing a file (scanned tokens, import dependencies, module name) and its per-file code metrics,
+    so that unchanged files do not have to be parsed again in a later analysis.
+
+    An entry is keyed by the parser name, the emerge/cache version, the relative file path, the hash of the file content and a fingerprint
+    of all analysis settings that influence parsing. Some parsers resolve import dependencies by checking for other files, so an entry
+    also stores the fingerprint of the scanned files its dependencies were resolved against. If the scanned files changed since,
+    the entry is still restored, but its dependencies are resolved again by the parser.
+    """
+
+    def __init__(self, analysis, cache_directory: str, max_size_in_megabytes: int):
+        os.makedirs(cache_directory, exist_ok=True)
+        self._disk_cache = DiskCache(os.path.join(cache_directory, PARSE_CACHE_FILE_NAME), max_size_in_megabytes * 1024 * 1024)
+        self._statistics: Statistics = analysis.statistics
+        self._configuration_fingerprint = self.create_configuration_fingerprint(analysis)
+        self._scanned_files_fingerprint = self.create_scanned_files_fingerprint(analysis)
+        self._pending_keys: Dict[str, str] = {}
+        self._resolved_import_keys: Dict[str, str] = {}
+        self._result_keys: Dict[str, str] = {}
+
+    @classmethod
+    def from_analysis(cls, analysis) -> Optional['ParseCache']:
+        """Returns a parse cache for the given analysis, or None if the analysis has no parse cache configured.
+        """
+        if not analysis.parse_cache_directory:
+            return None
+        try:
+            return cls(analysis, analysis.parse_cache_directory, analysis.parse_cache_max_size)
+        except (OSError, sqlite3.Error) as ex:
+            LOGGER.warning(f'could not open parse cache in {analysis.parse_cache_directory}, continuing without: {ex}')
+            return None
+
+    @staticmethod
+    def create_configuration_fingerprint(analysis) -> str:
+        """Creates a fingerprint of all analysis settings that can change the outcome of parsing a file.
+        Only the name of the source directory is considered, since file results are relative to its parent.
+        Python imports are classified as global by the installed modules,
+        so a python analysis also considers the interpreter and its site-packages.
+        """
+        from emerge.languages.pymodules import site_packages_fingerprint  # pylint: disable=import-outside-toplevel
+
+        fingerprint = hashlib.sha256()
+        configuration = [
+            PARSE_CACHE_FORMAT_VERSION,
+            analysis.emerge_version,
+            Path(analysis.source_directory).name,
+            sorted(analysis.only_permit_languages),
+            sorted(analysis.ignore_dependencies_containing),
+            sorted(x.pattern for x in analysis.ignore_dependencies_matching),
+            sorted(analysis.import_aliases.items()),
+            sorted(analysis.override_resolve_dependencies),
+            sorted(analysis.override_do_not_resolve_dependencies),
+            site_packages_fingerprint() if LanguageExtension.PYTHON.value in analysis.only_permit_file_extensions else None
+        ]
+        fingerprint.update(repr(configuration).encode('utf-8'))
+        return fingerprint.hexdigest()
+
+    @staticmethod
+    def create_scanned_files_fingerprint(analysis) -> str:
+        """Creates a fingerprint of the set of scanned files, that import dependencies may be resolved against.
+        """
+        fingerprint = hashlib.sha256()
+        for scanned_file_name in sorted(analysis.absolute_scanned_file_names):
+            fingerprint.update(scanned_file_name.encode('utf-8', 'surrogatepass'))
+            fingerprint.update(b'\0')
+        return fingerprint.hexdigest()
+
+    def create_key(self, parser_name: str, full_file_path: str, file_content: str) -> str:
+        content_hash = hashlib.sha256(file_content.encode('utf-8', 'surrogatepass')).hexdigest()
+        key = '\0'.join([parser_name, self._configuration_fingerprint, full_file_path, content_hash])
+        return hashlib.sha256(key.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def load_file_results(self, analysis, scan_jobs: List[Tuple[str, str, str, str]],
+                          parsers: Dict[str, Any]) -> Dict[int, AbstractFileResult]:
+        """Tries to restore file results for the given scan jobs from the cache.
+        Import dependencies that were resolved against another set of scanned files are resolved again by their parser.
+
+        Args:
+            analysis (Analysis): The analysis the restored file results should belong to.
+            scan_jobs (List[Tuple[str, str, str, str]]): Scan jobs given by
+                (parser name, file name, full file path, path of the file on disk).
+            parsers (Dict[str, AbstractParser]): The parsers of the scan jobs by their name.
+
+        Returns:
+            Dict[int, AbstractFileResult]: Restored file results by the index of their scan job.
+        """
+        cached_file_results: Dict[int, AbstractFileResult] = {}
+
+        for index, (parser_name, _, full_file_path, file_path) in enumerate(scan_jobs):
+            key = self.create_key(parser_name, full_file_path, analysis.read_file_content(file_path))
+
+            file_result = None
+            payload: Dict[str, Any] = {}
+            value = self._disk_cache.get(key)
+            if value is not None:
+                try:
+                    payload = pickle.loads(value)
+                    file_result = self._restore_file_result(analysis, payload)
+                except Exception as ex:  # pylint: disable=broad-except
+                    LOGGER.warning(f'ignoring unreadable parse cache entry for {full_file_path}: {ex}')
+
+            parser = parsers[parser_name]
+            if file_result is not None and parser.resolves_imports_against_files and \
+                    payload['scanned_files_fingerprint'] != self._scanned_files_fingerprint:
+                parser.add_imports_to_restored_file_result(analysis, file_result)
+                self._statistics.increment(Statistics.Key.PARSE_CACHE_RESOLVED_IMPORTS)
+                self._resolved_import_keys[file_result.unique_name] = key
+
+            if file_result is None:
+                self._statistics.increment(Statistics.Key.PARSE_CACHE_MISSES)
+                self._pending_keys[full_file_path] = key
+            else:
+                self._statistics.increment(Statistics.Key.PARSE_CACHE_HITS)
+                self._result_keys[file_result.unique_name] = key
+                cached_file_results[index] = file_result
+
+        return cached_file_results
+
+    def store_file_results(self, file_results: Iterable[AbstractFileResult]) -> None:
+        """Stores all given file results that were missing in the cache and the import dependencies that were resolved again.
+        This has to be called before any post-processing across results changes their dependencies.
+        """
+        for file_result in file_results:
+            key = self._resolved_import_keys.pop(file_result.unique_name, None)
+            if key is not None:
+                value = self._disk_cache.get(key)
+                if value is not None:
+                    payload = pickle.loads(value)
+                    payload['scanned_import_dependencies'] = list(file_result.scanned_import_dependencies)
+                    payload['scanned_files_fingerprint'] = self._scanned_files_fingerprint
+                    self._disk_cache.put(key, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+                continue
+
+            key = self._pending_keys.pop(file_result.absolute_name, None)
+            if key is None:
+                continue
+
+            payload = {
+                'scanned_file_name': file_result.scanned_file_name,
+                'relative_file_path_to_analysis': file_result.relative_file_path_to_analysis,
+                'absolute_name': file_result.absolute_name,
+                'display_name': file_result.display_name,
+                'module_name': file_result.module_name,
+                'scanned_by': file_result.scanned_by,
+                'scanned_language': file_result.scanned_language,
+                'scanned_tokens': list(file_result.scanned_tokens),
+                'preprocessed_source': file_result.preprocessed_source,
+                'scanned_import_dependencies': list(file_result.scanned_import_dependencies),
+                'scanned_files_fingerprint': self._scanned_files_fingerprint,
+                'metrics': {}
+            }
+            self._disk_cache.put(key, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+            self._result_keys[file_result.unique_name] = key
+
+    def store_file_metrics(self, file_results: Iterable[AbstractFileResult]) -> None:
+        """Adds the cacheable per-file code metrics of the given file results to their cache entries.
+        """
+        for file_result in file_results:
+            key = self._result_keys.get(file_result.unique_name)
+            if key is None:
+                continue
+
+            metrics = {k: v for k, v in file_result.metrics.items() if k in CACHEABLE_FILE_METRICS}
+            if not metrics or metrics == {k: v for k, v in file_result.cached_metrics.items() if k in metrics}:
+                continue
+
+            value = self._disk_cache.get(key)
+            if value is None:
+                continue
+            payload = pickle.loads(value)
+            payload['metrics'].update(metrics)
+            self._disk_cache.put(key, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def close(self) -> None:
+        """Commits all pending changes, evicts least recently used entries if necessary and closes the cache.
+        """
+        evicted_entries = self._disk_cache.commit()
+        self._statistics.update(key=Statistics.Key.PARSE_CACHE_EVICTIONS,
+                                value=self._statistics.data.get(Statistics.Key.PARSE_CACHE_EVICTIONS.name.lower(), 0) + evicted_entries)
+        self._disk_cache.close()
+
+    @staticmethod
+    def _restore_file_result(analysis, payload: Dict[str, Any]) -> FileResult:
+        file_result = FileResult.create_file_result(
+            analysis=analysis,
+            scanned_file_name=payload['scanned_file_name'],
+            relative_file_path_to_analysis=payload['relative_file_path_to_analysis'],
+            absolute_name=payload['absolute_name'],
+            display_name=payload['display_name'],
+            module_name=payload['module_name'],
+            scanned_by=payload['scanned_by'],
+            scanned_language=payload['scanned_language'],
+            scanned_tokens=payload['scanned_tokens'],
+            source=None,  # read again on demand, see FileResult.source
+            preprocessed_source=payload['preprocessed_source']
+        )
+        file_result.scanned_import_dependencies = payload['scanned_import_dependencies']
+        file_result.cached_metrics = payload['metrics']
+        return file_result
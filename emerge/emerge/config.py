@@ -18,13 +18,7 @@ import yaml
 
 import coloredlogs
 
-from emerge.metrics.numberofmethods.numberofmethods import NumberOfMethodsMetric
-from emerge.metrics.sloc.sloc import SourceLinesOfCodeMetric
-from emerge.metrics.faninout.faninout import FanInOutMetric
-from emerge.metrics.modularity.modularity import LouvainModularityMetric
-from emerge.metrics.tfidf.tfidf import TFIDFMetric
-from emerge.metrics.git.git import GitMetrics
-from emerge.metrics.whitespace.whitespace import WhitespaceMetric
+from emerge.registry import MetricType, metric_class
 
 from emerge.graph import GraphType
 from emerge.log import Logger
@@ -62,6 +56,14 @@ class ConfigValProject(EnumKeyValid, Enum):
     ERROR = auto()
 
 
+@unique
+class ConfigValLouvainBackend(EnumKeyValid, Enum):
+    """Config value checks of the community detection backend of the louvain modularity metric."""
+    LOUVAIN = auto()
+    LEIDEN = auto()
+    LABEL_PROPAGATION = auto()
+
+
 @unique
 class ConfigKeyAnalysis(EnumKeyValid, Enum):
     """Config key checks of the analysis level."""
@@ -70,6 +72,15 @@ class ConfigKeyAnalysis(EnumKeyValid, Enum):
     GIT_DIRECTORY = auto()
     GIT_COMMIT_LIMIT = auto()
     GIT_EXCLUDE_MERGE_COMMITS = auto()
+    GIT_MAX_FILES_PER_COMMIT = auto()
+    GIT_EXPORT_COMMIT_LINKS = auto()
+    PARSE_WORKERS = auto()
+    LOUVAIN_SEED = auto()
+    LOUVAIN_WORKERS = auto()
+    LOUVAIN_BACKEND = auto()
+    PARSE_CACHE_DIRECTORY = auto()
+    PARSE_CACHE_MAX_SIZE = auto()
+    FILE_CONTENT_CACHE_MAX_SIZE = auto()
     ONLY_PERMIT_LANGUAGES = auto()
     ONLY_PERMIT_FILE_EXTENSIONS = auto()
     ONLY_PERMIT_FILES_MATCHING_ABSOLUTE_PATH = auto()
@@ -248,6 +259,13 @@ class Configuration:
         if self.valid:
             self._update_attributes_from_yaml_config()
 
+    def load_config_from_dict(self, config: Dict) -> None:
+        """Loads a configuration from an in-memory dictionary with the same structure as a yaml config."""
+        self._yaml_loader.load_config_from_dict(config)
+        self._validate_config()
+        if self.valid:
+            self._update_attributes_from_yaml_config()
+
     def _invalid_yaml_config(self, yaml_config) -> None:
         error_string = f'invalid yaml config: {yaml_config}'
         self.valid = False
@@ -427,7 +445,45 @@ class Configuration:
             # include/exclude merge commits
             if ConfigKeyAnalysis.GIT_EXCLUDE_MERGE_COMMITS.name.lower() in analysis_dict:
                 analysis.git_exclude_merge_commits = analysis_dict[ConfigKeyAnalysis.GIT_EXCLUDE_MERGE_COMMITS.name.lower()]
-            
+
+            # skip commits that change too many files (e.g. vendor updates or formatting sweeps)
+            if ConfigKeyAnalysis.GIT_MAX_FILES_PER_COMMIT.name.lower() in analysis_dict:
+                analysis.git_max_files_per_commit = analysis_dict[ConfigKeyAnalysis.GIT_MAX_FILES_PER_COMMIT.name.lower()]
+
+            # export the links of every commit, so that the change coupling of the web app follows its date range
+            if ConfigKeyAnalysis.GIT_EXPORT_COMMIT_LINKS.name.lower() in analysis_dict:
+                analysis.git_export_commit_links = analysis_dict[ConfigKeyAnalysis.GIT_EXPORT_COMMIT_LINKS.name.lower()]
+
+            # number of worker processes used to create file results
+            if ConfigKeyAnalysis.PARSE_WORKERS.name.lower() in analysis_dict:
+                analysis.parse_workers = analysis_dict[ConfigKeyAnalysis.PARSE_WORKERS.name.lower()]
+
+            # reproducible louvain optimization runs and their number of worker processes
+            if ConfigKeyAnalysis.LOUVAIN_SEED.name.lower() in analysis_dict:
+                analysis.louvain_seed = analysis_dict[ConfigKeyAnalysis.LOUVAIN_SEED.name.lower()]
+
+            if ConfigKeyAnalysis.LOUVAIN_WORKERS.name.lower() in analysis_dict:
+                analysis.louvain_workers = analysis_dict[ConfigKeyAnalysis.LOUVAIN_WORKERS.name.lower()]
+
+            # community detection backend of the louvain modularity metric, e.g. a faster one for huge graphs
+            if ConfigKeyAnalysis.LOUVAIN_BACKEND.name.lower() in analysis_dict:
+                louvain_backend = str(analysis_dict[ConfigKeyAnalysis.LOUVAIN_BACKEND.name.lower()])
+                if not ConfigValLouvainBackend.valid(louvain_backend):
+                    raise Exception(f'❗️{ConfigKeyAnalysis.LOUVAIN_BACKEND.name.lower()} must be one of: '
+                                    f'{", ".join(x.name.lower() for x in ConfigValLouvainBackend)}.')
+                analysis.louvain_backend = louvain_backend.lower()
+
+            # on-disk cache for parsed file results
+            if ConfigKeyAnalysis.PARSE_CACHE_DIRECTORY.name.lower() in analysis_dict:
+                analysis.parse_cache_directory = analysis_dict[ConfigKeyAnalysis.PARSE_CACHE_DIRECTORY.name.lower()]
+
+            if ConfigKeyAnalysis.PARSE_CACHE_MAX_SIZE.name.lower() in analysis_dict:
+                analysis.parse_cache_max_size = analysis_dict[ConfigKeyAnalysis.PARSE_CACHE_MAX_SIZE.name.lower()]
+
+            # in-memory cache for file contents
+            if ConfigKeyAnalysis.FILE_CONTENT_CACHE_MAX_SIZE.name.lower() in analysis_dict:
+                analysis.file_content_cache_max_size = analysis_dict[ConfigKeyAnalysis.FILE_CONTENT_CACHE_MAX_SIZE.name.lower()]
+
             # check export config
             if ConfigKeyAnalysis.EXPORT.name.lower() in analysis_dict:
                 for export_config in analysis_dict[ConfigKeyAnalysis.EXPORT.name.lower()]:
@@ -564,7 +620,7 @@ class Configuration:
 
                     # number of methods
                     if configured_metric == ConfigKeyFileScan.NUMBER_OF_METHODS.name.lower():
-                        number_of_methods_metric = NumberOfMethodsMetric(analysis)
+                        number_of_methods_metric = metric_class(MetricType.NUMBER_OF_METHODS)(analysis)
                         LOGGER.debug(f'adding {number_of_methods_metric.pretty_metric_name}...')
                         analysis.metrics_for_file_results.update({
                             number_of_methods_metric.metric_name: number_of_methods_metric
@@ -572,7 +628,7 @@ class Configuration:
 
                     # source lines of code
                     if configured_metric == ConfigKeyFileScan.SOURCE_LINES_OF_CODE.name.lower():
-                        source_lines_of_code_metric = SourceLinesOfCodeMetric(analysis)
+                        source_lines_of_code_metric = metric_class(MetricType.SOURCE_LINES_OF_CODE)(analysis)
                         LOGGER.debug(f'adding {source_lines_of_code_metric.pretty_metric_name}...')
                         analysis.metrics_for_file_results.update({
                             source_lines_of_code_metric.metric_name: source_lines_of_code_metric
@@ -580,34 +636,34 @@ class Configuration:
 
                     # fan-in, fan-out
                     if ConfigKeyFileScan.FAN_IN_OUT.name.lower() in configured_metric:
-                        LOGGER.debug(f'adding {FanInOutMetric.pretty_metric_name}...')
                         graph_representations = analysis.existing_graph_representations
-                        fan_in_out_metric = FanInOutMetric(analysis, graph_representations)
+                        fan_in_out_metric = metric_class(MetricType.FAN_IN_OUT)(analysis, graph_representations)
+                        LOGGER.debug(f'adding {fan_in_out_metric.pretty_metric_name}...')
                         analysis.metrics_for_file_results.update({
                             fan_in_out_metric.metric_name: fan_in_out_metric
                         })
 
                     # louvain-modularity
                     if ConfigKeyFileScan.LOUVAIN_MODULARITY.name.lower() in configured_metric:
-                        LOGGER.debug(f'adding {LouvainModularityMetric.pretty_metric_name}...')
                         graph_representations = analysis.existing_graph_representations
-                        louvain_modularity_metric = LouvainModularityMetric(analysis, graph_representations)
+                        louvain_modularity_metric = metric_class(MetricType.LOUVAIN_MODULARITY)(analysis, graph_representations)
+                        LOGGER.debug(f'adding {louvain_modularity_metric.pretty_metric_name}...')
                         analysis.metrics_for_file_results.update({
                             louvain_modularity_metric.metric_name: louvain_modularity_metric
                         })
 
                     # tfidf
                     if ConfigKeyFileScan.TFIDF.name.lower() in configured_metric:
-                        LOGGER.debug(f'adding {TFIDFMetric.pretty_metric_name}...')
                         graph_representations = analysis.existing_graph_representations
-                        tfidf_metric = TFIDFMetric(analysis)
+                        tfidf_metric = metric_class(MetricType.TFIDF)(analysis)
+                        LOGGER.debug(f'adding {tfidf_metric.pretty_metric_name}...')
                         analysis.metrics_for_file_results.update({
                             tfidf_metric.metric_name: tfidf_metric
                         })
 
                     # whitespace complexity
                     if ConfigKeyFileScan.WS_COMPLEXITY.name.lower() in configured_metric:
-                        whitespace_metric = WhitespaceMetric(analysis)
+                        whitespace_metric = metric_class(MetricType.WS_COMPLEXITY)(analysis)
                         LOGGER.debug(f'adding {whitespace_metric.pretty_metric_name}...')
                         analysis.metrics_for_file_results.update({
                             whitespace_metric.metric_name: whitespace_metric
@@ -615,7 +671,7 @@ class Configuration:
 
                     # git metrics
                     if ConfigKeyFileScan.GIT.name.lower() in configured_metric:
-                        git_metrics = GitMetrics(analysis)
+                        git_metrics = metric_class(MetricType.GIT)(analysis)
                         LOGGER.debug(f'adding {git_metrics.pretty_metric_name}...')
                         analysis.metrics_for_file_results.update({
                             git_metrics.metric_name: git_metrics
@@ -638,8 +694,8 @@ class Configuration:
 
                     # number of methods
                     if configured_metric == ConfigKeyEntityScan.NUMBER_OF_METHODS.name.lower():
-                        LOGGER.debug(f'adding {NumberOfMethodsMetric.pretty_metric_name}...')
-                        number_of_methods_metric = NumberOfMethodsMetric(analysis)
+                        number_of_methods_metric = metric_class(MetricType.NUMBER_OF_METHODS)(analysis)
+                        LOGGER.debug(f'adding {number_of_methods_metric.pretty_metric_name}...')
 
                         analysis.metrics_for_entity_results.update({
                             number_of_methods_metric.metric_name: number_of_methods_metric
@@ -647,17 +703,17 @@ class Configuration:
 
                     # source lines of code
                     if configured_metric == ConfigKeyEntityScan.SOURCE_LINES_OF_CODE.name.lower():
-                        LOGGER.debug(f'adding {SourceLinesOfCodeMetric.pretty_metric_name}...')
-                        source_lines_of_code_metric = SourceLinesOfCodeMetric(analysis)
+                        source_lines_of_code_metric = metric_class(MetricType.SOURCE_LINES_OF_CODE)(analysis)
+                        LOGGER.debug(f'adding {source_lines_of_code_metric.pretty_metric_name}...')
                         analysis.metrics_for_entity_results.update({
                             source_lines_of_code_metric.metric_name: source_lines_of_code_metric
                         })
 
                     # fan-in, fan-out
                     if ConfigKeyEntityScan.FAN_IN_OUT.name.lower() in configured_metric:
-                        LOGGER.debug(f'adding {FanInOutMetric.pretty_metric_name}...')
                         graph_representations = analysis.existing_graph_representations
-                        fan_in_out_metric = FanInOutMetric(analysis, graph_representations)
+                        fan_in_out_metric = metric_class(MetricType.FAN_IN_OUT)(analysis, graph_representations)
+                        LOGGER.debug(f'adding {fan_in_out_metric.pretty_metric_name}...')
 
                         analysis.metrics_for_entity_results.update({
                             fan_in_out_metric.metric_name: fan_in_out_metric
@@ -665,9 +721,9 @@ class Configuration:
 
                     # louvain-modularity
                     if ConfigKeyEntityScan.LOUVAIN_MODULARITY.name.lower() in configured_metric:
-                        LOGGER.debug(f'adding {LouvainModularityMetric.pretty_metric_name}...')
                         graph_representations = analysis.existing_graph_representations
-                        louvain_modularity_metric = LouvainModularityMetric(analysis, graph_representations)
+                        louvain_modularity_metric = metric_class(MetricType.LOUVAIN_MODULARITY)(analysis, graph_representations)
+                        LOGGER.debug(f'adding {louvain_modularity_metric.pretty_metric_name}...')
 
                         analysis.metrics_for_entity_results.update({
                             louvain_modularity_metric.metric_name: louvain_modularity_metric
@@ -675,9 +731,9 @@ class Configuration:
 
                      # tfidf
                     if ConfigKeyEntityScan.TFIDF.name.lower() in configured_metric:
-                        LOGGER.debug(f'adding {TFIDFMetric.pretty_metric_name}...')
                         graph_representations = analysis.existing_graph_representations
-                        tfidf_metric = TFIDFMetric(analysis)
+                        tfidf_metric = metric_class(MetricType.TFIDF)(analysis)
+                        LOGGER.debug(f'adding {tfidf_metric.pretty_metric_name}...')
                         analysis.metrics_for_entity_results.update({
                             tfidf_metric.metric_name: tfidf_metric
                         })
@@ -712,6 +768,11 @@ class YamlLoader:
         self._load_config_file_content(yaml_file_name)
         self._load_yaml_from_config_file_content()
 
+    def load_config_from_dict(self, config: Dict) -> None:
+        LOGGER.debug('trying to load config from dict...')
+        self._config_file_content = ""
+        self._yaml = config
+
     def load_schema_from_yaml_file(self, yaml_file_name: str) -> None:
         LOGGER.debug('trying to load yaml schema...')
         self._load_config_file_content(yaml_file_name)
@@ -0,0 +1,87 @@
+"""
+Contains a bounded cache for file contents, so that files are read on demand and not kept in memory for the whole analysis.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import os
+
+# every file is decoded with a single byte encoding, so that any file can be read and its content length equals its size in bytes
+FILE_CONTENT_ENCODING = 'ISO-8859-1'
+
+
+def read_file_content(path: str) -> str:
+    """Reads the whole content of a source file.
+    """
+    with open(path, encoding=FILE_CONTENT_ENCODING) as file:
+        return file.read()
+
+
+class FileContentCache:
+    """Least recently used cache of file contents, bounded by the total size of the cached files.
+    Entries are keyed by path and validated by file size and modification time, so a changed file is read again.
+    Files that are larger than the whole cache are read, but never cached.
+    """
+
+    def __init__(self, max_size_in_bytes: int):
+        self.max_size_in_bytes: int = max_size_in_bytes
+        self.reads: int = 0
+        self._entries: OrderedDict[str, Tuple[int, float, str]] = OrderedDict()
+        self._size: int = 0
+
+    def read(self, path: str, size: Optional[int] = None, mtime: Optional[float] = None) -> str:
+        """Returns the content of the given file, from the cache if the file did not change since it was cached.
+
+        Args:
+            path (str): Path of the file.
+            size (Optional[int]): Known size of the file, if not given the file is stat'ed.
+            mtime (Optional[float]): Known modification time of the file, if not given the file is stat'ed.
+
+        Returns:
+            str: The file content.
+        """
+        if size is None or mtime is None:
+            stat_result = os.stat(path)
+            size, mtime = stat_result.st_size, stat_result.st_mtime
+
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == size and entry[1] == mtime:
+            self._entries.move_to_end(path)
+            return entry[2]
+
+        content = read_file_content(path)
+        self.reads += 1
+        self.release(path)
+
+        if len(content) <= self.max_size_in_bytes:
+            self._entries[path] = (size, mtime, content)
+            self._size += len(content)
+            while self._size > self.max_size_in_bytes:
+                _, (_, _, evicted_content) = self._entries.popitem(last=False)
+                self._size -= len(evicted_content)
+
+        return content
+
+    def release(self, path: str) -> None:
+        """Removes the content of the given file from the cache.
+        """
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._size -= len(entry[2])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        """Total number of cached characters (equal to bytes, see FILE_CONTENT_ENCODING).
+        """
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -5,8 +5,9 @@ Contains shared/common methods and functions.
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import List
+from typing import List, Optional
 from string import Template
+import os
 
 
 class DeltaTemplate(Template):
@@ -58,3 +59,22 @@ def format_timedelta(timedelta, fmt):
     delta_format["s"] = '{:.0f}'.format(milliseconds)
     template = DeltaTemplate(fmt)
     return template.substitute(**delta_format)
+
+
+def resolve_worker_count(configured_workers: Optional[int], environment_variable: str) -> int:
+    """Returns the number of worker processes to use, either from a configured value or from the given environment variable.
+    A value of 0 means 'use all available cpus', no configured value at all falls back to a single (in-process) worker.
+    """
+    workers = configured_workers
+    if workers is None:
+        environment_value = os.environ.get(environment_variable, '').strip()
+        if not environment_value:
+            return 1
+        try:
+            workers = int(environment_value)
+        except ValueError:
+            return 1
+
+    if workers == 0:
+        return os.cpu_count() or 1
+    return max(1, workers)
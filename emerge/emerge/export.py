@@ -200,49 +200,61 @@ class JSONExporter:
 
         if bool(statistics) or bool(overall_metric_results):
             with open(export_dir + '/' + 'emerge-' + 'statistics-and-metrics' + '.json', 'w', encoding="utf-8") as file:
-                json_output: Dict[str, Any] = {}
-                json_statistics = {}
-                json_metrics = {}
-                json_local_metrics = {}
+                json_output = JSONExporter.statistics_and_metrics_as_dict(statistics, overall_metric_results, local_metric_results, analysis_name)
+                json.dump(json_output, file)
 
-                if bool(statistics):
-                    for name, value in statistics.items():
-                        json_statistics[name] = value
+    @staticmethod
+    def statistics_and_metrics_as_dict(
+        statistics: Dict[str, Any],
+        overall_metric_results: Dict[str, Any],
+        local_metric_results: Dict[str, Dict[str, Any]],
+        analysis_name: str
+    ) -> Dict[str, Any]:
+        """Returns all collected statistics, overall metric results and local metric results in the same structure as the JSON export."""
 
-                if bool(overall_metric_results):
-                    for name, value in overall_metric_results.items():
+        json_output: Dict[str, Any] = {}
+        json_statistics = {}
+        json_metrics = {}
+        json_local_metrics = {}
 
-                        if 'commit-metrics' in name or 'git-metrics' in name:
-                            continue
+        if bool(statistics):
+            for name, value in statistics.items():
+                json_statistics[name] = value
 
-                        if isinstance(value, dict):
-                            values_as_string = ', '.join(str(x) for x in value.values())
-                            json_metrics[name] = values_as_string
-                        elif isinstance(value, str):
-                            json_metrics[name] = value
-                        else:
-                            json_metrics[name] = round(value, 2)
+        if bool(overall_metric_results):
+            for name, value in overall_metric_results.items():
 
-                if bool(local_metric_results):
-                    for result_name, metric_dict in local_metric_results.items():
-                        all_metrics_for_result = {}
-                        for metric_name, metric_value in metric_dict.items():
-                            all_metrics_for_result[metric_name] = metric_value
+                if 'commit-metrics' in name or 'git-metrics' in name:
+                    continue
+
+                if isinstance(value, dict):
+                    values_as_string = ', '.join(str(x) for x in value.values())
+                    json_metrics[name] = values_as_string
+                elif isinstance(value, str):
+                    json_metrics[name] = value
+                else:
+                    json_metrics[name] = round(value, 2)
 
-                        json_local_metrics[result_name] = all_metrics_for_result
+        if bool(local_metric_results):
+            for result_name, metric_dict in local_metric_results.items():
+                all_metrics_for_result = {}
+                for metric_name, metric_value in metric_dict.items():
+                    all_metrics_for_result[metric_name] = metric_value
 
-                json_output["analysis-name"] = analysis_name
+                json_local_metrics[result_name] = all_metrics_for_result
 
-                if bool(json_statistics):
-                    json_output["statistics"] = json_statistics
+        json_output["analysis-name"] = analysis_name
 
-                if bool(json_metrics):
-                    json_output["overall-metrics"] = json_metrics
+        if bool(json_statistics):
+            json_output["statistics"] = json_statistics
 
-                if bool(json_local_metrics):
-                    json_output["local-metrics"] = json_local_metrics
+        if bool(json_metrics):
+            json_output["overall-metrics"] = json_metrics
 
-                json.dump(json_output, file)
+        if bool(json_local_metrics):
+            json_output["local-metrics"] = json_local_metrics
+
+        return json_output
 
 
 class D3Exporter:
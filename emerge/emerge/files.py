@@ -14,19 +14,8 @@ import shutil
 import logging
 
 import coloredlogs
-from emerge.languages.goparser import GoParser
-
-from emerge.languages.javaparser import JavaParser
-from emerge.languages.swiftparser import SwiftParser
-from emerge.languages.cparser import CParser
-from emerge.languages.cppparser import CPPParser
-from emerge.languages.groovyparser import GroovyParser
-from emerge.languages.javascriptparser import JavaScriptParser
-from emerge.languages.typescriptparser import TypeScriptParser
-from emerge.languages.kotlinparser import KotlinParser
-from emerge.languages.objcparser import ObjCParser
-from emerge.languages.rubyparser import RubyParser
-from emerge.languages.pyparser import PythonParser
+
+from emerge.languages.abstractparser import Parser
 
 from emerge.log import Logger
 
@@ -87,37 +76,37 @@ class FileScanMapper:
             Optional[str]: Returns a parser name, if a matching of file extension/parser can be found, otherwise None.
         """
         if file_extension == LanguageExtension.JAVA.value:
-            return JavaParser.parser_name()
+            return Parser.JAVA_PARSER.name
         if file_extension == LanguageExtension.SWIFT.value:
-            return SwiftParser.parser_name()
+            return Parser.SWIFT_PARSER.name
         if file_extension == LanguageExtension.C.value:
-            return CParser.parser_name()
+            return Parser.C_PARSER.name
         if file_extension == LanguageExtension.CPP.value:
-            return CPPParser.parser_name()
+            return Parser.CPP_PARSER.name
         if file_extension == LanguageExtension.GROOVY.value:
-            return GroovyParser.parser_name()
+            return Parser.GROOVY_PARSER.name
         if file_extension == LanguageExtension.JAVASCRIPT.value or file_extension == LanguageExtension.JSX.value:
-            return JavaScriptParser.parser_name()
+            return Parser.JAVASCRIPT_PARSER.name
         if file_extension == LanguageExtension.TYPESCRIPT.value or file_extension == LanguageExtension.TSX.value:
-            return TypeScriptParser.parser_name()
+            return Parser.TYPESCRIPT_PARSER.name
         if file_extension == LanguageExtension.KOTLIN.value:
-            return KotlinParser.parser_name()
+            return Parser.KOTLIN_PARSER.name
         if file_extension == LanguageExtension.OBJC.value:
-            return ObjCParser.parser_name()
+            return Parser.OBJC_PARSER.name
         if file_extension == LanguageExtension.RUBY.value:
-            return RubyParser.parser_name()
+            return Parser.RUBY_PARSER.name
         if file_extension == LanguageExtension.PYTHON.value:
-            return PythonParser.parser_name()
+            return Parser.PYTHON_PARSER.name
         if file_extension == LanguageExtension.GO.value:
-            return GoParser.parser_name()
+            return Parser.GO_PARSER.name
         if file_extension == LanguageExtension.C_HEADER.value or LanguageExtension.CPP_HEADER.value:
             if only_permit_languages:
                 if 'objc' in only_permit_languages:
-                    return ObjCParser.parser_name()
+                    return Parser.OBJC_PARSER.name
                 if 'c' in only_permit_languages:
-                    return CParser.parser_name()
+                    return Parser.C_PARSER.name
                 if 'cpp' in only_permit_languages:
-                    return CPPParser.parser_name()
+                    return Parser.CPP_PARSER.name
 
         return None
 
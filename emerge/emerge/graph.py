@@ -15,6 +15,7 @@ import networkx as nx
 from networkx import DiGraph
 
 from emerge.log import Logger
+from emerge.content import read_file_content
 
 LOGGER = Logger(logging.getLogger('graph'))
 coloredlogs.install(level='E', logger=LOGGER.logger(), fmt=Logger.log_format)
@@ -47,6 +48,7 @@ class GraphRepresentation:
         self._digraph: DiGraph = DiGraph()
         self._graph_type: GraphType = graph_type
         self.filesystem_nodes: Dict[str, FileSystemNode] = {}
+        self.change_coupling_authors: Dict[str, Dict[str, int]] = {}
 
     @property
     def digraph(self) -> DiGraph:
@@ -104,6 +106,38 @@ class GraphRepresentation:
         LOGGER.debug('creating complete graph...')
         self._digraph = nx.compose(dependency_graph_repr.digraph, inheritance_graph_repr.digraph)
 
+    def add_commit_to_change_coupling_graph(self, churn_by_file: Dict[str, int], author: str) -> None:
+        """Adds the files changed together by a single commit to a change coupling graph, so that the graph aggregates the history commit by commit.
+        Every file node sums up its commits and churn and knows its number of authors and its main author (by churn),
+        every pair of files changed together is linked by one edge (from the smaller to the greater name), weighted by the number of their co-changes.
+
+        Args:
+            churn_by_file (Dict[str, int]): The churn of every changed file in the commit, by node name.
+            author (str): The author of the commit.
+        """
+        for node_name, churn in churn_by_file.items():
+            if node_name not in self._digraph:
+                self._digraph.add_node(node_name, display_name=node_name, commits=0, churn=0, authors=0, main_author='')
+
+            node = self._digraph.nodes[node_name]
+            node['commits'] += 1
+            node['churn'] += churn
+
+            if author:
+                churn_by_author = self.change_coupling_authors.setdefault(node_name, {})
+                churn_by_author[author] = churn_by_author.get(author, 0) + churn
+                node['authors'] = len(churn_by_author)
+                if not node['main_author'] or churn_by_author[author] > churn_by_author[node['main_author']]:
+                    node['main_author'] = author
+
+        node_names = sorted(churn_by_file)
+        for index, source in enumerate(node_names):
+            for target in node_names[index + 1:]:
+                if self._digraph.has_edge(source, target):
+                    self._digraph.edges[source, target]['weight'] += 1
+                else:
+                    self._digraph.add_edge(source, target, weight=1)
+
     def add_local_metric_results_to_graph_nodes(self, metric_results: Dict[str, Dict[str, Any]]) -> None:
         """Adds/maps local metric results to graph nodes.
         """
@@ -129,7 +163,7 @@ class GraphRepresentation:
                         if 'entity' not in name:  # do not include any entity metrics in the filesystem graph
                             graph.nodes[node]['metric_' + name] = value
 
-            if self.graph_type == GraphType.FILE_RESULT_DEPENDENCY_GRAPH:
+            if self.graph_type == GraphType.FILE_RESULT_DEPENDENCY_GRAPH or self.graph_type == GraphType.FILE_RESULT_CHANGE_COUPLING_GRAPH:
                 if node in metric_results.keys():
                     metric_dict = metric_results[node]
 
@@ -170,10 +204,28 @@ class FileSystemNode:
     """Small representation of a filesystem object, e.g. a directory or a file. This class is currently used to build the filesystem graph.
     """
 
-    def __init__(self, node_type: FileSystemNodeType, absolute_name: str, content: Optional[str] = None):
+    def __init__(self, node_type: FileSystemNodeType, absolute_name: str, content: Optional[str] = None,
+                 path: Optional[str] = None, size: int = 0, mtime: float = 0.0):
         self.type: FileSystemNodeType = node_type
         self.absolute_name: str = absolute_name
-        self.content: Optional[str] = content
+
+        # a file node only keeps where its content can be read from, the content itself is read on demand
+        self.path: Optional[str] = path
+        self.size: int = size
+        self.mtime: float = mtime
+        self._content: Optional[str] = content
+
+    @property
+    def content(self) -> Optional[str]:
+        if self._content is not None:
+            return self._content
+        if self.path is None:
+            return None
+        return read_file_content(self.path)
+
+    @content.setter
+    def content(self, value: Optional[str]):
+        self._content = value
 
     def __hash__(self):
         return hash(self.absolute_name)
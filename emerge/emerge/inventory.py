@@ -0,0 +1,152 @@
+"""
+Contains a repository inventory, that walks a source directory once and collects its directory structure and per-language file statistics.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import os
+
+# rough average of bytes per source line, used to estimate the SLOC of a language without reading any file
+ESTIMATED_BYTES_PER_SOURCE_LINE = 32
+
+# maps file extensions to language names (as in LanguageType), mirrors LanguageExtension/FileScanMapper without importing any parser
+DEFAULT_LANGUAGE_EXTENSIONS: Dict[str, str] = {
+    '.java': 'java',
+    '.swift': 'swift',
+    '.c': 'c',
+    '.h': 'c',
+    '.cpp': 'cpp',
+    '.hpp': 'cpp',
+    '.groovy': 'groovy',
+    '.js': 'javascript',
+    '.jsx': 'javascript',
+    '.ts': 'typescript',
+    '.tsx': 'typescript',
+    '.kt': 'kotlin',
+    '.m': 'objc',
+    '.rb': 'ruby',
+    '.py': 'py',
+    '.go': 'go',
+}
+
+
+class LanguageInventory:
+    """Number of files and bytes of a single language within a repository inventory.
+    """
+
+    def __init__(self, language: str):
+        self.language: str = language
+        self.files: int = 0
+        self.bytes: int = 0
+
+    @property
+    def estimated_sloc(self) -> int:
+        return self.bytes // ESTIMATED_BYTES_PER_SOURCE_LINE
+
+    def __repr__(self):
+        return f'{self.language}: {self.files} files, {self.bytes} bytes, ~{self.estimated_sloc} sloc'
+
+
+class RepositoryInventory:
+    """Walks a source directory once with os.scandir and keeps the result, so that the tree can be iterated again without touching the filesystem.
+    The walk yields the same directories/files in the same order as os.walk (top-down, not following symlinked directories).
+    """
+
+    def __init__(self, root_directory: str, ignore_directories_containing: Optional[Iterable[str]] = None,
+                 ignore_files_containing: Optional[Iterable[str]] = None, language_extensions: Optional[Dict[str, str]] = None):
+        self.root_directory: str = root_directory
+        self.ignore_directories_containing: List[str] = list(ignore_directories_containing or [])
+        self.ignore_files_containing: List[str] = list(ignore_files_containing or [])
+        self.language_extensions: Dict[str, str] = language_extensions if language_extensions is not None else DEFAULT_LANGUAGE_EXTENSIONS
+        self.languages: Dict[str, LanguageInventory] = {}
+        self._directories: List[Tuple[str, List[str], List[str]]] = []
+
+    @classmethod
+    def scan(cls, root_directory: str, ignore_directories_containing: Optional[Iterable[str]] = None,
+             ignore_files_containing: Optional[Iterable[str]] = None, language_extensions: Optional[Dict[str, str]] = None) -> 'RepositoryInventory':
+        """Creates an inventory of the given directory by walking it once.
+        """
+        inventory = cls(root_directory, ignore_directories_containing, ignore_files_containing, language_extensions)
+        inventory._scan()
+        return inventory
+
+    def _scan(self) -> None:
+        stack = [self.root_directory]
+
+        while stack:
+            directory = stack.pop()
+            dirs: List[str] = []
+            files: List[str] = []
+            walk_into: List[str] = []
+
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            is_directory = entry.is_dir()
+                        except OSError:
+                            is_directory = False
+
+                        if is_directory:
+                            if entry.name in self.ignore_directories_containing:
+                                continue
+                            dirs.append(entry.name)
+                            if not entry.is_symlink():
+                                walk_into.append(entry.path)
+                        else:
+                            if any(substring in entry.name for substring in self.ignore_files_containing):
+                                continue
+                            files.append(entry.name)
+                            self._add_to_languages(entry)
+            except OSError:
+                continue
+
+            self._directories.append((directory, dirs, files))
+
+            # push in reverse order, so subdirectories are visited in the same order as with os.walk
+            stack.extend(reversed(walk_into))
+
+    def _add_to_languages(self, entry: os.DirEntry) -> None:
+        language = self.language_extensions.get(os.path.splitext(entry.name)[1])
+        if language is None:
+            return
+
+        try:
+            size = entry.stat().st_size
+        except OSError:
+            size = 0
+
+        if language not in self.languages:
+            self.languages[language] = LanguageInventory(language)
+        self.languages[language].files += 1
+        self.languages[language].bytes += size
+
+    def walk(self) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Yields (root, dirs, files) for every directory in the inventory, like os.walk.
+        The yielded lists are copies and can be modified by the caller.
+        """
+        for directory, dirs, files in self._directories:
+            yield directory, list(dirs), list(files)
+
+    def matches(self, root_directory: str, ignore_directories_containing: Iterable[str], ignore_files_containing: Iterable[str]) -> bool:
+        """Checks if this inventory was created for the given directory and ignore settings, so it can be reused instead of walking again.
+        """
+        return self.root_directory == root_directory and \
+            set(self.ignore_directories_containing) == set(ignore_directories_containing) and \
+            set(self.ignore_files_containing) == set(ignore_files_containing)
+
+    @property
+    def number_of_files(self) -> int:
+        return sum(len(files) for _, _, files in self._directories)
+
+    def primary_language(self, languages: Optional[Iterable[str]] = None) -> Optional[str]:
+        """Returns the language with the most files, optionally only considering the given languages (ties are resolved by their order).
+        """
+        candidates = list(languages) if languages is not None else list(self.languages.keys())
+        candidates = [x for x in candidates if x in self.languages]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda x: self.languages[x].files)
@@ -5,7 +5,6 @@ Contains all abstract parsing classes and relevant enums.
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-import re
 import logging
 
 from abc import ABC, abstractmethod
@@ -16,6 +15,7 @@ import coloredlogs
 
 from emerge.abstractresult import AbstractResult, AbstractEntityResult
 from emerge.log import Logger
+from emerge.tokens import Tokenizer
 
 LOGGER = Logger(logging.getLogger('parser'))
 coloredlogs.install(level='E', logger=LOGGER.logger(), fmt=Logger.log_format)
@@ -89,6 +89,26 @@ class ParsingMixin(ABC):
     class Constants(Enum):
         MAX_DEBUG_TOKENS_READAHEAD = 10
 
+    # characters that are separated into their own tokens by preprocess_file_content_and_generate_token_list
+    DEFAULT_TOKEN_MAPPINGS: Dict[str, str] = {
+        ':': ' : ',
+        ';': ' ; ',
+        '{': ' { ',
+        '}': ' } ',
+        '(': ' ( ',
+        ')': ' ) ',
+        '[': ' [ ',
+        ']': ' ] ',
+        '?': ' ? ',
+        '!': ' ! ',
+        ',': ' , ',
+        '<': ' < ',
+        '>': ' > '
+    }
+
+    # tokenize with a single compiled expression instead of one str.replace pass per mapping, a parser can disable it if needed
+    single_pass_tokenizer: bool = True
+
     @staticmethod
     def resolve_relative_dependency_path(relative_analysis_dependency_path: str, result_absolute_dir_path: str, analysis_source_directory: str) -> str:
         """Creates the absolute path for a dependency and try to resolve it with pathlib."""
@@ -149,8 +169,14 @@ class ParsingMixin(ABC):
         read_before_and_ahead += following  # or += following[:5]
         return " ".join(read_before_and_ahead)
 
+    @staticmethod
+    def _as_token_list(list_of_words) -> List[str]:
+        # read ahead slices are taken at every token, which is much cheaper on a list (of shared, interned token strings) than on a TokenSequence
+        return list_of_words if isinstance(list_of_words, list) else list(list_of_words)
+
     @staticmethod
     def _gen_word_read_ahead(list_of_words) -> Generator:
+        list_of_words = ParsingMixin._as_token_list(list_of_words)
         following = None
         length = len(list_of_words)
         for index, obj in enumerate(list_of_words):
@@ -160,6 +186,7 @@ class ParsingMixin(ABC):
 
     @staticmethod
     def _gen_word_before_and_read_ahead(list_of_words) -> Generator:
+        list_of_words = ParsingMixin._as_token_list(list_of_words)
         previous = following = None
         length = len(list_of_words)
         for index, obj in enumerate(list_of_words):
@@ -229,30 +256,22 @@ class ParsingMixin(ABC):
 
     @classmethod
     def preprocess_file_content_and_generate_token_list(cls, file_content: str) -> List[str]:
-        return re.findall(r'\S+|\n', file_content.replace(':', ' : ')
-                                                 .replace(';', ' ; ')
-                                                 .replace('{', ' { ')
-                                                 .replace('}', ' } ')
-                                                 .replace('(', ' ( ')
-                                                 .replace(')', ' ) ')
-                                                 .replace('[', ' [ ')
-                                                 .replace(']', ' ] ')
-                                                 .replace('?', ' ? ')
-                                                 .replace('!', ' ! ')
-                                                 .replace(',', ' , ')
-                                                 .replace('<', ' < ')
-                                                 .replace('>', ' > ')
-                          )
+        return cls.preprocess_file_content_and_generate_token_list_by_mapping(file_content, cls.DEFAULT_TOKEN_MAPPINGS)
 
     @classmethod
     def preprocess_file_content_and_generate_token_list_by_mapping(cls, file_content: str, mapping_dict: Dict[str, str]) -> List[str]:
-        for origin, mapped in mapping_dict.items():
-            file_content = file_content.replace(origin, mapped)
-        return re.findall(r'\S+|\n', file_content)
+        tokenizer = Tokenizer.for_mapping(mapping_dict)
+        if cls.single_pass_tokenizer:
+            return tokenizer.tokenize(file_content)
+        return tokenizer.tokenize_by_replacements(file_content)
 
 
 class AbstractParser(ParsingMixin, ABC):
 
+    # set by parsers that resolve imports against other files (the scanned files or the filesystem) while generating a file result,
+    # their import dependencies are only restored from the parse cache for the same set of scanned files
+    resolves_imports_against_files: bool = False
+
     @property
     @abstractmethod
     def results(self) -> Dict[str, AbstractResult]:
@@ -288,3 +307,9 @@ class AbstractParser(ParsingMixin, ABC):
     @abstractmethod
     def create_unique_entity_name(self, entity: AbstractEntityResult) -> None:
         ...
+
+    def add_imports_to_restored_file_result(self, analysis, file_result: AbstractResult) -> None:
+        """Resolves the imports of a file result again, that was restored from the parse cache for another set of scanned files.
+        Has to be implemented by every parser that resolves imports against files.
+        """
+        raise NotImplementedError(f'currently not implemented in {self.parser_name()}')
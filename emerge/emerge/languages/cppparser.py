@@ -36,6 +36,8 @@ class CPPParsingKeyword(Enum):
 
 class CPPParser(AbstractParser, ParsingMixin):
 
+    resolves_imports_against_files = True
+
     def __init__(self):
         self._results: Dict[str, AbstractResult] = {}
         self._token_mappings: Dict[str, str] = {
@@ -100,6 +102,10 @@ class CPPParser(AbstractParser, ParsingMixin):
     def after_generated_file_results(self, analysis) -> None:
         pass
 
+    def add_imports_to_restored_file_result(self, analysis, file_result: AbstractFileResult) -> None:
+        file_result.scanned_import_dependencies = []
+        self._add_imports_to_result(file_result, analysis)
+
     def generate_entity_results_from_analysis(self, analysis):
         raise NotImplementedError(f'currently not implemented in {self.parser_name()}')
 
@@ -5,7 +5,7 @@ Contains the implementation of the Go language parser and a relevant keyword enu
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Pattern
 from enum import Enum, unique
 import logging
 import re
@@ -21,6 +21,7 @@ from emerge.results import FileResult
 from emerge.abstractresult import AbstractFileResult, AbstractEntityResult
 from emerge.log import Logger
 from emerge.stats import Statistics
+from emerge.pathindex import PathSuffixIndex
 
 LOGGER = Logger(logging.getLogger('parser'))
 coloredlogs.install(level='E', logger=LOGGER.logger(), fmt=Logger.log_format)
@@ -33,6 +34,44 @@ class GoParsingKeyword(Enum):
     STOP_BLOCK_COMMENT = "*/"
 
 
+class GoPackageIndex:
+    """Index of the scanned go files and packages of an analysis, built once before the imports of all file results are resolved.
+    Scanned files and package directories are found by path suffix lookups, the exported symbols (funcs/structs) of a file are only extracted once.
+    """
+
+    def __init__(self, analysis, results: Dict[str, AbstractFileResult], compiled_func_grammar: Pattern, compiled_struct_grammar: Pattern):
+        self._compiled_func_grammar = compiled_func_grammar
+        self._compiled_struct_grammar = compiled_struct_grammar
+        self._symbol_expressions: Dict[str, Optional[Pattern]] = {}
+
+        # scanned files without their '.go' extension, an import may refer to a single file
+        self.scanned_files = PathSuffixIndex(x.replace('.go', '') for x in analysis.absolute_scanned_file_names)
+
+        # every package directory of the filesystem graph, in the order of the graph
+        filesystem_graph = analysis.graph_representations[GraphType.FILESYSTEM_GRAPH.name.lower()]
+        self.directories = PathSuffixIndex(name for name, node in filesystem_graph.digraph.nodes.items() if node['directory'] is not False)
+        self.files_in_directories: Dict[str, List[str]] = analysis.scanned_files_nodes_in_directories
+
+        self.results_by_unique_name: Dict[str, AbstractFileResult] = {}
+        for _, result in results.items():
+            self.results_by_unique_name.setdefault(result.unique_name, result)
+
+    def results_in_directory(self, directory: str) -> List[AbstractFileResult]:
+        return [self.results_by_unique_name[x] for x in self.files_in_directories.get(directory, []) if x in self.results_by_unique_name]
+
+    def symbol_expression(self, result: AbstractFileResult) -> Optional[Pattern]:
+        """Returns an expression that matches any func or struct name of the given file result, or None if it has no such symbols.
+        """
+        if result.unique_name not in self._symbol_expressions:
+            preprocessed_golang_source = result.preprocessed_source
+            funcs = [x for x in self._compiled_func_grammar.findall(preprocessed_golang_source) if x]
+            structs = [x for x in self._compiled_struct_grammar.findall(preprocessed_golang_source) if x]
+            symbols = list(dict.fromkeys(structs + funcs))
+            self._symbol_expressions[result.unique_name] = re.compile('|'.join(map(re.escape, symbols))) if symbols else None
+
+        return self._symbol_expressions[result.unique_name]
+
+
 class GoParser(AbstractParser, ParsingMixin):
 
     def __init__(self):
@@ -113,9 +152,11 @@ class GoParser(AbstractParser, ParsingMixin):
         self._results[file_result.unique_name] = file_result
 
     def after_generated_file_results(self, analysis) -> None:
+        package_index = GoPackageIndex(analysis, self._results, self.compiled_func_grammar, self.compiled_struct_grammar)
+
         file_result: AbstractFileResult
         for _, file_result in self._results.items():
-            self._add_imports_to_result(file_result, analysis)
+            self._add_imports_to_result(file_result, analysis, package_index)
 
     def generate_entity_results_from_analysis(self, analysis):
         raise NotImplementedError(f'currently not implemented in {self.parser_name()}')
@@ -193,10 +234,11 @@ class GoParser(AbstractParser, ParsingMixin):
         # pylint: enable=invalid-name
         return grammar
 
-    def _add_imports_to_result(self, result: AbstractFileResult, analysis):
+    def _add_imports_to_result(self, result: AbstractFileResult, analysis, package_index: Optional[GoPackageIndex] = None):
         LOGGER.debug(f'extracting imports from file result {result.scanned_file_name}...')
 
-        filesystem_graph = analysis.graph_representations[GraphType.FILESYSTEM_GRAPH.name.lower()]
+        if package_index is None:
+            package_index = GoPackageIndex(analysis, self._results, self.compiled_func_grammar, self.compiled_struct_grammar)
         extracted_dependencies = self.parse_grammar(analysis, self.dependencies_grammar, result.preprocessed_source)
 
         for parsed_dependency in extracted_dependencies:
@@ -213,68 +255,35 @@ class GoParser(AbstractParser, ParsingMixin):
             else:
                 dependency_is_resolved = False
                 if '/' in dependency:
-                    
-                    # we already have hashed all scanned dependency paths, if the new dependency was already
+
+                    # we already have indexed all scanned dependency paths, if the new dependency was already
                     # scanned before and we can resolve it by checking if it fits at the end of the new dependency
-                    for scanned_dependency in analysis.absolute_scanned_file_names:
-                        check_for_scanned_dependency = scanned_dependency.replace('.go', '')
-                        if dependency.endswith(check_for_scanned_dependency):
-                            dependency = f'{check_for_scanned_dependency}.go'
-                            dependency_is_resolved = True
+                    scanned_dependency = package_index.scanned_files.first_suffix_of(dependency)
+                    if scanned_dependency is not None:
+                        dependency = f'{scanned_dependency}.go'
+                        dependency_is_resolved = True
 
                     # otherwise we have to try resolving a package dependency based on our constructed file graph
                     # where a package may use symbols from all golang source files only in the imported target directory
                     # the approach here is: check if any important symbols (e.g. methods, structs) from each source file
                     # in the given directory is used in the new dependency. if so, add to its imported dependencies.
                     if dependency_is_resolved is False:
-                        some_nodes = filesystem_graph.digraph.nodes
-
-                        for node_name, filesystem_node in some_nodes.items():
-                            if filesystem_node['directory'] is False:
-                                continue
-
-                            if dependency.endswith(node_name):
-
-                                file_nodes_from_dir_node = []
-                                if node_name in analysis.scanned_files_nodes_in_directories:
-                                    file_nodes_from_dir_node = analysis.scanned_files_nodes_in_directories[node_name]
-                                
-                                # get all possible source files that might be an import candidate
-                                potential_imported_results = []
-                                for filesystem_result in file_nodes_from_dir_node:
-                                    results: Dict[str, AbstractFileResult] = {k: v for (k, v) in self._results.items() if v.unique_name == filesystem_result}
-                                    if bool(results):
-                                        potential_imported_result = results[list(results.keys())[0]]
-                                        potential_imported_results.append(potential_imported_result)
-   
-                                for potential_imported_result in potential_imported_results:
-                                    
-                                    preprocessed_golang_source = potential_imported_result.preprocessed_source
-                                    
-                                    # now we get all possible function and struct names
-                                    funcs = self.compiled_func_grammar.findall(preprocessed_golang_source)
-                                    funcs = [x for x in funcs if x]
-
-                                    structs = self.compiled_struct_grammar.findall(preprocessed_golang_source)
-                                    structs = [x for x in structs if x]
-                                    all_tokens = structs + funcs
-                                    
-                                    # check if any of those tokes is contained in the source of the new dependency
-                                    should_add_dependency = False
-                                    for possibe_token in all_tokens:
-                                        if possibe_token in result.preprocessed_source:
-                                            should_add_dependency = True
-                                            break
-                                    
-                                    if should_add_dependency is True:
-                                        result.scanned_import_dependencies.append(potential_imported_result.unique_name)
-                                        LOGGER.debug(f'adding import: {potential_imported_result.unique_name}')
-                                        dependency_is_resolved = True
+                        for directory in package_index.directories.suffixes_of(dependency):
+
+                            # get all possible source files that might be an import candidate
+                            for potential_imported_result in package_index.results_in_directory(directory):
+
+                                # check if any func or struct name of the candidate is contained in the source of the new dependency
+                                symbol_expression = package_index.symbol_expression(potential_imported_result)
+                                if symbol_expression is not None and symbol_expression.search(result.preprocessed_source):
+                                    result.scanned_import_dependencies.append(potential_imported_result.unique_name)
+                                    LOGGER.debug(f'adding import: {potential_imported_result.unique_name}')
+                                    dependency_is_resolved = True
 
                         if dependency_is_resolved is False:
                             result.scanned_import_dependencies.append(dependency)
                             LOGGER.debug(f'adding import: {dependency}')
-                            
+
                     else:
                         result.scanned_import_dependencies.append(dependency)
                         LOGGER.debug(f'adding import: {dependency}')
@@ -283,7 +292,6 @@ class GoParser(AbstractParser, ParsingMixin):
                     result.scanned_import_dependencies.append(dependency)
                     LOGGER.debug(f'adding import: {dependency}')
 
-    
     def _add_package_name_to_result(self, result: FileResult):
         result.module_name = ""
 
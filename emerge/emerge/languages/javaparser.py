@@ -17,6 +17,7 @@ from emerge.languages.abstractparser import AbstractParser, ParsingMixin, Parser
 from emerge.results import EntityResult, FileResult
 from emerge.abstractresult import AbstractResult, AbstractEntityResult
 from emerge.stats import Statistics
+from emerge.pathindex import PathSuffixIndex
 from emerge.log import Logger
 
 LOGGER = Logger(logging.getLogger('parser'))
@@ -103,21 +104,18 @@ class JavaParser(AbstractParser, ParsingMixin):
         # curate dependencies from the first scan java module format that actually exists, to match the real dependencies
         filtered_results = {k: v for (k, v) in self.results.items() if v.analysis is analysis and isinstance(v, FileResult)}
 
+        # a dependency 'com.foo.Bar' is curated to the first file result whose name is contained in 'com/foo/Bar.java'. Since the only dot in this
+        # path is the one of its '.java' extension, a result name (also ending with '.java') can only be contained as a suffix of the path
+        suffix_index = PathSuffixIndex(filtered_results.keys())
+
         result: FileResult
         for _, result in filtered_results.items():
             curated_dependencies = []
 
             for dependency in result.scanned_import_dependencies:
-                curated = False
                 haystack = dependency.replace(".", "/") + ".java"
-
-                for needle, v in filtered_results.items():
-                    if needle in haystack:
-                        curated = True
-                        curated_dependencies.append(needle)
-                        break
-                if not curated:
-                    curated_dependencies.append(dependency)
+                needle = suffix_index.first_suffix_of(haystack)
+                curated_dependencies.append(needle if needle is not None else dependency)
 
             result.scanned_import_dependencies = curated_dependencies
 
@@ -5,16 +5,16 @@ Contains the implementation of the JavaScript language parser and a relevant key
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import Dict
+from typing import Dict, Optional
 from enum import Enum, unique
 import logging
 from pathlib import Path
-import os
 
 import pyparsing as pp
 import coloredlogs
 
 from emerge.languages.abstractparser import AbstractParser, ParsingMixin, Parser, CoreParsingKeyword, LanguageType
+from emerge.languages.moduleresolver import ScannedFileResolver
 from emerge.results import FileResult
 from emerge.abstractresult import AbstractResult, AbstractFileResult, AbstractEntityResult
 from emerge.stats import Statistics
@@ -39,8 +39,11 @@ class JavaScriptParsingKeyword(Enum):
 
 class JavaScriptParser(AbstractParser, ParsingMixin):
 
+    resolves_imports_against_files = True
+
     def __init__(self):
         self._results: Dict[str, AbstractResult] = {}
+        self._resolver: Optional[ScannedFileResolver] = None
         self._token_mappings: Dict[str, str] = {
             ':': ' : ',
             ';': ' ; ',
@@ -103,6 +106,10 @@ class JavaScriptParser(AbstractParser, ParsingMixin):
     def after_generated_file_results(self, analysis) -> None:
         pass
 
+    def add_imports_to_restored_file_result(self, analysis, file_result: AbstractFileResult) -> None:
+        file_result.scanned_import_dependencies = []
+        self._add_imports_to_file_result(file_result, analysis)
+
     def create_unique_entity_name(self, entity: AbstractEntityResult) -> None:
         raise NotImplementedError(f'currently not implemented in {self.parser_name()}')
 
@@ -169,6 +176,16 @@ class JavaScriptParser(AbstractParser, ParsingMixin):
                 LOGGER.debug(f'adding import: {resolved_dependency} to {result.unique_name}')
 
     def try_resolve_dependency(self, dependency: str, result: AbstractFileResult, analysis) -> str:
+        # the same dependency from the same directory always resolves to the same path, so only resolve it once per analysis
+        self._resolver = ScannedFileResolver.for_analysis(analysis, self._resolver)
+        key = (str(result.absolute_dir_path), dependency)
+        resolved_dependency = self._resolver.resolved_dependencies.get(key)
+        if resolved_dependency is None:
+            resolved_dependency = self._resolve_dependency(dependency, result, analysis, self._resolver)
+            self._resolver.resolved_dependencies[key] = resolved_dependency
+        return resolved_dependency
+
+    def _resolve_dependency(self, dependency: str, result: AbstractFileResult, analysis, resolver: ScannedFileResolver) -> str:
         # check if there are any configured dependency substrings to be replaced directly, e.g. '@scope/sub/path' -> src/sub/path
         if analysis.import_aliases_available:
             renamed_dependency = self.replace_substring_if_any_mapping_key_in_string_exists(dependency, analysis.import_aliases)
@@ -182,15 +199,15 @@ class JavaScriptParser(AbstractParser, ParsingMixin):
             # e.g. '@scope/sub/path' (https://nodejs.org/api/modules.html#modules_all_together, LOAD_PACKAGE_EXPORTS)
             if CoreParsingKeyword.SLASH.value in dependency:
                 subpath = '/'.join(dependency.split('/')[1:])
-                check_package_index_export = f"{analysis.source_directory}/{subpath}/index.js"
-                check_package_subpath_import = f"{analysis.source_directory}/{subpath}.js"
+                check_package_index_export = resolver.relative_analysis_path(f"{subpath}/index.js")
+                check_package_subpath_import = resolver.relative_analysis_path(f"{subpath}.js")
 
-                # check if there is a package index .ts file
-                if os.path.exists(check_package_index_export):
-                    dependency = self.create_relative_analysis_file_path(analysis.source_directory, check_package_index_export)
-                # check if the subpath exists as a .ts file
-                if os.path.exists(check_package_subpath_import):
-                    dependency = self.create_relative_analysis_file_path(analysis.source_directory, check_package_subpath_import)
+                # check if there is a package index .js file
+                if resolver.exists(check_package_index_export):
+                    dependency = check_package_index_export
+                # check if the subpath exists as a .js file
+                if resolver.exists(check_package_subpath_import):
+                    dependency = check_package_subpath_import
 
             # pylint: disable=unnecessary-pass
             pass  # otherwise let the module @-dependency as it is
@@ -198,9 +215,8 @@ class JavaScriptParser(AbstractParser, ParsingMixin):
         # check for index.js imports (https://nodejs.org/api/modules.html#modules_all_together)
         elif dependency == CoreParsingKeyword.DOT.value:
             index_dependency = dependency.replace(CoreParsingKeyword.DOT.value, './index.js')
-            index_dependency = self.resolve_relative_dependency_path(index_dependency, str(result.absolute_dir_path), analysis.source_directory)
-            check_dependency_path = f"{ Path(analysis.source_directory).parent}/{index_dependency}"
-            if os.path.exists(check_dependency_path):  # check if the resolved index_dependency exists, then modify
+            index_dependency = resolver.resolve_relative_dependency_path(index_dependency, str(result.absolute_dir_path))
+            if resolver.exists(index_dependency):  # check if the resolved index_dependency exists, then modify
                 dependency = f"{index_dependency}"
 
         elif dependency.count(CoreParsingKeyword.POSIX_CURRENT_DIRECTORY.value) == 1 and \
@@ -211,16 +227,14 @@ class JavaScriptParser(AbstractParser, ParsingMixin):
             dependency = self.create_relative_analysis_path_for_dependency(dependency, str(result.relative_analysis_path))
 
         elif JavaScriptParsingKeyword.PARENT_DIRECTORY.value in dependency:  # contains at least one relative parent element '../
-            dependency = self.resolve_relative_dependency_path(dependency, str(result.absolute_dir_path), analysis.source_directory)
+            dependency = resolver.resolve_relative_dependency_path(dependency, str(result.absolute_dir_path))
 
         # check and verify if we need to add a remaining .js suffix
-        check_dependency_path = f"{ Path(analysis.source_directory).parent}/{dependency}.js"
-        if Path(dependency).suffix != ".js" and os.path.exists(check_dependency_path):
+        if Path(dependency).suffix != ".js" and resolver.exists(f"{dependency}.js"):
             dependency = f"{dependency}.js"
 
         # check if the dependency maybe results from an index.js import
-        check_dependency_path_for_index_file = f"{ Path(analysis.source_directory).parent}/{dependency}/index.js"
-        if os.path.exists(check_dependency_path_for_index_file):
+        if resolver.exists(f"{dependency}/index.js"):
             dependency = f"{dependency}/index.js"
 
         return dependency
@@ -0,0 +1,56 @@
+"""
+Contains a resolver for javascript/typescript module dependencies, that answers file existence from the scanned files of an analysis
+instead of the filesystem and remembers every resolved dependency.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Dict, Optional, Set, Tuple
+from pathlib import Path
+
+import posixpath
+
+
+class ScannedFileResolver:
+    """Checks relative analysis paths (e.g. 'src/foo/index.js') against the set of scanned files of an analysis,
+    and memoizes resolved dependencies by the directory of the importing file and the dependency as written in the source (before any import alias is applied).
+    """
+
+    def __init__(self, analysis):
+        self.source_directory: str = analysis.source_directory
+        self.scanned_files: Set[str] = analysis.absolute_scanned_file_names
+        self.import_aliases: Dict[str, str] = analysis.import_aliases
+        self.resolved_dependencies: Dict[Tuple[str, str], str] = {}
+
+        self._parent_directory = f'{Path(self.source_directory).parent}/'
+        self._project_scanning_path = self.source_directory if self.source_directory.endswith('/') else f'{self.source_directory}/'
+
+    @classmethod
+    def for_analysis(cls, analysis, resolver: Optional['ScannedFileResolver']) -> 'ScannedFileResolver':
+        """Returns the given resolver if it was created for the same scan and import aliases, otherwise a new resolver for the analysis.
+        """
+        if resolver is not None and resolver.scanned_files is analysis.absolute_scanned_file_names and \
+                resolver.import_aliases is analysis.import_aliases and resolver.source_directory == analysis.source_directory:
+            return resolver
+        return cls(analysis)
+
+    def exists(self, relative_analysis_path: str) -> bool:
+        # normalize like the filesystem would do, e.g. 'src/./foo//bar.js' -> 'src/foo/bar.js'
+        return posixpath.normpath(relative_analysis_path) in self.scanned_files
+
+    def relative_analysis_path(self, subpath: str) -> str:
+        """Creates the relative analysis path of a subpath within the source directory, e.g. 'foo/index.js' -> 'src/foo/index.js'.
+        """
+        return f'{self.source_directory}/{subpath}'.replace(self._parent_directory, '')
+
+    def resolve_relative_dependency_path(self, dependency: str, importing_directory: str) -> str:
+        """Same as ParsingMixin.resolve_relative_dependency_path, but normalizes the path lexically instead of resolving it on the filesystem.
+        The scan does not follow symlinked directories either, so both paths are the same for every scanned file.
+        """
+        resolved_path = posixpath.normpath(f'{importing_directory}/{dependency}')
+
+        # if the resolved path is still inside the project path, create a dependency path that is only relative to the analysis
+        if self._project_scanning_path in resolved_path:
+            return resolved_path.replace(self._parent_directory, '')
+        return dependency
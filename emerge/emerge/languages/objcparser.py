@@ -38,6 +38,8 @@ class ObjCParsingKeyword(Enum):
 
 class ObjCParser(AbstractParser, ParsingMixin):
 
+    resolves_imports_against_files = True
+
     def __init__(self):
         self._results: Dict[str, AbstractResult] = {}
         self._token_mappings: Dict[str, str] = {
@@ -101,6 +103,10 @@ class ObjCParser(AbstractParser, ParsingMixin):
     def after_generated_file_results(self, analysis) -> None:
         pass
 
+    def add_imports_to_restored_file_result(self, analysis, file_result: AbstractFileResult) -> None:
+        file_result.scanned_import_dependencies = []
+        self._add_imports_to_result(file_result, analysis)
+
     def create_unique_entity_name(self, entity: AbstractEntityResult) -> None:
         raise NotImplementedError(f'currently not implemented in {self.parser_name()}')
 
@@ -0,0 +1,180 @@
+"""
+Contains the detection of global python modules (standard library and installed distributions), that are not resolved to files by the python parser.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+from importlib import metadata
+
+import os
+import sys
+import site
+import glob
+import json
+import sysconfig
+import hashlib
+import logging
+import coloredlogs
+
+from emerge.log import Logger
+
+LOGGER = Logger(logging.getLogger('parser'))
+coloredlogs.install(level='E', logger=LOGGER.logger(), fmt=Logger.log_format)
+
+# bump this whenever the way global modules are detected changes
+GLOBAL_MODULES_CACHE_FORMAT_VERSION = '2'
+
+# overrides the directory of the global module cache, an empty value disables the cache
+GLOBAL_MODULES_CACHE_DIRECTORY_ENV = 'EMERGE_GLOBAL_MODULES_CACHE_DIR'
+
+
+def interpreter_fingerprint() -> str:
+    """Creates a fingerprint of the running interpreter, that prefixes the names of its global module cache files.
+    """
+    return hashlib.sha1(f'{GLOBAL_MODULES_CACHE_FORMAT_VERSION}|{sys.version}|{sys.prefix}|{sys.executable}'.encode()).hexdigest()[:16]
+
+
+def global_module_directories() -> List[str]:
+    """Returns the standard library and site-packages directories of the running interpreter.
+    Other entries of sys.path (e.g. the current working directory or the directory of the running script) are left out,
+    since they change whenever a file is written there.
+    """
+    directories = [sysconfig.get_path(x) for x in ['stdlib', 'platstdlib', 'purelib', 'platlib']]
+    directories.extend(site.getsitepackages() if hasattr(site, 'getsitepackages') else [])  # not available in some virtualenvs
+    if site.ENABLE_USER_SITE:
+        directories.append(site.getusersitepackages())
+    return sorted({x for x in directories if x})
+
+
+def site_packages_fingerprint() -> str:
+    """Creates a fingerprint of the interpreter and its standard library and site-packages directories.
+    Installing or removing a distribution changes the modification time of its site-packages directory and therefore the fingerprint.
+    """
+    fingerprint = hashlib.sha1()
+    fingerprint.update(interpreter_fingerprint().encode())
+
+    for path in global_module_directories():
+        try:
+            modification_time = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        fingerprint.update(f'|{path}:{modification_time}'.encode())
+
+    return fingerprint.hexdigest()
+
+
+def stdlib_module_names() -> Set[str]:
+    """Returns the names of all top level standard library modules.
+    """
+    names = getattr(sys, 'stdlib_module_names', None)  # python >= 3.10
+    if names is None:
+        names = set(sys.builtin_module_names) | {x.split('.', 1)[0] for x in sys.modules}
+    return {x for x in names if not x.startswith('_')}
+
+
+def distribution_module_names(distributions: Optional[Iterable[metadata.Distribution]] = None) -> Set[str]:
+    """Returns the top level module names of all installed distributions and their normalized distribution names.
+    """
+    module_names: Set[str] = set()
+
+    for distribution in distributions if distributions is not None else metadata.distributions():
+        try:
+            distribution_name = distribution.metadata['Name']
+            top_level = distribution.read_text('top_level.txt')
+        except Exception:  # pylint: disable=broad-except
+            continue
+
+        if distribution_name:
+            module_names.add(distribution_name.replace('-', '_').lower())
+
+        if top_level:
+            top_level_names = top_level.split()
+        else:
+            # distributions without top_level.txt (e.g. built by other backends) list their files instead
+            top_level_names = []
+            for file in distribution.files or []:
+                if len(file.parts) == 1 and file.name.endswith('.py'):
+                    top_level_names.append(file.name[:-3])
+                elif len(file.parts) > 1 and '.' not in file.parts[0]:  # skips e.g. *.dist-info and ../../bin
+                    top_level_names.append(file.parts[0])
+
+        for name in top_level_names:
+            if '-' not in name and '__' not in name and not name.startswith('_'):
+                module_names.add(name)
+
+    return module_names
+
+
+def create_global_module_names() -> Set[str]:
+    """Detects all global modules of the running interpreter.
+    """
+    return stdlib_module_names() | distribution_module_names()
+
+
+def global_modules_cache_directory() -> Optional[str]:
+    directory = os.environ.get(GLOBAL_MODULES_CACHE_DIRECTORY_ENV)
+    if directory is not None:
+        return directory or None
+
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'emerge')
+
+
+def remove_outdated_cache_files(directory: str, cache_file_prefix: str, current_cache_file_path: str) -> None:
+    for cache_file_path in glob.glob(os.path.join(glob.escape(directory), f'{cache_file_prefix}*.json')):
+        if cache_file_path != current_cache_file_path:
+            try:
+                os.remove(cache_file_path)
+            except OSError as ex:
+                LOGGER.debug(f'could not remove outdated global module cache {cache_file_path}: {ex}')
+
+
+# global module names by site-packages fingerprint, detected once per process
+_GLOBAL_MODULE_NAMES: Dict[str, FrozenSet[str]] = {}
+
+
+def load_global_module_names(cache_directory: Optional[str] = None) -> Set[str]:
+    """Returns the global module names of the running interpreter.
+    They are detected once per process and site-packages fingerprint, and cached on disk so that later processes only have to read a single file.
+    Writing a new cache file removes the outdated cache files of the same interpreter.
+
+    Args:
+        cache_directory (Optional[str]): Directory of the cache file, defaults to global_modules_cache_directory().
+
+    Returns:
+        Set[str]: Names of all global modules.
+    """
+    fingerprint = site_packages_fingerprint()
+    if fingerprint in _GLOBAL_MODULE_NAMES:
+        return set(_GLOBAL_MODULE_NAMES[fingerprint])
+
+    directory = cache_directory if cache_directory is not None else global_modules_cache_directory()
+    cache_file_prefix = f'python-global-modules-{interpreter_fingerprint()}-'
+    cache_file_path = os.path.join(directory, f'{cache_file_prefix}{fingerprint}.json') if directory else None
+
+    module_names: Optional[Set[str]] = None
+    if cache_file_path and os.path.isfile(cache_file_path):
+        try:
+            with open(cache_file_path, encoding='utf-8') as cache_file:
+                module_names = set(json.load(cache_file))
+        except (OSError, ValueError, TypeError) as ex:
+            LOGGER.debug(f'could not read global module cache {cache_file_path}: {ex}')
+
+    if module_names is None:
+        module_names = create_global_module_names()
+        if cache_file_path:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                temporary_file_path = f'{cache_file_path}.{os.getpid()}.tmp'
+                with open(temporary_file_path, 'w', encoding='utf-8') as cache_file:
+                    json.dump(sorted(module_names), cache_file)
+                os.replace(temporary_file_path, cache_file_path)
+            except OSError as ex:
+                LOGGER.debug(f'could not write global module cache {cache_file_path}: {ex}')
+            else:
+                remove_outdated_cache_files(directory, cache_file_prefix, cache_file_path)
+
+    _GLOBAL_MODULE_NAMES[fingerprint] = frozenset(module_names)
+    return module_names
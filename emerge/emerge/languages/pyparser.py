@@ -5,21 +5,20 @@ Contains the implementation of the Python language parser and a relevant keyword
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import Dict, Set
+from typing import Dict, Generator, List, NamedTuple, Optional, Set, Tuple
 from enum import Enum, unique
 
+import ast
 import logging
 from pathlib import Path
 import os
-import sys
-
-import pkg_resources
-from pip._internal.operations.freeze import freeze
+import warnings
 
 import coloredlogs
 import pyparsing as pp
 
 from emerge.languages.abstractparser import AbstractParser, ParsingMixin, Parser, CoreParsingKeyword, LanguageType
+from emerge.languages.pymodules import load_global_module_names
 from emerge.results import FileResult
 from emerge.abstractresult import AbstractResult, AbstractFileResult, AbstractEntityResult
 from emerge.log import Logger
@@ -46,8 +45,22 @@ class PythonParsingKeyword(Enum):
     PY_FILE_EXTENSION = ".py"
 
 
+class PythonImport(NamedTuple):
+    """An import of a python file, reduced to what is needed to resolve its dependencies.
+    """
+    dependency: str
+    global_import: bool  # 'import <dependency>' is assumed to be global, 'from <dependency> import ...' is not
+    relative_current_dir_dependencies: Tuple[str, ...] = ()  # 'from . import <dependency1>, ..., <dependencyN>'
+    relative_parent_dir_dependencies: Tuple[str, ...] = ()  # 'from .. import <dependency1>, ..., <dependencyN>'
+
+
 class PythonParser(AbstractParser, ParsingMixin):
 
+    resolves_imports_against_files = True
+
+    # extract imports from the syntax tree of a file instead of its tokens, files that can not be parsed are still scanned by tokens
+    syntax_tree_import_extraction: bool = True
+
     def __init__(self):
         self._results: Dict[str, AbstractResult] = {}
         self._token_mappings: Dict[str, str] = {
@@ -66,7 +79,11 @@ class PythonParser(AbstractParser, ParsingMixin):
             '>': ' > ',
             '"': ' " '
         }
-        self.global_dependency_autodetect_set: Set[str] = self.create_autodetect_set()
+        # detected on first use, since parsers are also created for analyses without any python files
+        self._global_dependency_autodetect_set: Optional[Set[str]] = None
+
+        # import grammars are built once per parser, building them for every import line is much more expensive than parsing
+        self._import_from_current_dir_expression, self._import_from_parent_dir_expression, self._import_expression = self.create_import_expressions()
 
     @classmethod
     def parser_name(cls) -> str:
@@ -80,6 +97,16 @@ class PythonParser(AbstractParser, ParsingMixin):
     def results(self) -> Dict[str, AbstractResult]:
         return self._results
 
+    @property
+    def global_dependency_autodetect_set(self) -> Set[str]:
+        if self._global_dependency_autodetect_set is None:
+            self._global_dependency_autodetect_set = self.create_autodetect_set()
+        return self._global_dependency_autodetect_set
+
+    @global_dependency_autodetect_set.setter
+    def global_dependency_autodetect_set(self, value: Set[str]):
+        self._global_dependency_autodetect_set = value
+
     @results.setter
     def results(self, value):
         self._results = value
@@ -107,21 +134,90 @@ class PythonParser(AbstractParser, ParsingMixin):
         )
 
         self._add_package_name_to_result(file_result)
-        self._add_imports_to_result(file_result, analysis)
+        self._add_imports_to_result(file_result, analysis, file_content)
         self._results[file_result.unique_name] = file_result
 
     def after_generated_file_results(self, analysis) -> None:
         pass
 
+    def add_imports_to_restored_file_result(self, analysis, file_result: AbstractFileResult) -> None:
+        file_result.scanned_import_dependencies = []
+        self._add_imports_to_result(file_result, analysis, file_result.source)
+
     def generate_entity_results_from_analysis(self, analysis):
         raise NotImplementedError(f'currently not implemented in {self.parser_name()}')
 
     def create_unique_entity_name(self, entity: AbstractEntityResult) -> None:
         raise NotImplementedError(f'currently not implemented in {self.parser_name()}')
 
-    # pylint: disable=too-many-statements
-    def _add_imports_to_result(self, result: AbstractFileResult, analysis):
+    def _add_imports_to_result(self, result: AbstractFileResult, analysis, file_content: Optional[str] = None):
         LOGGER.debug(f'extracting imports from file result {result.scanned_file_name}...')
+
+        python_imports: Optional[List[PythonImport]] = None
+        if file_content is not None and self.syntax_tree_import_extraction:
+            python_imports = self._extract_imports_from_syntax_tree(result, file_content)
+
+        # fall back to the token based extraction, e.g. for files with syntax errors or python 2 code
+        if python_imports is None:
+            python_imports = self._extract_imports_from_tokens(result)
+
+        for python_import in python_imports:
+            analysis.statistics.increment(Statistics.Key.PARSING_HITS)
+            self._add_import_to_result(result, analysis, python_import)
+
+    def _extract_imports_from_syntax_tree(self, result: AbstractFileResult, file_content: str) -> Optional[List[PythonImport]]:
+        """Extracts all import statements (including nested and multi-line imports) in one pass over the syntax tree of a file.
+        Returns None if the file can not be parsed.
+        """
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')  # e.g. SyntaxWarnings for invalid escape sequences
+                syntax_tree = ast.parse(file_content)
+        except (SyntaxError, ValueError, RecursionError) as ex:
+            LOGGER.debug(f'could not parse the syntax tree of {result.scanned_file_name}, extracting imports from tokens: {ex}')
+            return None
+
+        python_imports: List[PythonImport] = []
+        for statement in self._gen_import_statements(syntax_tree.body):
+            if isinstance(statement, ast.Import):
+                python_imports.extend(PythonImport(alias.name, global_import=True) for alias in statement.names)
+                continue
+
+            names = [alias.name for alias in statement.names if alias.name != CoreParsingKeyword.ASTERISK.value]
+
+            # case 'from . import <dependencies>' and 'from .. import <dependencies>'
+            if statement.module is None and statement.level in (1, 2):
+                if len(names) == 1:
+                    python_imports.append(PythonImport(names[0], global_import=False))
+                elif statement.level == 1 and names:
+                    python_imports.append(PythonImport(','.join(names), global_import=False, relative_current_dir_dependencies=tuple(names)))
+                elif names:
+                    python_imports.append(PythonImport(','.join(names), global_import=False, relative_parent_dir_dependencies=tuple(names)))
+
+            # all other cases e.g. 'from foo.bar import <dependency>' or 'from .foo import <dependency>'
+            else:
+                dependency = CoreParsingKeyword.DOT.value * statement.level + (statement.module or PythonParsingKeyword.EMPTY.value)
+                python_imports.append(PythonImport(dependency, global_import=False))
+
+        # like equal import lines, every import is only resolved once per file
+        return list(dict.fromkeys(python_imports))
+
+    @staticmethod
+    def _gen_import_statements(statements: List[ast.stmt]) -> Generator:
+        """Yields all import statements in source order, also from the bodies of compound statements (if, try, def, class, ...).
+        """
+        for statement in statements:
+            if isinstance(statement, (ast.Import, ast.ImportFrom)):
+                yield statement
+                continue
+            for field in ['body', 'handlers', 'orelse', 'finalbody', 'cases']:
+                children = getattr(statement, field, None)
+                if children:
+                    yield from PythonParser._gen_import_statements(children)
+
+    def _extract_imports_from_tokens(self, result: AbstractFileResult) -> List[PythonImport]:
+        """Extracts imports by joining the scanned tokens to lines without comments and parsing every line with 'import'.
+        """
         list_of_words_with_newline_strings = result.scanned_tokens
 
         source_string_no_comments = self._filter_source_tokens_without_comments(
@@ -144,68 +240,42 @@ class PythonParser(AbstractParser, ParsingMixin):
                 line = line[:-1]
                 # only append relevant lines with 'import'
                 if line is not PythonParsingKeyword.EMPTY.value and PythonParsingKeyword.IMPORT.value in line \
-                    and PythonParsingKeyword.PYTHON_UNIT_TEST_BRACKET.value not in line and line not in source_import_lines:
+                        and PythonParsingKeyword.PYTHON_UNIT_TEST_BRACKET.value not in line and line not in source_import_lines:
                     source_import_lines.append(line)
                 line = PythonParsingKeyword.EMPTY.value
 
-        # now iterate line by line are try to parse and resolve the dependencies
+        # now iterate line by line are try to parse the dependencies
+        python_imports: List[PythonImport] = []
         for line in source_import_lines:
 
-            relative_import = False
             global_import = True
             if PythonParsingKeyword.FROM.value in line:
                 global_import = False
 
-            expression_to_match = None
             multiple_imports_from_relative_current_dir = False
             multiple_imports_from_relative_parent_dir = False
             multiple_dependencies = []
 
-            valid_name = pp.Word(
-                pp.alphanums + \
-                CoreParsingKeyword.DOT.value + \
-                CoreParsingKeyword.UNDERSCORE.value + \
-                CoreParsingKeyword.DASH.value + \
-                CoreParsingKeyword.SLASH.value
-            )
-
-            valid_name_comma_seperated_imports = pp.Word(
-                pp.alphanums + \
-                CoreParsingKeyword.DOT.value + \
-                CoreParsingKeyword.UNDERSCORE.value + \
-                CoreParsingKeyword.DASH.value + \
-                CoreParsingKeyword.SLASH.value + \
-                CoreParsingKeyword.COMMA.value + " "
-            )
-
             # case 'from . import <dependencies>'
             if PythonParsingKeyword.RELATIVE_FROM_CURRENT_DIR.value in line:
                 multiple_imports_from_relative_current_dir = True
-                expression_to_match = pp.Keyword(PythonParsingKeyword.FROM.value) + \
-                    pp.Keyword(PythonParsingKeyword.PYTHON_IMPORT_CURRENT_DIR.value) + \
-                    pp.Keyword(PythonParsingKeyword.IMPORT.value) + \
-                    pp.OneOrMore(valid_name_comma_seperated_imports.setResultsName(CoreParsingKeyword.IMPORT_ENTITY_NAME.value))
+                expression_to_match = self._import_from_current_dir_expression
 
             # case 'from .. import <dependencies>'
             elif PythonParsingKeyword.RELATIVE_FROM_PARENT_DIR.value in line:
                 multiple_imports_from_relative_parent_dir = True
-                expression_to_match = pp.Keyword(PythonParsingKeyword.FROM.value) + \
-                    pp.Keyword(PythonParsingKeyword.PYTHON_IMPORT_PARENT_DIR.value) + \
-                    pp.Keyword(PythonParsingKeyword.IMPORT.value) + \
-                    pp.OneOrMore(valid_name_comma_seperated_imports.setResultsName(CoreParsingKeyword.IMPORT_ENTITY_NAME.value))
+                expression_to_match = self._import_from_parent_dir_expression
 
             # all other cases e.g. 'import <dependency>' or 'from foo.bar import <dependency>
             else:
-                expression_to_match = (pp.Keyword(PythonParsingKeyword.IMPORT.value) | pp.Keyword(PythonParsingKeyword.FROM.value)) + \
-                    valid_name.setResultsName(CoreParsingKeyword.IMPORT_ENTITY_NAME.value) + \
-                    pp.Optional(pp.FollowedBy(pp.Keyword(PythonParsingKeyword.IMPORT.value)))
+                expression_to_match = self._import_expression
 
             try:
                 parsing_result = expression_to_match.parseString(line)
 
                 # if there are multiple dependencies, throw them all in multiple_dependencies
                 if (multiple_imports_from_relative_current_dir or multiple_imports_from_relative_parent_dir) \
-                    and CoreParsingKeyword.COMMA.value in getattr(parsing_result, CoreParsingKeyword.IMPORT_ENTITY_NAME.value):
+                        and CoreParsingKeyword.COMMA.value in getattr(parsing_result, CoreParsingKeyword.IMPORT_ENTITY_NAME.value):
                     multiple_results = getattr(parsing_result, CoreParsingKeyword.IMPORT_ENTITY_NAME.value)
                     multiple_dependencies = multiple_results.split(',')
                     multiple_dependencies = [s.strip() for s in multiple_dependencies]
@@ -218,125 +288,149 @@ class PythonParser(AbstractParser, ParsingMixin):
                 LOGGER.warning(f'warning: could not parse result {result=}\n{exception}')
                 continue
 
-            analysis.statistics.increment(Statistics.Key.PARSING_HITS)
-
-            # ignore any dependency substring from the config ignore list
             dependency = getattr(parsing_result, CoreParsingKeyword.IMPORT_ENTITY_NAME.value)
+            if multiple_imports_from_relative_current_dir:
+                python_imports.append(PythonImport(dependency, global_import, relative_current_dir_dependencies=tuple(multiple_dependencies)))
+            elif multiple_imports_from_relative_parent_dir:
+                python_imports.append(PythonImport(dependency, global_import, relative_parent_dir_dependencies=tuple(multiple_dependencies)))
+            else:
+                python_imports.append(PythonImport(dependency, global_import))
+
+        return python_imports
 
-            # now try to resolve the dependency
-
-            # case: 'from .. import dependency1, ..., dependencyN
-            if multiple_imports_from_relative_parent_dir and not multiple_imports_from_relative_current_dir:
-                for dep in multiple_dependencies:
-                    resolved_dep = dep.replace(PythonParsingKeyword.PYTHON_IMPORT_PARENT_DIR.value, CoreParsingKeyword.POSIX_PARENT_DIRECTORY.value)
-
-                    if f'{PythonParsingKeyword.PY_FILE_EXTENSION.value}' not in resolved_dep:
-                        resolved_dep = f'{resolved_dep}{PythonParsingKeyword.PY_FILE_EXTENSION.value}'
-                    if self._is_dependency_in_ignore_list(resolved_dep, analysis):
-                        LOGGER.debug(f'ignoring dependency from {result.unique_name} to {resolved_dep}')
-                    else:
-                        result.scanned_import_dependencies.append(resolved_dep)
-                        LOGGER.debug(f'adding import: {resolved_dep}')
-
-            # case: 'from . import dependency1, ..., dependencyN
-            elif multiple_imports_from_relative_current_dir and not multiple_imports_from_relative_parent_dir:
-                for dep in multiple_dependencies:
-                    resolved_dep = self.create_relative_analysis_path_for_dependency(dep, str(result.relative_analysis_path))
-
-                    if f'{PythonParsingKeyword.PY_FILE_EXTENSION.value}' not in resolved_dep:
-                        resolved_dep = f'{resolved_dep}{PythonParsingKeyword.PY_FILE_EXTENSION.value}'
-                    if self._is_dependency_in_ignore_list(resolved_dep, analysis):
-                        LOGGER.debug(f'ignoring dependency from {result.unique_name} to {resolved_dep}')
-                    else:
-                        result.scanned_import_dependencies.append(resolved_dep)
-                        LOGGER.debug(f'adding import: {resolved_dep}')
-
-            # all other cases
-            elif not multiple_imports_from_relative_current_dir and not multiple_imports_from_relative_parent_dir:
-                
-                # try to autodetect | override if a dependency should be resolved or kept as global_import
-                if self.dependency_is_global(dependency, analysis):
-                    global_import = True
-
-                if PythonParsingKeyword.PYTHON_IMPORT_PARENT_DIR.value in dependency:
-                    relative_import = True
-                    dependency = dependency.replace(PythonParsingKeyword.PYTHON_IMPORT_PARENT_DIR.value, CoreParsingKeyword.POSIX_PARENT_DIRECTORY.value)
-
-                if len(dependency) > 1 and CoreParsingKeyword.DOT.value == dependency[0] and CoreParsingKeyword.DOT.value is not dependency[1]:
-                    relative_import = True
-                    dependency = dependency[1:]
-
-                if not global_import and relative_import and CoreParsingKeyword.POSIX_PARENT_DIRECTORY.value not in dependency:
-                    dependency = self.create_relative_analysis_path_for_dependency(dependency, str(result.relative_analysis_path))
-                elif not global_import and CoreParsingKeyword.POSIX_PARENT_DIRECTORY.value not in dependency:
-                    posix_dependency = dependency.replace(CoreParsingKeyword.DOT.value, CoreParsingKeyword.SLASH.value)
-
-                    if analysis.source_directory == CoreParsingKeyword.DOT.value:
-                        relative_path = posix_dependency
-                    else:
-                        relative_path = f'{Path(analysis.source_directory).name}/{posix_dependency}'
-
-                    check_dependency_path = f"{ Path(analysis.source_directory).parent}/{relative_path}"
-                    if os.path.exists(f'{check_dependency_path}{PythonParsingKeyword.PY_FILE_EXTENSION.value}'):
-                        dependency = f'{relative_path}{PythonParsingKeyword.PY_FILE_EXTENSION.value}'
-                    else:
-                        dependency = relative_path
-
-                    if self._is_dependency_in_ignore_list(dependency, analysis):
-                        LOGGER.debug(f'ignoring dependency from {result.unique_name} to {dependency}')
-                    else:
-                        result.scanned_import_dependencies.append(dependency)
-                        LOGGER.debug(f'adding import: {dependency}')
-                    continue
-
-                if CoreParsingKeyword.POSIX_PARENT_DIRECTORY.value in dependency:  # contains at least one relative parent element '../'
-                    dependency = self.resolve_relative_dependency_path(dependency, str(result.absolute_dir_path), analysis.source_directory)
-
-                if not global_import:
-                    dependency = dependency.replace(CoreParsingKeyword.DOT.value, CoreParsingKeyword.SLASH.value)
-
-                if f'{PythonParsingKeyword.PY_FILE_EXTENSION.value}' not in dependency and not global_import:
-                    dependency = f'{dependency}{PythonParsingKeyword.PY_FILE_EXTENSION.value}'
+    # pylint: disable=too-many-statements
+    def _add_import_to_result(self, result: AbstractFileResult, analysis, python_import: PythonImport):
+        """Resolves the dependencies of an import and adds them to the given result, unless they are ignored.
+        """
+        dependency = python_import.dependency
+        global_import = python_import.global_import
+        relative_import = False
+
+        # now try to resolve the dependency
+
+        # case: 'from .. import dependency1, ..., dependencyN
+        if python_import.relative_parent_dir_dependencies:
+            for dep in python_import.relative_parent_dir_dependencies:
+                resolved_dep = dep.replace(PythonParsingKeyword.PYTHON_IMPORT_PARENT_DIR.value, CoreParsingKeyword.POSIX_PARENT_DIRECTORY.value)
+
+                if f'{PythonParsingKeyword.PY_FILE_EXTENSION.value}' not in resolved_dep:
+                    resolved_dep = f'{resolved_dep}{PythonParsingKeyword.PY_FILE_EXTENSION.value}'
+                if self._is_dependency_in_ignore_list(resolved_dep, analysis):
+                    LOGGER.debug(f'ignoring dependency from {result.unique_name} to {resolved_dep}')
+                else:
+                    result.scanned_import_dependencies.append(resolved_dep)
+                    LOGGER.debug(f'adding import: {resolved_dep}')
+
+        # case: 'from . import dependency1, ..., dependencyN
+        elif python_import.relative_current_dir_dependencies:
+            for dep in python_import.relative_current_dir_dependencies:
+                resolved_dep = self.create_relative_analysis_path_for_dependency(dep, str(result.relative_analysis_path))
+
+                if f'{PythonParsingKeyword.PY_FILE_EXTENSION.value}' not in resolved_dep:
+                    resolved_dep = f'{resolved_dep}{PythonParsingKeyword.PY_FILE_EXTENSION.value}'
+                if self._is_dependency_in_ignore_list(resolved_dep, analysis):
+                    LOGGER.debug(f'ignoring dependency from {result.unique_name} to {resolved_dep}')
+                else:
+                    result.scanned_import_dependencies.append(resolved_dep)
+                    LOGGER.debug(f'adding import: {resolved_dep}')
+
+        # all other cases
+        else:
+
+            # try to autodetect | override if a dependency should be resolved or kept as global_import
+            if self.dependency_is_global(dependency, analysis):
+                global_import = True
+
+            if PythonParsingKeyword.PYTHON_IMPORT_PARENT_DIR.value in dependency:
+                relative_import = True
+                dependency = dependency.replace(PythonParsingKeyword.PYTHON_IMPORT_PARENT_DIR.value, CoreParsingKeyword.POSIX_PARENT_DIRECTORY.value)
+
+            if len(dependency) > 1 and CoreParsingKeyword.DOT.value == dependency[0] and CoreParsingKeyword.DOT.value is not dependency[1]:
+                relative_import = True
+                dependency = dependency[1:]
+
+            if not global_import and relative_import and CoreParsingKeyword.POSIX_PARENT_DIRECTORY.value not in dependency:
+                dependency = self.create_relative_analysis_path_for_dependency(dependency, str(result.relative_analysis_path))
+            elif not global_import and CoreParsingKeyword.POSIX_PARENT_DIRECTORY.value not in dependency:
+                posix_dependency = dependency.replace(CoreParsingKeyword.DOT.value, CoreParsingKeyword.SLASH.value)
+
+                if analysis.source_directory == CoreParsingKeyword.DOT.value:
+                    relative_path = posix_dependency
+                else:
+                    relative_path = f'{Path(analysis.source_directory).name}/{posix_dependency}'
+
+                check_dependency_path = f"{ Path(analysis.source_directory).parent}/{relative_path}"
+                if os.path.exists(f'{check_dependency_path}{PythonParsingKeyword.PY_FILE_EXTENSION.value}'):
+                    dependency = f'{relative_path}{PythonParsingKeyword.PY_FILE_EXTENSION.value}'
+                else:
+                    dependency = relative_path
 
                 if self._is_dependency_in_ignore_list(dependency, analysis):
                     LOGGER.debug(f'ignoring dependency from {result.unique_name} to {dependency}')
                 else:
                     result.scanned_import_dependencies.append(dependency)
                     LOGGER.debug(f'adding import: {dependency}')
+                return
 
-    def _add_package_name_to_result(self, result: FileResult):
-        result.module_name = ""
+            if CoreParsingKeyword.POSIX_PARENT_DIRECTORY.value in dependency:  # contains at least one relative parent element '../'
+                dependency = self.resolve_relative_dependency_path(dependency, str(result.absolute_dir_path), analysis.source_directory)
 
-    def create_autodetect_set(self) -> Set[str]:
-        global_dependency_autodetect_set: Set[str] = set()
-   
-        # first global dependency detection attempt
-        for module in pkg_resources.working_set:
-            
-            try:
-                # pylint: disable=protected-access
-                module_name_from_metadata = next(pkg_resources.get_distribution(module.key)._get_metadata('top_level.txt')) # type: ignore
+            if not global_import:
+                dependency = dependency.replace(CoreParsingKeyword.DOT.value, CoreParsingKeyword.SLASH.value)
 
-            except: # pylint: disable=bare-except
-                module_name_from_metadata = None
-            
-            if module_name_from_metadata:
-                if '-' not in module_name_from_metadata and '__' not in module_name_from_metadata and not module_name_from_metadata.startswith('_'):
-                    global_dependency_autodetect_set.add(module_name_from_metadata)
+            if f'{PythonParsingKeyword.PY_FILE_EXTENSION.value}' not in dependency and not global_import:
+                dependency = f'{dependency}{PythonParsingKeyword.PY_FILE_EXTENSION.value}'
 
-        # second global dependency detection attempt
-        second_global_module_detection_appempt = list(freeze())
-        processed_result_second_detection = [x.split('==', 1)[0].replace('-','_').lower() for x in second_global_module_detection_appempt]
-        for element in processed_result_second_detection:
-            global_dependency_autodetect_set.add(element)
+            if self._is_dependency_in_ignore_list(dependency, analysis):
+                LOGGER.debug(f'ignoring dependency from {result.unique_name} to {dependency}')
+            else:
+                result.scanned_import_dependencies.append(dependency)
+                LOGGER.debug(f'adding import: {dependency}')
+
+    @staticmethod
+    def create_import_expressions() -> Tuple[pp.ParserElement, pp.ParserElement, pp.ParserElement]:
+        """Creates the grammars for 'from . import <dependencies>', 'from .. import <dependencies>' and all other imports.
+        """
+        valid_name = pp.Word(
+            pp.alphanums +
+            CoreParsingKeyword.DOT.value +
+            CoreParsingKeyword.UNDERSCORE.value +
+            CoreParsingKeyword.DASH.value +
+            CoreParsingKeyword.SLASH.value
+        )
+
+        valid_name_comma_seperated_imports = pp.Word(
+            pp.alphanums +
+            CoreParsingKeyword.DOT.value +
+            CoreParsingKeyword.UNDERSCORE.value +
+            CoreParsingKeyword.DASH.value +
+            CoreParsingKeyword.SLASH.value +
+            CoreParsingKeyword.COMMA.value + " "
+        )
 
-        # third global dependency (built-in module) detection attempt
-        for builtin_module in sys.modules:
-            if not builtin_module.startswith('_') and not '.' in builtin_module:
-                global_dependency_autodetect_set.add(builtin_module)
+        import_from_current_dir_expression = pp.Keyword(PythonParsingKeyword.FROM.value) + \
+            pp.Keyword(PythonParsingKeyword.PYTHON_IMPORT_CURRENT_DIR.value) + \
+            pp.Keyword(PythonParsingKeyword.IMPORT.value) + \
+            pp.OneOrMore(valid_name_comma_seperated_imports.setResultsName(CoreParsingKeyword.IMPORT_ENTITY_NAME.value))
 
-        return global_dependency_autodetect_set
+        import_from_parent_dir_expression = pp.Keyword(PythonParsingKeyword.FROM.value) + \
+            pp.Keyword(PythonParsingKeyword.PYTHON_IMPORT_PARENT_DIR.value) + \
+            pp.Keyword(PythonParsingKeyword.IMPORT.value) + \
+            pp.OneOrMore(valid_name_comma_seperated_imports.setResultsName(CoreParsingKeyword.IMPORT_ENTITY_NAME.value))
 
+        import_expression = (pp.Keyword(PythonParsingKeyword.IMPORT.value) | pp.Keyword(PythonParsingKeyword.FROM.value)) + \
+            valid_name.setResultsName(CoreParsingKeyword.IMPORT_ENTITY_NAME.value) + \
+            pp.Optional(pp.FollowedBy(pp.Keyword(PythonParsingKeyword.IMPORT.value)))
+
+        return import_from_current_dir_expression, import_from_parent_dir_expression, import_expression
+
+    def _add_package_name_to_result(self, result: FileResult):
+        result.module_name = ""
+
+    def create_autodetect_set(self) -> Set[str]:
+        """Detects global modules (standard library and installed distributions), that are kept as global imports instead of being resolved to files.
+        """
+        return load_global_module_names()
 
     def dependency_is_global(self, dependency: str, analysis) -> bool:
         assumption = False # assume the dependency is global or not
@@ -6,16 +6,15 @@ This is basically a copy of the JavaScript parser with some nice modifications.
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import Dict
+from typing import Dict, Optional
 from enum import Enum, unique
 import logging
-from pathlib import Path
-import os
 
 import pyparsing as pp
 import coloredlogs
 
 from emerge.languages.abstractparser import AbstractParser, ParsingMixin, Parser, CoreParsingKeyword, LanguageType
+from emerge.languages.moduleresolver import ScannedFileResolver
 from emerge.results import FileResult
 from emerge.abstractresult import AbstractResult, AbstractFileResult, AbstractEntityResult
 from emerge.stats import Statistics
@@ -40,8 +39,11 @@ class TypeScriptParsingKeyword(Enum):
 
 class TypeScriptParser(AbstractParser, ParsingMixin):
 
+    resolves_imports_against_files = True
+
     def __init__(self):
         self._results: Dict[str, AbstractResult] = {}
+        self._resolver: Optional[ScannedFileResolver] = None
         self._token_mappings: Dict[str, str] = {
             ':': ' : ',
             ';': ' ; ',
@@ -104,6 +106,10 @@ class TypeScriptParser(AbstractParser, ParsingMixin):
     def after_generated_file_results(self, analysis) -> None:
         pass
 
+    def add_imports_to_restored_file_result(self, analysis, file_result: AbstractFileResult) -> None:
+        file_result.scanned_import_dependencies = []
+        self._add_imports_to_result(file_result, analysis)
+
     def create_unique_entity_name(self, entity: AbstractEntityResult) -> None:
         raise NotImplementedError(f'currently not implemented in {self.parser_name()}')
 
@@ -170,6 +176,16 @@ class TypeScriptParser(AbstractParser, ParsingMixin):
                 LOGGER.debug(f'adding import: {resolved_dependency} to {result.unique_name}')
 
     def try_resolve_dependency(self, dependency: str, result: AbstractFileResult, analysis) -> str:
+        # the same dependency from the same directory always resolves to the same path, so only resolve it once per analysis
+        self._resolver = ScannedFileResolver.for_analysis(analysis, self._resolver)
+        key = (str(result.absolute_dir_path), dependency)
+        resolved_dependency = self._resolver.resolved_dependencies.get(key)
+        if resolved_dependency is None:
+            resolved_dependency = self._resolve_dependency(dependency, result, analysis, self._resolver)
+            self._resolver.resolved_dependencies[key] = resolved_dependency
+        return resolved_dependency
+
+    def _resolve_dependency(self, dependency: str, result: AbstractFileResult, analysis, resolver: ScannedFileResolver) -> str:
         # check if there are any configured dependency substrings to be replaced directly, e.g. '@scope/sub/path' -> src/sub/path
         if analysis.import_aliases_available:
             renamed_dependency = self.replace_substring_if_any_mapping_key_in_string_exists(dependency, analysis.import_aliases)
@@ -184,15 +200,15 @@ class TypeScriptParser(AbstractParser, ParsingMixin):
             # e.g. '@scope/sub/path' (https://nodejs.org/api/modules.html#modules_all_together, LOAD_PACKAGE_EXPORTS)
             if CoreParsingKeyword.SLASH.value in dependency:
                 subpath = '/'.join(dependency.split('/')[1:])
-                check_package_index_export = f"{analysis.source_directory}/{subpath}/index.ts"
-                check_package_subpath_import = f"{analysis.source_directory}/{subpath}.ts"
+                check_package_index_export = resolver.relative_analysis_path(f"{subpath}/index.ts")
+                check_package_subpath_import = resolver.relative_analysis_path(f"{subpath}.ts")
 
                 # check if there is a package index .ts file
-                if os.path.exists(check_package_index_export):
-                    dependency = self.create_relative_analysis_file_path(analysis.source_directory, check_package_index_export)
+                if resolver.exists(check_package_index_export):
+                    dependency = check_package_index_export
                 # check if the subpath exists as a .ts file
-                if os.path.exists(check_package_subpath_import):
-                    dependency = self.create_relative_analysis_file_path(analysis.source_directory, check_package_subpath_import)
+                if resolver.exists(check_package_subpath_import):
+                    dependency = check_package_subpath_import
 
             # pylint: disable=unnecessary-pass
             pass  # otherwise let the module @-dependency as it is
@@ -205,16 +221,14 @@ class TypeScriptParser(AbstractParser, ParsingMixin):
             dependency = self.create_relative_analysis_path_for_dependency(dependency, str(result.relative_analysis_path))
 
         elif TypeScriptParsingKeyword.PARENT_DIRECTORY.value in dependency:  # contains at lease one relative parent element '..'
-            dependency = self.resolve_relative_dependency_path(dependency, str(result.absolute_dir_path), analysis.source_directory)
+            dependency = resolver.resolve_relative_dependency_path(dependency, str(result.absolute_dir_path))
 
         # verify if the dependency physically exist, then add the remaining suffix
-        check_dependency_path = f"{ Path(analysis.source_directory).parent}/{dependency}.ts"
-        if os.path.exists(check_dependency_path):
+        if resolver.exists(f"{dependency}.ts"):
             dependency = f"{dependency}.ts"
 
         # check if the dependency maybe results from an index.ts import
-        check_dependency_path_for_index_file = f"{ Path(analysis.source_directory).parent}/{dependency}/index.ts"
-        if os.path.exists(check_dependency_path_for_index_file):
+        if resolver.exists(f"{dependency}/index.ts"):
             dependency = f"{dependency}/index.ts"
 
         return dependency
@@ -1,11 +1,11 @@
 """
-Contains the implementation of git metrics, based on results from PyDriller (https://github.com/ishepard/pydriller).
+Contains the implementation of git metrics, based on the commits mined by GitHistoryMiner.
 """
 
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from enum import auto
 import logging
 import os
@@ -13,20 +13,23 @@ import os
 from itertools import combinations
 from pathlib import Path
 
-from pydriller import Repository
-
 import coloredlogs
+import lizard
+import lizard_languages
 
 from emerge.analysis import Analysis
+from emerge.graph import GraphRepresentation, GraphType
 
 # interfaces for inputs
 from emerge.abstractresult import AbstractResult
 from emerge.log import Logger
+from emerge.stats import Statistics
 
 # enums and interface/type of the given metric
 from emerge.metrics.abstractmetric import EnumLowerKebabCase
 from emerge.metrics.metrics import CodeMetric
 from emerge.metrics.whitespace.whitespace import WhitespaceMetric
+from emerge.metrics.git.history import GitHistoryMiner, ModifiedFile
 
 
 LOGGER = Logger(logging.getLogger('metrics'))
@@ -64,6 +67,8 @@ class GitMetrics(CodeMetric):
         
         self.last_number_of_commits_for_calculation = analysis.git_commit_limit
         self.git_exclude_merge_commits = analysis.git_exclude_merge_commits
+        self.git_max_files_per_commit = analysis.git_max_files_per_commit
+        self.git_export_commit_links = analysis.git_export_commit_links
 
     def init(self):
         if self.analysis.source_directory and self.analysis.git_directory:
@@ -81,39 +86,90 @@ class GitMetrics(CodeMetric):
                 self.file_result_prefix_full = "" # self.analysis.source_directory.replace(os.path.dirname(self.analysis.source_directory) + "/", "")
                 pass
 
-    def calculate_from_results(self, results: Dict[str, AbstractResult]):
+    @property
+    def reads_file_contents(self) -> bool:
+        """The whitespace complexity/sloc of changed files needs their contents at every commit,
+        so only read them if whitespace complexity is requested.
+        """
+        return self.analysis.contains_metric_for_file_results(self.ws_complexity_metric.metric_name) or \
+            self.analysis.contains_metric_for_entity_results(self.ws_complexity_metric.metric_name)
+
+    def calculate_from_results(self, results: Dict[str, AbstractResult]) -> None:
         self.init()
-        self._calculate_git_metrics(results)
-        self._setup_commit_dates()
+        miner = GitHistoryMiner.from_analysis(self.analysis)
+        try:
+            self._calculate_git_metrics(results, miner)
+        finally:
+            miner.close()
         self._calculate_local_metric_data(results)
         self._calculate_global_metric_data(results)
 
-    def _setup_commit_dates(self):
-        repository = Repository(self.analysis.git_directory, order='reverse', only_no_merge=self.git_exclude_merge_commits)
-
-        processed_commits = 0
-        for commit in repository.traverse_commits():
-            if processed_commits >= self.last_number_of_commits_for_calculation:
-                break
+    def _setup_commit_date(self, commit):
+        self.number_of_commits += 1
+        self.commit_dates.append(commit.committer_date)
+        self.commit_hashes.append(commit.hash)
+
+        self.latest_commit_date = self.commit_dates[0]
+        self.earliest_commit_date = self.commit_dates[-1]
+
+    @staticmethod
+    def _calculate_source_metrics(filename: str, source: str, ws_complexity_metric: WhitespaceMetric) -> Tuple[float, Optional[int]]:
+        # the sloc of a changed file is the nloc calculated by lizard for all languages lizard supports
+        nloc = None
+        if lizard_languages.get_reader_for(filename) is not None:
+            nloc = lizard.analyze_file.analyze_source_code(filename, source).nloc
+        return ws_complexity_metric.calulate_from_source(source), nloc
+
+    def _source_metrics(self, miner: GitHistoryMiner, file: ModifiedFile) -> Optional[Tuple[float, Optional[int]]]:
+        return miner.source_metrics(file, lambda filename, source: self._calculate_source_metrics(
+            filename, source, self.ws_complexity_metric))
+
+    def git_path(self, result_key: str) -> str:
+        """Returns the path from the git directory of a result key, which is relative to the parent of the source directory,
+        e.g. 'src/foo/bar.py' is 'sub/src/foo/bar.py' if the source directory is 'sub/src' in the git directory.
+        """
+        _, _, path_in_source_directory = result_key.partition('/')
+        if not self.file_result_prefix_full:
+            return path_in_source_directory
+        return f'{self.file_result_prefix_full}/{path_in_source_directory}'
+
+    def create_result_path_index(self, results_keys: List[str]) -> Dict[str, str]:
+        """Indexes result keys by their exact path from the git directory,
+        so that the result of a path from a commit is found by a single lookup.
+        """
+        return {self.git_path(key): key for key in results_keys}
+
+    def _is_relevant(self, file: ModifiedFile, result_path_index: Dict[str, str]) -> bool:
+        """Checks if a modified file has a permitted file extension and is contained in the analysis scan (a deleted file can't be checked).
+        """
+        _, file_extension = os.path.splitext(file.filename)
+        if file_extension not in self.analysis.only_permit_file_extensions:
+            return False
+        if file.new_path is None:
+            return True
+        return file.new_path in result_path_index
+
+    @property
+    def change_coupling_graph(self) -> GraphRepresentation:
+        """The change coupling graph of the analysis,
+        it aggregates co-changes, churn and authors of the file results over all processed commits.
+        """
+        self.analysis.create_graph_representation(GraphType.FILE_RESULT_CHANGE_COUPLING_GRAPH)
+        return self.analysis.graph_representations[GraphType.FILE_RESULT_CHANGE_COUPLING_GRAPH.name.lower()]
+
+    def _calculate_git_metrics(self, results, miner: GitHistoryMiner):
+        result_path_index = self.create_result_path_index(list(results.keys()))
+        reads_file_contents = self.reads_file_contents
+        change_coupling_graph = self.change_coupling_graph
 
-            self.number_of_commits += 1
-            self.commit_dates.append(commit.committer_date)
-            self.commit_hashes.append(commit.hash)
-
-        if self.number_of_commits > 0:
-            self.latest_commit_date = self.commit_dates[0]
-            self.earliest_commit_date = self.commit_dates[-1]
-
-    def _calculate_git_metrics(self, results):
-        results_keys = list(results.keys())
-        repository = Repository(self.analysis.git_directory, order='reverse', only_no_merge=self.git_exclude_merge_commits)
-    
         temporal_edges_found = 0
         processed_commits = 0
-        for commit in repository.traverse_commits():
+        for commit in miner.gen_commits():
             if processed_commits >= self.last_number_of_commits_for_calculation:
                 break
 
+            self._setup_commit_date(commit)
+
             file_array = []
             filepath_array = []
             d3_links_array = []
@@ -121,85 +177,50 @@ class GitMetrics(CodeMetric):
             ws_complexity = {}
             sloc = {}
             author = ""
-            filepath_author_map = {}
 
-            try:
-                if len(commit.modified_files) == 0:
-                    continue
-            except ValueError:
-                LOGGER.info('ignoring git error, keep going...')
+            # only consider commits that include at least one file that is contained in the analysis scan
+            relevant_files = [file for file in commit.modified_files if self._is_relevant(file, result_path_index)]
+            number_of_scanned_files = sum(1 for file in relevant_files if file.new_path is not None)
+
+            # skip pathological commits, every pair of their files would be linked
+            if 0 < self.git_max_files_per_commit < number_of_scanned_files:
+                LOGGER.info(f'skipping commit {commit.hash}, it changes {number_of_scanned_files} scanned files '
+                            f'(git_max_files_per_commit: {self.git_max_files_per_commit})')
+                self.analysis.statistics.increment(Statistics.Key.GIT_SKIPPED_COMMITS)
+                self.analysis.statistics.update(key=Statistics.Key.GIT_SKIPPED_COMMIT_FILES, value=self.analysis.statistics.data.get(
+                    Statistics.Key.GIT_SKIPPED_COMMIT_FILES.name.lower(), 0) + number_of_scanned_files)
                 continue
 
-            for file in commit.modified_files:
-                _, file_extension = os.path.splitext(file.filename)
-                if file_extension in self.analysis.only_permit_file_extensions:
-
-                    # check if the commit is relevant for the metrics, i.e. check if it includes at least one file that is contained in the analysis scan
-                    if file.new_path is not None:
-                        prefixed_file_path = file.new_path.replace(self.file_result_prefix, '').lstrip('/')
-
-                        found = False
-                        for key in results_keys:
-                            if prefixed_file_path in key:
-                                found = True
+            for file in relevant_files:
+                if file.new_path is not None:
+                    file_array.append(file.filename)
+                    filepath_array.append(file.new_path)
 
-                        if not found:
-                            continue
-                       
-                    if file.new_path is not None:
-                        file_array.append(file.filename)
+                # calc code churn per file, assuming it's the sum of all changed lines
+                file_churn[file.new_path] = file.added_lines + file.deleted_lines
 
-                    if file.new_path is not None:
-                        filepath_array.append(file.new_path)                        
+                # if the file has any source code, calc the ws complexity
+                source_metrics = self._source_metrics(miner, file) if reads_file_contents else None
+                if source_metrics is not None:
+                    ws_complexity[file.new_path], sloc[file.new_path] = source_metrics
 
-                    # calc code churn per file, assuming it's the sum of all changed lines
-                    file_churn[file.new_path] = file.added_lines + file.deleted_lines
-
-                    # if the file has any source code, calc the ws complexity
-                    if file.source_code:
-                        ws_complexity[file.new_path] = self.ws_complexity_metric.calulate_from_source(file.source_code)
-                        sloc[file.new_path] = file.nloc
-
-                    if commit.author.email:
-                        author = commit.author.email
-
-                        if file.new_path is not None:
-
-                            if file.new_path in filepath_author_map:
-                                filepath_author_map[file.new_path][author] = file_churn[file.new_path]
-                            else:
-                                filepath_author_map[file.new_path] = {}
-                                filepath_author_map[file.new_path][author] = file_churn[file.new_path]
-                        
-                else:
-                    LOGGER.debug(f'ignoring not allowed file extension: {file_extension} in commit {commit.hash}...')
+                if commit.author_email:
+                    author = commit.author_email
 
             if len(file_array) > 0:
 
-                possible_edges = list(combinations(filepath_array, 2))
-                
-                if len(file_array) > 1:
-                    pass
-
-                for edge in possible_edges:
-                    source = target = ""
-                    prefixed_source_edge = edge[0].replace(self.file_result_prefix, '').lstrip('/')
-                    prefixed_target_edge = edge[-1].replace(self.file_result_prefix, '').lstrip('/')
+                # every file path was found in the results, so every pair of them is a temporal edge
+                result_keys = [result_path_index[x] for x in filepath_array]
+                temporal_edges_found += len(result_keys) * (len(result_keys) - 1) // 2
+                if self.git_export_commit_links:
+                    for source, target in combinations(result_keys, 2):
+                        d3_links_array.append({"source" : source, "target" : target, "temporal": True})
 
-                    source_edge_in_results = any(prefixed_source_edge in x for x in results_keys)
-                    target_edge_in_results = any(prefixed_target_edge in x for x in results_keys)
-
-                    if source_edge_in_results:
-                        source = prefixed_source_edge
-                    if target_edge_in_results:
-                        target = prefixed_target_edge
-
-                    if source and target:
-                        link = {"source" : source, "target" : target, "temporal": True}
-                        d3_links_array.append(link)
-                        temporal_edges_found += 1
-                        source = target = ""
-                        # LOGGER.info(f'temporal edge found: {link}')
+                # aggregate the commit into the change coupling graph, whose nodes are the file results
+                churn_by_result: Dict[str, int] = {}
+                for result_key, filepath in zip(result_keys, filepath_array):
+                    churn_by_result[result_key] = churn_by_result.get(result_key, 0) + file_churn[filepath]
+                change_coupling_graph.add_commit_to_change_coupling_graph(churn_by_result, author)
 
                 change_result = {
                     "hash": commit.hash,
@@ -207,23 +228,25 @@ class GitMetrics(CodeMetric):
                     "exact_date": commit.committer_date.strftime('%Y-%m-%dT%H:%M:%S.%f%z'),
                     "files": file_array,
                     "filepaths": filepath_array,
-                    "links": d3_links_array,
                     "churn": file_churn,
                     "ws_complexity": ws_complexity,
                     "sloc": sloc,
                     "author": author,
-                    "files_author_map": filepath_author_map,
                     "file_result_prefix": self.file_result_prefix,
                     "file_result_prefix_full": self.file_result_prefix_full
                 }
 
+                # the change coupling graph aggregates the links of all commits, only export them per commit if requested
+                if self.git_export_commit_links:
+                    change_result["links"] = d3_links_array
+
                 self.change_results.append(change_result)
 
                 # only count relevant/ non-empty commits
                 processed_commits = processed_commits + 1
-        
+
         self.change_results.reverse()
-        # LOGGER.info(f'temporal edges found: {temporal_edges_found}')
+        LOGGER.debug(f'temporal edges found: {temporal_edges_found}')
 
     def _calculate_local_metric_data(self, results: Dict[str, AbstractResult]):
         pass
@@ -0,0 +1,298 @@
+"""
+Contains a git history miner, that reads the commits of a repository with git plumbing commands (rev-list, log --raw --numstat, cat-file)
+in a single traversal and caches every mined commit on disk by its hash.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+
+import os
+import pickle
+import hashlib
+import sqlite3
+import subprocess
+import logging
+import coloredlogs
+
+from emerge.cache import DiskCache
+from emerge.stats import Statistics
+from emerge.log import Logger
+
+LOGGER = Logger(logging.getLogger('metrics'))
+coloredlogs.install(level='E', logger=LOGGER.logger(), fmt=Logger.log_format)
+
+# bump this whenever the layout of cached commits/blobs or the mining behaviour changes in an incompatible way
+GIT_HISTORY_CACHE_FORMAT_VERSION = '1'
+
+GIT_HISTORY_CACHE_FILE_NAME = 'git-history-cache.sqlite3'
+
+# number of commit hashes that are mined with a single git log call
+GIT_LOG_BATCH_SIZE = 128
+
+COMMIT_MARKER = 'commit'
+NULL_BLOB_ID = '0' * 40
+SUBMODULE_MODE = '160000'
+
+
+class ModifiedFile(NamedTuple):
+    """A file changed by a commit, with the same meaning of paths and line counts as in PyDriller, i.e. old_path is None for an added file,
+    new_path is None for a deleted file and the line counts of a binary file are 0.
+    """
+    old_path: Optional[str]
+    new_path: Optional[str]
+    added_lines: int
+    deleted_lines: int
+    blob_id: Optional[str]
+
+    @property
+    def filename(self) -> str:
+        return Path(self.new_path if self.new_path is not None else self.old_path).name
+
+
+class MinedCommit(NamedTuple):
+    hash: str
+    parents: Tuple[str, ...]
+    author_email: str
+    committer_date: datetime
+    modified_files: List[ModifiedFile]
+
+
+class GitHistoryMiner:
+    """Mines the history of a git repository from the newest to the oldest commit (like git log), without creating any diff patches.
+    Every mined commit is stored in an optional disk cache by its hash,
+    so that a later analysis of the same repository only has to mine new commits.
+    The contents of changed files are only read on request with source_metrics and are cached by their blob id.
+    """
+
+    def __init__(self, git_directory: str, exclude_merge_commits: bool, statistics: Statistics, cache: Optional[DiskCache] = None):
+        self.git_directory = git_directory
+        self.exclude_merge_commits = exclude_merge_commits
+        self._statistics = statistics
+        self._cache = cache
+        self._cat_file_process: Optional[subprocess.Popen] = None
+
+    @classmethod
+    def from_analysis(cls, analysis) -> 'GitHistoryMiner':
+        """Returns a miner for the git directory of the given analysis,
+        that caches mined commits next to the parse cache if one is configured.
+        """
+        cache = None
+        if analysis.parse_cache_directory:
+            try:
+                os.makedirs(analysis.parse_cache_directory, exist_ok=True)
+                cache = DiskCache(os.path.join(analysis.parse_cache_directory, GIT_HISTORY_CACHE_FILE_NAME),
+                                  analysis.parse_cache_max_size * 1024 * 1024)
+            except (OSError, sqlite3.Error) as ex:
+                LOGGER.warning(f'could not open git history cache in {analysis.parse_cache_directory}, continuing without: {ex}')
+        return cls(analysis.git_directory, analysis.git_exclude_merge_commits, analysis.statistics, cache)
+
+    def gen_commits(self) -> Iterator[MinedCommit]:
+        """Yields all commits reachable from HEAD, from the newest to the oldest one. Commits are mined lazily in batches,
+        so that nothing beyond the last consumed batch is mined if the caller stops early.
+        """
+        for hashes in self._gen_commit_hash_batches():
+            mined_commits: Dict[str, MinedCommit] = {}
+
+            missing_hashes = []
+            for commit_hash in hashes:
+                cached_commit = self._load_cached(self._commit_key(commit_hash))
+                if cached_commit is None:
+                    missing_hashes.append(commit_hash)
+                else:
+                    mined_commits[commit_hash] = self._restore_commit(cached_commit)
+
+            if missing_hashes:
+                for commit in self._mine_commits(missing_hashes):
+                    mined_commits[commit.hash] = commit
+                    if self._cache is not None:
+                        payload = pickle.dumps(self._payload_of(commit), protocol=pickle.HIGHEST_PROTOCOL)
+                        self._cache.put(self._commit_key(commit.hash), payload)
+
+            self._statistics.update(key=Statistics.Key.GIT_COMMITS_MINED,
+                                    value=self._statistics.data.get(Statistics.Key.GIT_COMMITS_MINED.name.lower(), 0) + len(missing_hashes))
+            cache_hits = len(hashes) - len(missing_hashes)
+            self._statistics.update(key=Statistics.Key.GIT_HISTORY_CACHE_HITS,
+                                    value=self._statistics.data.get(Statistics.Key.GIT_HISTORY_CACHE_HITS.name.lower(), 0) + cache_hits)
+
+            for commit_hash in hashes:
+                yield mined_commits[commit_hash]
+
+    def source_metrics(self, modified_file: ModifiedFile, calculate: Callable[[str, str], Tuple]) -> Optional[Tuple]:
+        """Returns calculate(filename, source) for the new content of a modified file, or None if the file was deleted or has no content.
+        The calculated values are cached by the blob id and the filename, since both completely determine them.
+        """
+        if modified_file.new_path is None or modified_file.blob_id is None:
+            return None
+
+        key = self._blob_key(modified_file.blob_id, modified_file.filename)
+        cached_metrics = self._load_cached(key)
+        if cached_metrics is not None:
+            return cached_metrics['metrics']
+
+        content = self._read_blob(modified_file.blob_id)
+        metrics = calculate(modified_file.filename, content.decode('utf-8', 'ignore')) if content else None
+        if self._cache is not None:
+            self._cache.put(key, pickle.dumps({'metrics': metrics}, protocol=pickle.HIGHEST_PROTOCOL))
+        return metrics
+
+    def close(self) -> None:
+        """Stops the cat-file process and commits all mined commits to the cache.
+        """
+        if self._cat_file_process is not None:
+            self._cat_file_process.stdin.close()
+            self._cat_file_process.wait()
+            self._cat_file_process = None
+
+        if self._cache is not None:
+            self._cache.commit()
+            self._cache.close()
+            self._cache = None
+
+    def _git(self, *args: str) -> List[str]:
+        return ['git', '-C', self.git_directory, *args]
+
+    def _gen_commit_hash_batches(self) -> Iterator[List[str]]:
+        rev_list_args = ['rev-list', '--no-merges', 'HEAD'] if self.exclude_merge_commits else ['rev-list', 'HEAD']
+        with subprocess.Popen(self._git(*rev_list_args), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True) as process:
+            listed_all_hashes = False
+            try:
+                hashes: List[str] = []
+                for line in process.stdout:
+                    hashes.append(line.strip())
+                    if len(hashes) == GIT_LOG_BATCH_SIZE:
+                        yield hashes
+                        hashes = []
+                if hashes:
+                    yield hashes
+                listed_all_hashes = True
+            finally:
+                # the caller may stop early, so don't wait for the rest of the history
+                if not listed_all_hashes:
+                    process.kill()
+                process.wait()
+
+            if process.returncode != 0:
+                error = process.stderr.read()
+                # a repository without any commit has no history at all
+                if 'HEAD' in error:
+                    LOGGER.info(f'no commits found in {self.git_directory}')
+                    return
+                # pylint: disable=broad-exception-raised
+                raise Exception(f'❗️ could not read the git history of {self.git_directory}: {error.strip()}')
+
+    def _mine_commits(self, hashes: List[str]) -> List[MinedCommit]:
+        """Mines the given commits with a single git log call,
+        that lists the raw changes (status, paths, blob ids) and the numstat line counts of every commit,
+        separated by NUL characters so that any path can be parsed without unquoting.
+        """
+        log_args = ['log', '--no-walk=unsorted', '--stdin', '-z', '--raw', '--numstat', '-M', '--no-abbrev', '--root', '--no-color',
+                    '--no-ext-diff', '--no-show-signature', f'--format={COMMIT_MARKER}%x00%H%x00%P%x00%ae%x00%cI%x00']
+        completed_process = subprocess.run(self._git(*log_args), input='\n'.join(hashes) + '\n', capture_output=True, check=False,
+                                           encoding='utf-8', errors='replace')
+        if completed_process.returncode != 0:
+            # pylint: disable=broad-exception-raised
+            raise Exception(f'❗️ could not read the git history of {self.git_directory}: {completed_process.stderr.strip()}')
+        return self.parse_log_output(completed_process.stdout)
+
+    @staticmethod
+    def parse_log_output(output: str) -> List[MinedCommit]:
+        commits: List[MinedCommit] = []
+        tokens = output.split('\0')
+        numstat_index = 0
+
+        index = 0
+        while index < len(tokens):
+            token = tokens[index].lstrip('\n')
+            index += 1
+
+            if token == COMMIT_MARKER:
+                commit_hash, parents, author_email, committer_date = tokens[index:index + 4]
+                index += 4
+                commits.append(MinedCommit(commit_hash, tuple(parents.split()), author_email, datetime.fromisoformat(committer_date), []))
+                numstat_index = 0
+
+            # raw change, e.g. ':100644 100644 <old blob id> <new blob id> M' followed by the path (or old and new path for renames/copies)
+            elif token.startswith(':'):
+                _, new_mode, _, new_blob_id, status = token[1:].split(' ')
+                if status[0] in 'RC':
+                    old_path, new_path = tokens[index:index + 2]
+                    index += 2
+                else:
+                    old_path = new_path = tokens[index]
+                    index += 1
+                    if status[0] == 'A':
+                        old_path = None
+                    elif status[0] == 'D':
+                        new_path = None
+
+                blob_id = new_blob_id if new_blob_id != NULL_BLOB_ID and new_mode != SUBMODULE_MODE else None
+                commits[-1].modified_files.append(ModifiedFile(old_path, new_path, 0, 0, blob_id))
+
+            # numstat of the raw change at the same position, e.g. '3\t1\tpath'
+            # ('-' for binary files, an empty path is followed by the old and new path)
+            elif '\t' in token:
+                added_lines, deleted_lines, path = token.split('\t', 2)
+                if not path:
+                    index += 2
+                modified_file = commits[-1].modified_files[numstat_index]
+                commits[-1].modified_files[numstat_index] = modified_file._replace(
+                    added_lines=int(added_lines) if added_lines != '-' else 0,
+                    deleted_lines=int(deleted_lines) if deleted_lines != '-' else 0)
+                numstat_index += 1
+
+        return commits
+
+    def _read_blob(self, blob_id: str) -> bytes:
+        if self._cat_file_process is None:
+            self._cat_file_process = subprocess.Popen(self._git('cat-file', '--batch'), stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+        self._cat_file_process.stdin.write(f'{blob_id}\n'.encode('ascii'))
+        self._cat_file_process.stdin.flush()
+
+        # '<blob id> blob <size>' or '<blob id> missing'
+        header = self._cat_file_process.stdout.readline().split()
+        if len(header) != 3:
+            return b''
+        content = self._cat_file_process.stdout.read(int(header[2]))
+        self._cat_file_process.stdout.read(1)
+        return content
+
+    def _load_cached(self, key: str) -> Optional[Dict]:
+        if self._cache is None:
+            return None
+        value = self._cache.get(key)
+        if value is None:
+            return None
+        try:
+            return pickle.loads(value)
+        except Exception as ex:  # pylint: disable=broad-except
+            LOGGER.warning(f'ignoring unreadable git history cache entry: {ex}')
+            return None
+
+    @staticmethod
+    def _commit_key(commit_hash: str) -> str:
+        return hashlib.sha256('\0'.join([GIT_HISTORY_CACHE_FORMAT_VERSION, 'commit', commit_hash]).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _blob_key(blob_id: str, filename: str) -> str:
+        key = '\0'.join([GIT_HISTORY_CACHE_FORMAT_VERSION, 'blob', blob_id, filename])
+        return hashlib.sha256(key.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    @staticmethod
+    def _payload_of(commit: MinedCommit) -> Dict:
+        return {
+            'hash': commit.hash,
+            'parents': commit.parents,
+            'author_email': commit.author_email,
+            'committer_date': commit.committer_date.isoformat(),
+            'modified_files': [tuple(x) for x in commit.modified_files]
+        }
+
+    @staticmethod
+    def _restore_commit(payload: Dict) -> MinedCommit:
+        return MinedCommit(payload['hash'], tuple(payload['parents']), payload['author_email'],
+                           datetime.fromisoformat(payload['committer_date']), [ModifiedFile(*x) for x in payload['modified_files']])
@@ -5,7 +5,11 @@ Defines concrete metrics based on the abstract interfaces to share/hide common c
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from abc import abstractmethod
+
+import time
 
 # interfaces for inputs
 from emerge.abstractresult import AbstractResult
@@ -128,5 +132,126 @@ class CodeMetric(AbstractCodeMetric):
     def overall_data(self) -> Dict[str, Any]:
         return self._overall_data
 
+    @staticmethod
+    def cached_metric_value(result: AbstractResult, metric_key: str) -> Optional[Any]:
+        """Returns a metric value that was restored from the parse cache for the given result, otherwise None."""
+        cached_metrics = getattr(result, 'cached_metrics', None)
+        if cached_metrics:
+            return cached_metrics.get(metric_key)
+        return None
+
+
+class VisitorCodeMetric(CodeMetric):
+    """A code metric that is calculated by visiting every result once and can therefore share a pass over all results with other visitors,
+    see CodeMetricPass. Code metrics that don't calculate anything per result derive from CodeMetric and implement calculate_from_results instead.
+    """
+
     def calculate_from_results(self, results: Dict[str, AbstractResult]):
-        ...
+        for _, result in results.items():
+            self.visit_result(result, ResultView(result))
+        self.finish_visiting(results)
+
+    @abstractmethod
+    def visit_result(self, result: AbstractResult, view: 'ResultView') -> None:
+        """Calculates the metric for a single result, the view provides the shared intermediate representations of the result."""
+
+    def finish_visiting(self, results: Dict[str, AbstractResult]) -> None:
+        """Calculates everything that needs all visited results, e.g. overall metric data."""
+
+
+class ResultView:
+    """Intermediate representations of a result that are shared by all code metrics visiting it.
+    Every representation is only created on first access, so metrics that are restored from the parse cache do not create any of them.
+    """
+
+    def __init__(self, result: AbstractResult):
+        self._result = result
+        self._tokens: Optional[List[str]] = None
+        self._joined_tokens: Optional[str] = None
+        self._token_lines: Optional[List[str]] = None
+        self._source_lines: Optional[List[str]] = None
+        self._code_lines: Dict[Tuple[str, str, str], List[str]] = {}
+
+    @property
+    def tokens(self) -> List[str]:
+        if self._tokens is None:
+            self._tokens = list(self._result.scanned_tokens)
+        return self._tokens
+
+    @property
+    def joined_tokens(self) -> str:
+        """All scanned tokens joined by a single space."""
+        if self._joined_tokens is None:
+            self._joined_tokens = " ".join(self.tokens)
+        return self._joined_tokens
+
+    @property
+    def token_lines(self) -> List[str]:
+        """The lines of the joined tokens."""
+        if self._token_lines is None:
+            self._token_lines = self.joined_tokens.splitlines()
+        return self._token_lines
+
+    @property
+    def source_lines(self) -> List[str]:
+        """The lines of the original source, split by newline characters."""
+        if self._source_lines is None:
+            self._source_lines = self._result.source.split("\n")
+        return self._source_lines
+
+    def code_lines(self, line_comment: str, start_block_comment: str, stop_block_comment: str) -> List[str]:
+        """The non-empty token lines that are neither line comments nor part of a block comment."""
+        comment_keywords = (line_comment, start_block_comment, stop_block_comment)
+        if comment_keywords not in self._code_lines:
+            code_lines = []
+            active_block_comment = False
+
+            for line in self.token_lines:
+                # starting a block comment
+                if start_block_comment in line and stop_block_comment not in line:
+                    active_block_comment = True
+                    continue
+                # stopping a block comment
+                if start_block_comment not in line and stop_block_comment in line:
+                    active_block_comment = False
+                    continue
+                # one line block comment
+                if start_block_comment in line and stop_block_comment in line:
+                    continue
+                # regular line comment
+                if line.strip().startswith(line_comment):
+                    continue
+
+                if not active_block_comment and line.strip():
+                    code_lines.append(line)
+
+            self._code_lines[comment_keywords] = code_lines
+        return self._code_lines[comment_keywords]
+
+
+class CodeMetricPass:
+    """Calculates several code metrics with a single pass over all results.
+    Every result is visited once and all visitor code metrics are fed from the same ResultView, other code metrics are calculated on their own.
+    """
+
+    def __init__(self, metrics: List[AbstractCodeMetric]):
+        self.metrics = metrics
+        self.runtimes: Dict[AbstractCodeMetric, float] = {metric: 0.0 for metric in metrics}
+
+    def calculate_from_results(self, results: Dict[str, AbstractResult]) -> None:
+        visitors = [metric for metric in self.metrics if isinstance(metric, VisitorCodeMetric)]
+
+        for _, result in results.items():
+            view = ResultView(result)
+            for metric in visitors:
+                start = time.perf_counter()
+                metric.visit_result(result, view)
+                self.runtimes[metric] += time.perf_counter() - start
+
+        for metric in self.metrics:
+            start = time.perf_counter()
+            if isinstance(metric, VisitorCodeMetric):
+                metric.finish_visiting(results)
+            else:
+                metric.calculate_from_results(results)
+            self.runtimes[metric] += time.perf_counter() - start
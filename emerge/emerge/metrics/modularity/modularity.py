@@ -5,27 +5,47 @@ Contains an implementation of the louvain modularity graph metric.
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from enum import auto
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import logging
 import coloredlogs
 
 from networkx import DiGraph
-import community as community_louvain
 
 from emerge.abstractresult import AbstractResult
 from emerge.results import FileResult, EntityResult
 from emerge.log import Logger
 from emerge.graph import GraphRepresentation, GraphType
+from emerge.core import resolve_worker_count
 
 # enums and superclass of the given metric
 from emerge.metrics.abstractmetric import EnumLowerKebabCase
 from emerge.metrics.metrics import GraphMetric
+from emerge.metrics.modularity.communities import CommunityDetectionBackend, create_community_detection_backend
 
 
 LOGGER = Logger(logging.getLogger('metrics'))
 coloredlogs.install(level='E', logger=LOGGER.logger(), fmt=Logger.log_format)
 
+LOUVAIN_WORKERS_ENVIRONMENT_VARIABLE = 'EMERGE_LOUVAIN_WORKERS'
+
+# community detection backend of a worker process, set up once by _initialize_louvain_worker
+_worker_backend: Any = None
+
+
+def _initialize_louvain_worker(backend: CommunityDetectionBackend) -> None:
+    """Keeps the community detection backend (and its graph) once per worker process,
+    so that only the seeds of the optimization runs are sent to the workers.
+    """
+    global _worker_backend  # pylint: disable=global-statement
+    _worker_backend = backend
+
+
+def _partition_in_worker(seed: int) -> Tuple[Dict[Any, int], float]:
+    return _worker_backend.partition(seed)
+
 
 class LouvainModularityMetric(GraphMetric):
 
@@ -53,8 +73,21 @@ class LouvainModularityMetric(GraphMetric):
     def calculate_from_results(self, results: Dict[str, AbstractResult]):
         self._calculate_metric_data(results)
 
+    def _run_optimizations(self, backend: CommunityDetectionBackend, seeds: List[int]) -> List[Tuple[Dict[Any, int], float]]:
+        """Does one optimization run of the community detection backend per seed, in parallel worker processes if configured.
+        The runs are returned in the order of their seeds.
+        """
+        workers = min(resolve_worker_count(self.analysis.louvain_workers, LOUVAIN_WORKERS_ENVIRONMENT_VARIABLE), len(seeds))
+        if workers <= 1:
+            return [backend.partition(seed) for seed in seeds]
+
+        LOGGER.debug(f'running {len(seeds)} optimizations of the {self.analysis.louvain_backend} backend with {workers} worker processes')
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_louvain_worker, initargs=(backend,)) as executor:
+            return list(executor.map(_partition_in_worker, seeds))
+
     def _calculate_metric_data(self, results: Dict[str, AbstractResult]):
-        instances = [x for x in [self.dependency_graph_representation, self.inheritance_graph_representation, self.complete_graph_representation] if x]
+        instances = [x for x in [self.dependency_graph_representation, self.inheritance_graph_representation,
+                                 self.complete_graph_representation] if x]
         graph_instance: GraphRepresentation
 
         for graph_instance in instances:
@@ -68,47 +101,40 @@ class LouvainModularityMetric(GraphMetric):
                 sum_communities_found, sum_modularity = 0, 0.0
                 sum_biggest_five_community_distribution = {0: 0, 1: 0, 2: 0, 3: 0, 4: 0}
 
-                for run in range(optimization_runs):
+                # every run has its own explicit seed, so the runs can be done in any order/ process and still give reproducible results
+                seeds = [self.analysis.louvain_seed + run for run in range(optimization_runs)]
+                backend = create_community_detection_backend(self.analysis.louvain_backend, undirected_graph)
+                optimization_results = self._run_optimizations(backend, seeds)
 
-                    partition_by_louvain = community_louvain.best_partition(undirected_graph, resolution=1.5)
+                for run, (partition_by_louvain, modularity) in enumerate(optimization_results):
 
                     communities_found = max(partition_by_louvain.values()) + 1
-                    modularity = community_louvain.modularity(partition_by_louvain, undirected_graph)
 
                     sum_communities_found += communities_found
                     sum_modularity += modularity
 
-                    # sort by community size
-                    community_sizes = {}
-                    for i in range(communities_found):
-                        community_sizes[i] = sum(map((i).__eq__, partition_by_louvain.values()))
+                    # sort by community size, equally sized communities by their id
+                    community_sizes = Counter(partition_by_louvain.values())
+                    sorted_community_sizes = sorted(community_sizes.items(), key=lambda item: (-item[1], item[0]))
 
-                    sorted_community_sizes = {k: v for k, v in sorted(community_sizes.items(), key=lambda item: item[1], reverse=True)}
-                    biggest_five_communities = {k: sorted_community_sizes[k] for k in list(sorted_community_sizes)[:5]}
-
-                    order = 0
-                    for _, size in biggest_five_communities.items():
+                    for order, (_, size) in enumerate(sorted_community_sizes[:5]):
                         sum_biggest_five_community_distribution[order] += size
-                        order += 1
 
                     # fetch community ids in the last iteration and write metric data
                     if run == optimization_runs - 1:
 
                         # renumber key/value mappings so that increasing louvain community ids are sorted with descreasing partition sizes
-                        sorted_partion_by_louvain = {}
-
                         # this adds more stability to the non-deterministic partition if e.g. coloring by a fixed input set of colors
-                        new_community_id = 0
-                        for sorted_community_id in sorted_community_sizes.keys():
-                            new_partition = {k: new_community_id for k, v in partition_by_louvain.items() if v == sorted_community_id}
-                            sorted_partion_by_louvain.update(new_partition)
-                            new_community_id += 1
+                        new_community_ids = {community_id: new_community_id
+                                             for new_community_id, (community_id, _) in enumerate(sorted_community_sizes)}
+                        sorted_partion_by_louvain = {node_name: new_community_ids[community_id] for node_name, community_id in sorted(
+                            partition_by_louvain.items(), key=lambda item: new_community_ids[item[1]])}
 
                         for node_name, _ in sorted_partion_by_louvain.items():
                             if node_name in results:
                                 result = results[node_name]
 
-                                if isinstance(result, FileResult):    
+                                if isinstance(result, FileResult):
                                     key = (graph_type_name + '_' + self.Keys.LOUVAIN_MODULARITY_IN_FILE.value).lower()
                                     result.metrics[key] = sorted_partion_by_louvain[node_name]
                                     local_data_graph_type_modularity = {}
@@ -20,14 +20,14 @@ from emerge.log import Logger
 
 # enums and interface/type of the given metric
 from emerge.metrics.abstractmetric import EnumLowerKebabCase
-from emerge.metrics.metrics import CodeMetric
+from emerge.metrics.metrics import VisitorCodeMetric, ResultView
 
 
 LOGGER = Logger(logging.getLogger('metrics'))
 coloredlogs.install(level='E', logger=LOGGER.logger(), fmt=Logger.log_format)
 
 
-class NumberOfMethodsMetric(CodeMetric):
+class NumberOfMethodsMetric(VisitorCodeMetric):
 
     class Keys(EnumLowerKebabCase):
         NUMBER_OF_METHODS_IN_ENTITY = auto()
@@ -56,33 +56,30 @@ class NumberOfMethodsMetric(CodeMetric):
         self.compiled_re: Dict[str, Pattern] = {}
         self._compile()
 
-    def calculate_from_results(self, results: Dict[str, AbstractResult]):
-        self._calculate_local_metric_data(results)
-        self._calculate_global_metric_data(results)
-
     def _compile(self):
         for name, pattern in self.regex_patters.items():
             self.compiled_re[name] = re.compile(pattern)
 
-    def _calculate_local_metric_data(self, results: Dict[str, AbstractResult]):
-        for _, result in results.items():
-            LOGGER.debug(f'calculating metric {self.pretty_metric_name} for result {result.unique_name}')
-
+    def visit_result(self, result: AbstractResult, view: ResultView) -> None:
+        LOGGER.debug(f'calculating metric {self.pretty_metric_name} for result {result.unique_name}')
+        number_of_methods = self.cached_metric_value(result, self.Keys.NUMBER_OF_METHODS_IN_FILE.value)
+        if number_of_methods is None:
             find_method_expression = self.__get_expression(result)
-
             LOGGER.debug(f'extracting methods from result {result.scanned_file_name}')
-            full_string = " ".join(result.scanned_tokens)
-            number_of_methods = len(find_method_expression.findall(full_string))
+            number_of_methods = len(find_method_expression.findall(view.joined_tokens))
+
+        if isinstance(result, AbstractFileResult):
+            result.metrics[self.Keys.NUMBER_OF_METHODS_IN_FILE.value] = number_of_methods
+            self.local_data[result.unique_name] = {self.Keys.NUMBER_OF_METHODS_IN_FILE.value: number_of_methods}
 
-            if isinstance(result, AbstractFileResult):
-                result.metrics[self.Keys.NUMBER_OF_METHODS_IN_FILE.value] = number_of_methods
-                self.local_data[result.unique_name] = {self.Keys.NUMBER_OF_METHODS_IN_FILE.value: number_of_methods}
+        if isinstance(result, AbstractEntityResult):
+            result.metrics[self.Keys.NUMBER_OF_METHODS_IN_ENTITY.value] = number_of_methods
+            self.local_data[result.unique_name] = {self.Keys.NUMBER_OF_METHODS_IN_ENTITY.value: number_of_methods}
 
-            if isinstance(result, AbstractEntityResult):
-                result.metrics[self.Keys.NUMBER_OF_METHODS_IN_ENTITY.value] = number_of_methods
-                self.local_data[result.unique_name] = {self.Keys.NUMBER_OF_METHODS_IN_ENTITY.value: number_of_methods}
+        LOGGER.debug(f'calculation done, updated metric data of {result.unique_name}: {result.metrics=}')
 
-            LOGGER.debug(f'calculation done, updated metric data of {result.unique_name}: {result.metrics=}')
+    def finish_visiting(self, results: Dict[str, AbstractResult]) -> None:
+        self._calculate_global_metric_data(results)
 
     def _calculate_global_metric_data(self, results: Dict[str, AbstractResult]):
         LOGGER.debug(f'calculating average method count {self.metric_name}...')
@@ -5,7 +5,7 @@ Contains the implementation of the source lines of code metric.
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import List, Dict
+from typing import Dict
 from enum import Enum, auto
 import logging
 
@@ -20,7 +20,7 @@ from emerge.log import Logger
 
 # enums and interface/type of the given metric
 from emerge.metrics.abstractmetric import EnumLowerKebabCase
-from emerge.metrics.metrics import CodeMetric
+from emerge.metrics.metrics import VisitorCodeMetric, ResultView
 
 
 LOGGER = Logger(logging.getLogger('metrics'))
@@ -48,7 +48,7 @@ class SLOCCommentType(Enum):
     GO = {CommentKeyword.LINE_COMMENT.name: "//", CommentKeyword.START_BLOCK_COMMENT.name: "/*", CommentKeyword.STOP_BLOCK_COMMENT.name: "*/"}
 
 
-class SourceLinesOfCodeMetric(CodeMetric):
+class SourceLinesOfCodeMetric(VisitorCodeMetric):
 
     class Keys(EnumLowerKebabCase):
         SLOC_IN_ENTITY = auto()
@@ -61,28 +61,27 @@ class SourceLinesOfCodeMetric(CodeMetric):
     # def __init__(self, analysis: Analysis):
     #     super().__init__(analysis)
 
-    def calculate_from_results(self, results: Dict[str, AbstractResult]):
-        self._calculate_local_metric_data(results)
-        self._calculate_global_metric_data(results)
-
-    def _calculate_local_metric_data(self, results: Dict[str, AbstractResult]):
-        for _, result in results.items():
-            LOGGER.debug(f'calculating metric {self.pretty_metric_name} for result {result.unique_name}')
+    def visit_result(self, result: AbstractResult, view: ResultView) -> None:
+        LOGGER.debug(f'calculating metric {self.pretty_metric_name} for result {result.unique_name}')
+        sloc = self.cached_metric_value(result, self.Keys.SLOC_IN_FILE.value)
+        if sloc is None:
             comment_types = self.__get_comment_types(result)
-            sloc = self._count_sloc(result.scanned_tokens,
-                                    comment_types[CommentKeyword.LINE_COMMENT.name],
-                                    comment_types[CommentKeyword.START_BLOCK_COMMENT.name],
-                                    comment_types[CommentKeyword.STOP_BLOCK_COMMENT.name])
+            sloc = len(view.code_lines(comment_types[CommentKeyword.LINE_COMMENT.name],
+                                       comment_types[CommentKeyword.START_BLOCK_COMMENT.name],
+                                       comment_types[CommentKeyword.STOP_BLOCK_COMMENT.name]))
 
-            if isinstance(result, AbstractFileResult):
-                result.metrics[self.Keys.SLOC_IN_FILE.value] = sloc
-                self.local_data[result.unique_name] = {self.Keys.SLOC_IN_FILE.value: sloc}
+        if isinstance(result, AbstractFileResult):
+            result.metrics[self.Keys.SLOC_IN_FILE.value] = sloc
+            self.local_data[result.unique_name] = {self.Keys.SLOC_IN_FILE.value: sloc}
 
-            if isinstance(result, AbstractEntityResult):
-                result.metrics[self.Keys.SLOC_IN_ENTITY.value] = sloc
-                self.local_data[result.unique_name] = {self.Keys.SLOC_IN_ENTITY.value: sloc}
+        if isinstance(result, AbstractEntityResult):
+            result.metrics[self.Keys.SLOC_IN_ENTITY.value] = sloc
+            self.local_data[result.unique_name] = {self.Keys.SLOC_IN_ENTITY.value: sloc}
 
-            LOGGER.debug(f'calculation done, updated metric data of {result.unique_name}: {result.metrics=}')
+        LOGGER.debug(f'calculation done, updated metric data of {result.unique_name}: {result.metrics=}')
+
+    def finish_visiting(self, results: Dict[str, AbstractResult]) -> None:
+        self._calculate_global_metric_data(results)
 
     def _calculate_global_metric_data(self, results: Dict[str, AbstractResult]):
         entity_results = {k: v for (k, v) in results.items() if isinstance(v, AbstractEntityResult)}
@@ -110,33 +109,6 @@ class SourceLinesOfCodeMetric(CodeMetric):
             self.overall_data[self.Keys.TOTAL_SLOC_IN_ENTITIES.value] = total_sloc_count
             LOGGER.debug(f'average sloc per entity: {total_sloc_count}/{average_sloc_in_entity}')
 
-    def _count_sloc(self, list_of_tokens: List[str], line_comment: str, start_block_comment: str, stop_block_comment: str) -> int:
-        source = " ".join(list_of_tokens)
-        source_lines = source.splitlines()
-        source_lines_without_comments = []
-        active_block_comment = False
-
-        for line in source_lines:
-            # starting a block comment
-            if start_block_comment in line and stop_block_comment not in line:
-                active_block_comment = True
-                continue
-            # stopping a block comment
-            if start_block_comment not in line and stop_block_comment in line:
-                active_block_comment = False
-                continue
-            # one line block comment
-            if start_block_comment in line and stop_block_comment in line:
-                continue
-            # regular line comment
-            if line.strip().startswith(line_comment):
-                continue
-
-            if not active_block_comment and line.strip():
-                source_lines_without_comments.append(line)
-
-        return len(source_lines_without_comments)
-
     def __get_comment_types(self, result: AbstractResult):
         if result.scanned_language == LanguageType.C:
             return SLOCCommentType.C.value
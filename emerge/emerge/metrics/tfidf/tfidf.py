@@ -9,6 +9,7 @@ from typing import Dict, Any
 
 import logging
 import coloredlogs
+import numpy as np
 from sklearn.exceptions import NotFittedError
 
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -19,12 +20,12 @@ from emerge.abstractresult import AbstractResult
 from emerge.log import Logger
 
 # enums and interface/type of the given metric
-from emerge.metrics.metrics import CodeMetric
+from emerge.metrics.metrics import VisitorCodeMetric, ResultView
 
 LOGGER = Logger(logging.getLogger('metrics'))
 coloredlogs.install(level='E', logger=LOGGER.logger(), fmt=Logger.log_format)
 
-class TFIDFMetric(CodeMetric):
+class TFIDFMetric(VisitorCodeMetric):
     """Provides a metric based on TF-IDF to extract semantic keywords from source code."""
 
     def __init__(self, analysis: Analysis):
@@ -57,23 +58,24 @@ class TFIDFMetric(CodeMetric):
     def pretty_metric_name(self) -> str:
         return 'tfidf metric'
 
-    def calculate_from_results(self, results: Dict[str, AbstractResult]):
-        self.read_tokens_from_results(results)
+    def visit_result(self, result: AbstractResult, view: ResultView) -> None:
+        self.read_tokens_from_result(result, view.tokens)
+
+    def finish_visiting(self, results: Dict[str, AbstractResult]) -> None:
         self.calculate_tfidf()
 
     def read_tokens_from_results(self, results: Dict[str, AbstractResult]):
         """Read tokens from results, perform preprocessing and store them locally in self.result_tokens."""
         for _, result in results.items():
-            tokens_as_string = ''
-            
-            for token in result.scanned_tokens:
-                if token.isalpha() and (token.lower() not in self.stopwords) \
-                and (token.lower() not in self.language_specific_stopwords[result.scanned_language.name]):
-                    tokens_as_string += token.lower()
-                    tokens_as_string += ' '
+            self.read_tokens_from_result(result, result.scanned_tokens)
 
-            self.result_tokens[result.unique_name] = tokens_as_string
+    def read_tokens_from_result(self, result: AbstractResult, tokens):
+        language_specific_stopwords = self.language_specific_stopwords[result.scanned_language.name]
+        lowered_tokens = [token.lower() for token in tokens if token.isalpha()]
 
+        # every token is followed by a space, e.g. 'foo bar '
+        self.result_tokens[result.unique_name] = ''.join([f'{token} ' for token in lowered_tokens
+                                                          if token not in self.stopwords and token not in language_specific_stopwords])
 
     def calculate_tfidf(self):
         """this is where the actual calculation of TF-IDF takes place. This is done via scikit-learn and TfidfVectorizer.
@@ -82,35 +84,34 @@ class TFIDFMetric(CodeMetric):
         """
 
         tfidf = TfidfVectorizer()
-        sorted_tfidf = {}
-        
+        min_score = 0.2
+        max_tokens = 7
+
         try:
-            tfidf.fit_transform(self.result_tokens.values())
+            tfidf_matrix = tfidf.fit_transform(self.result_tokens.values()).tocsr()
             feature_names = tfidf.get_feature_names_out()
         except (ValueError, NotFittedError) as ex:
             LOGGER.error(f'something went wrong, skipping metric {self.pretty_metric_name}: {ex}')
             return
-          
-        for name, _ in self.result_tokens.items():
-
-            if not name in sorted_tfidf:
-                sorted_tfidf[name] = {}
-            
-            response = tfidf.transform([self.result_tokens[name]])
-            
-            for col in response.nonzero()[1]:
-                sorted_tfidf[name][feature_names[col]] = response[0, col]
-
-            ordered_tfidf_by_name = {k: v for k, v in sorted(sorted_tfidf[name].items(), key=lambda item: item[1], reverse=True)}
-
-            tfidf_metric_token_dict = {}
-            min_score = 0.2
-            max_tokens = 7
-            count_tokens = 1
-            for key, value in ordered_tfidf_by_name.items():
-                if min_score < value and count_tokens <= max_tokens:
-                    tfidf_metric_token_dict['tag_' + key] = value
-                    count_tokens += 1
+
+        # the rows of the fitted matrix are the tf-idf vectors of all results, so select the top tokens of all rows at once:
+        # keep the scores above min_score, sort by row, descending score and column (same order as sorting each row by score) and take max_tokens per row
+        tfidf_matrix.sort_indices()
+        rows = np.repeat(np.arange(tfidf_matrix.shape[0]), np.diff(tfidf_matrix.indptr))
+        above_min_score = tfidf_matrix.data > min_score
+        rows, columns, scores = rows[above_min_score], tfidf_matrix.indices[above_min_score], tfidf_matrix.data[above_min_score]
+
+        order = np.lexsort((columns, -scores, rows))
+        rows, columns, scores = rows[order], columns[order], scores[order]
+        rank_in_row = np.arange(len(rows)) - np.searchsorted(rows, rows)
+        top_tokens = rank_in_row < max_tokens
+        rows, columns, scores = rows[top_tokens], columns[top_tokens], scores[top_tokens]
+        row_bounds = np.searchsorted(rows, np.arange(tfidf_matrix.shape[0] + 1))
+
+        tag_names = ['tag_' + feature_name for feature_name in feature_names]
+        for row, name in enumerate(self.result_tokens.keys()):
+            start, stop = row_bounds[row], row_bounds[row + 1]
+            tfidf_metric_token_dict = {tag_names[column]: score for column, score in zip(columns[start:stop], scores[start:stop])}
 
             if name in self.local_data:
                 self.local_data[name].update(tfidf_metric_token_dict)
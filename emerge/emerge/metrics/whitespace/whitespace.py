@@ -6,7 +6,6 @@ The implementation is borrowed & adjusted from Adam Tornhill | http://www.adamto
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import Dict
 from enum import auto
 
 import re
@@ -20,12 +19,12 @@ from emerge.log import Logger
 
 # enums and interface/type of the given metric
 from emerge.metrics.abstractmetric import EnumLowerKebabCase
-from emerge.metrics.metrics import CodeMetric
+from emerge.metrics.metrics import VisitorCodeMetric, ResultView
 
 LOGGER = Logger(logging.getLogger('metrics'))
 coloredlogs.install(level='E', logger=LOGGER.logger(), fmt=Logger.log_format)
 
-class WhitespaceMetric(CodeMetric):
+class WhitespaceMetric(VisitorCodeMetric):
     """Provides a code metric based on counting whitespace characters."""
 
     class Keys(EnumLowerKebabCase):
@@ -37,16 +36,19 @@ class WhitespaceMetric(CodeMetric):
         self.leading_tabs_expr = re.compile(r'^(\t+)')
         self.leading_spaces_expr = re.compile(r'^( +)')
         self.empty_line_expr = re.compile(r'^\s*$')
+        self.spaces_expr = re.compile(r' +')
+        self.tabs_expr = re.compile(r'\t+')
 
     @property
     def pretty_metric_name(self) -> str:
         return 'whitespace metric'
     
-    def calculate_from_results(self, results: Dict[str, AbstractResult]):
-        for _, result in results.items():
-            ws_complexity = sum(self.calculate_complexity_in(result.source))
-            result.metrics[self.Keys.WS_COMPLEXITY_IN_FILE.value] = ws_complexity
-            self.local_data[result.unique_name] = {self.Keys.WS_COMPLEXITY_IN_FILE.value: ws_complexity}
+    def visit_result(self, result: AbstractResult, view: ResultView) -> None:
+        ws_complexity = self.cached_metric_value(result, self.Keys.WS_COMPLEXITY_IN_FILE.value)
+        if ws_complexity is None:
+            ws_complexity = sum(self.calculate_complexity_of_lines(view.source_lines))
+        result.metrics[self.Keys.WS_COMPLEXITY_IN_FILE.value] = ws_complexity
+        self.local_data[result.unique_name] = {self.Keys.WS_COMPLEXITY_IN_FILE.value: ws_complexity}
 
     def calulate_from_source(self, source: str) -> float:
         return sum(self.calculate_complexity_in(source))
@@ -54,8 +56,7 @@ class WhitespaceMetric(CodeMetric):
     ### implementation borrowed from Adam Tornhill
 
     def n_log_tabs(self, line):
-        pattern = re.compile(r' +')
-        wo_spaces = re.sub(pattern, '', line)
+        wo_spaces = self.spaces_expr.sub('', line)
         match = self.leading_tabs_expr.search(wo_spaces)
         if match:
             tabs = match.group()
@@ -63,8 +64,7 @@ class WhitespaceMetric(CodeMetric):
         return 0
     
     def n_log_spaces(self, line):
-        pattern = re.compile(r'\t+')
-        wo_tabs = re.sub(pattern, '', line)
+        wo_tabs = self.tabs_expr.sub('', line)
         match = self.leading_spaces_expr.search(wo_tabs)
         if match:
             spaces = match.group()
@@ -75,7 +75,12 @@ class WhitespaceMetric(CodeMetric):
         return not self.empty_line_expr.match(line)
 		
     def complexity_of(self, line):
-        return self.n_log_tabs(line) + (self.n_log_spaces(line) / 4) # hardcoded indentation
+        # same as n_log_tabs(line) + n_log_spaces(line) / 4, both only count the tabs/spaces of the leading indentation
+        indentation = line[:len(line) - len(line.lstrip(' \t'))]
+        return indentation.count('\t') + (indentation.count(' ') / 4) # hardcoded indentation
 
     def calculate_complexity_in(self, source):
-        return [self.complexity_of(line) for line in source.split("\n") if self.contains_code(line)]
+        return self.calculate_complexity_of_lines(source.split("\n"))
+
+    def calculate_complexity_of_lines(self, lines):
+        return [self.complexity_of(line) for line in lines if self.contains_code(line)]
@@ -36,32 +36,40 @@ function nodeNamesHaveChangeCoupling(sourceName, targetName) {
     return false
 }
 
+// the change coupling links of every commit in the date range, if they are exported (git_export_commit_links),
+// otherwise the links of the aggregated change coupling graph over all mined commits
+function changeCouplingLinksForDateRange() {
+    if (commit_metrics.length == 0 || !('links' in commit_metrics[0])) {
+        return file_result_change_coupling_graph.links
+    }
+
+    let couplingLinks = []
+    for (let i = gitMetricsIndexFrom; i < gitMetricsIndexTo; i++) {
+        couplingLinks = couplingLinks.concat(commit_metrics[i].links)
+    }
+    return couplingLinks
+}
+
 function calculateCouplingForDateRange() {
     let totalChangeCouplingDict = {}
     
-    for (let i = gitMetricsIndexFrom; i < gitMetricsIndexTo; i++) {
-        let couplingLinks = commit_metrics[i].links
-        
-        if (couplingLinks.length > 0) {
-            for (nextChangeCouplingDict of couplingLinks) {
-                
-                // source -> target
-                if ( !(nextChangeCouplingDict.source in totalChangeCouplingDict) ) {
-                    totalChangeCouplingDict[nextChangeCouplingDict.source] = new Set();
-                    totalChangeCouplingDict[nextChangeCouplingDict.source].add(nextChangeCouplingDict.target)
-                } else {
-                    totalChangeCouplingDict[nextChangeCouplingDict.source].add(nextChangeCouplingDict.target)
-                }
+    for (nextChangeCouplingDict of changeCouplingLinksForDateRange()) {
                 
-                // target -> source
-                if ( !(nextChangeCouplingDict.target in totalChangeCouplingDict) ) {
-                    totalChangeCouplingDict[nextChangeCouplingDict.target] = new Set();
-                    totalChangeCouplingDict[nextChangeCouplingDict.target].add(nextChangeCouplingDict.source)
-                } else {
-                    totalChangeCouplingDict[nextChangeCouplingDict.target].add(nextChangeCouplingDict.source)
-                } 
-            }
+        // source -> target
+        if ( !(nextChangeCouplingDict.source in totalChangeCouplingDict) ) {
+            totalChangeCouplingDict[nextChangeCouplingDict.source] = new Set();
+            totalChangeCouplingDict[nextChangeCouplingDict.source].add(nextChangeCouplingDict.target)
+        } else {
+            totalChangeCouplingDict[nextChangeCouplingDict.source].add(nextChangeCouplingDict.target)
         }
+        
+        // target -> source
+        if ( !(nextChangeCouplingDict.target in totalChangeCouplingDict) ) {
+            totalChangeCouplingDict[nextChangeCouplingDict.target] = new Set();
+            totalChangeCouplingDict[nextChangeCouplingDict.target].add(nextChangeCouplingDict.source)
+        } else {
+            totalChangeCouplingDict[nextChangeCouplingDict.target].add(nextChangeCouplingDict.source)
+        } 
     }
     return totalChangeCouplingDict
 }
@@ -99,11 +107,19 @@ function calculateWhiteSpaceComplexityForDateRange() {
     return totalWhiteSpaceComplexityDict
 }
 
+// the churn of every author per file in the date range, every commit has a single author of all its changed files
 function calculateAuthorsForDateRange() {
     let totalFileAuthorsDict = {}
     
     for (let i = gitMetricsIndexFrom; i < gitMetricsIndexTo; i++) {
-        let nextFileAuthorsDict = commit_metrics[i].files_author_map
+        if (commit_metrics[i].author === "") {
+            continue
+        }
+
+        let nextFileAuthorsDict = {}
+        for (const filepath of commit_metrics[i].filepaths) {
+            nextFileAuthorsDict[filepath] = {[commit_metrics[i].author]: commit_metrics[i].churn[filepath]}
+        }
         totalFileAuthorsDict = mergeDicts(totalFileAuthorsDict, nextFileAuthorsDict)
     }
     return totalFileAuthorsDict
@@ -656,12 +672,8 @@ function generateChangeCouplingChart() {
 
         let locationColorMap = {}
 
-        for (let i = gitMetricsIndexFrom; i < gitMetricsIndexTo; i++) {
-
         // prepare change coupling data for chart
-        if (commit_metrics[i].links.length > 0) {
-            
-            for (link of commit_metrics[i].links) {
+        for (link of changeCouplingLinksForDateRange()) {
                 
                 const matchingSourceKey = link.source
                 const matchingTargetKey = link.target
@@ -753,11 +765,7 @@ function generateChangeCouplingChart() {
                     flows.push(flow)
                 }                            
                 
-            }
-            
         }
-    
-    }
 
     for (let n = 0; n < locationId; n++) {
         for (let m = 0; m < locationId; m++) {
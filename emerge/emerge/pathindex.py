@@ -0,0 +1,63 @@
+"""
+Contains an index over file paths, that finds the paths another path ends with by a few dictionary lookups instead of comparing every path.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class PathSuffixIndex:
+    """Index of paths by their last path component, to find all indexed paths that are a suffix of a given path.
+    Every indexed path keeps its insertion order, so that ambiguous lookups return the same path as a linear scan over all paths.
+    """
+
+    def __init__(self, paths: Iterable[str] = ()):
+        self._paths_by_last_component: Dict[str, List[Tuple[int, str]]] = {}
+        self._paths_without_separator: Dict[str, int] = {}
+        self._order: Dict[str, int] = {}
+        for path in paths:
+            self.add(path)
+
+    def add(self, path: str) -> None:
+        if path in self._order:
+            return
+        order = len(self._order)
+        self._order[path] = order
+        if '/' in path:
+            self._paths_by_last_component.setdefault(path.rsplit('/', 1)[1], []).append((order, path))
+        else:
+            self._paths_without_separator[path] = order
+
+    def _gen_suffixes(self, path: str) -> Iterator[Tuple[int, str]]:
+        last_component = path.rsplit('/', 1)[-1]
+
+        # an indexed path with a '/' must have the same last component
+        for order, indexed_path in self._paths_by_last_component.get(last_component, ()):
+            if path.endswith(indexed_path):
+                yield order, indexed_path
+
+        # an indexed path without any '/' can be any suffix of the last component (including an empty path)
+        if self._paths_without_separator:
+            for start in range(len(last_component) + 1):
+                order = self._paths_without_separator.get(last_component[start:])
+                if order is not None:
+                    yield order, last_component[start:]
+
+    def suffixes_of(self, path: str) -> List[str]:
+        """Returns all indexed paths that the given path ends with, in insertion order.
+        """
+        return [indexed_path for _, indexed_path in sorted(self._gen_suffixes(path))]
+
+    def first_suffix_of(self, path: str) -> Optional[str]:
+        """Returns the first inserted path that the given path ends with, or None.
+        """
+        first = min(self._gen_suffixes(path), default=None)
+        return first[1] if first is not None else None
+
+    def __contains__(self, path) -> bool:
+        return path in self._order
+
+    def __len__(self) -> int:
+        return len(self._order)
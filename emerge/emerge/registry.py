@@ -0,0 +1,90 @@
+"""
+Contains registries of all parsers and metrics, that import and instantiate them only when an analysis actually needs them.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from typing import Any, Dict, List, Tuple
+from enum import Enum, unique, auto
+
+import importlib
+
+from emerge.languages.abstractparser import AbstractParser, LanguageType, Parser
+
+# parser name -> (language type, module, class name), so that languages can be listed without importing any parser
+PARSER_CLASSES: Dict[str, Tuple[str, str, str]] = {
+    Parser.JAVA_PARSER.name: (LanguageType.JAVA.name, 'emerge.languages.javaparser', 'JavaParser'),
+    Parser.SWIFT_PARSER.name: (LanguageType.SWIFT.name, 'emerge.languages.swiftparser', 'SwiftParser'),
+    Parser.C_PARSER.name: (LanguageType.C.name, 'emerge.languages.cparser', 'CParser'),
+    Parser.CPP_PARSER.name: (LanguageType.CPP.name, 'emerge.languages.cppparser', 'CPPParser'),
+    Parser.GROOVY_PARSER.name: (LanguageType.GROOVY.name, 'emerge.languages.groovyparser', 'GroovyParser'),
+    Parser.JAVASCRIPT_PARSER.name: (LanguageType.JAVASCRIPT.name, 'emerge.languages.javascriptparser', 'JavaScriptParser'),
+    Parser.TYPESCRIPT_PARSER.name: (LanguageType.TYPESCRIPT.name, 'emerge.languages.typescriptparser', 'TypeScriptParser'),
+    Parser.KOTLIN_PARSER.name: (LanguageType.KOTLIN.name, 'emerge.languages.kotlinparser', 'KotlinParser'),
+    Parser.OBJC_PARSER.name: (LanguageType.OBJC.name, 'emerge.languages.objcparser', 'ObjCParser'),
+    Parser.RUBY_PARSER.name: (LanguageType.RUBY.name, 'emerge.languages.rubyparser', 'RubyParser'),
+    Parser.PYTHON_PARSER.name: (LanguageType.PY.name, 'emerge.languages.pyparser', 'PythonParser'),
+    Parser.GO_PARSER.name: (LanguageType.GO.name, 'emerge.languages.goparser', 'GoParser'),
+}
+
+
+@unique
+class MetricType(Enum):
+    NUMBER_OF_METHODS = auto()
+    SOURCE_LINES_OF_CODE = auto()
+    FAN_IN_OUT = auto()
+    LOUVAIN_MODULARITY = auto()
+    TFIDF = auto()
+    WS_COMPLEXITY = auto()
+    GIT = auto()
+
+
+# metric type -> (module, class name), some metric modules depend on expensive packages (e.g. scikit-learn, pydriller, python-louvain)
+METRIC_CLASSES: Dict[MetricType, Tuple[str, str]] = {
+    MetricType.NUMBER_OF_METHODS: ('emerge.metrics.numberofmethods.numberofmethods', 'NumberOfMethodsMetric'),
+    MetricType.SOURCE_LINES_OF_CODE: ('emerge.metrics.sloc.sloc', 'SourceLinesOfCodeMetric'),
+    MetricType.FAN_IN_OUT: ('emerge.metrics.faninout.faninout', 'FanInOutMetric'),
+    MetricType.LOUVAIN_MODULARITY: ('emerge.metrics.modularity.modularity', 'LouvainModularityMetric'),
+    MetricType.TFIDF: ('emerge.metrics.tfidf.tfidf', 'TFIDFMetric'),
+    MetricType.WS_COMPLEXITY: ('emerge.metrics.whitespace.whitespace', 'WhitespaceMetric'),
+    MetricType.GIT: ('emerge.metrics.git.git', 'GitMetrics'),
+}
+
+
+def import_class(module_name: str, class_name: str) -> Any:
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def parser_class(parser_name: str) -> Any:
+    """Imports the module of a parser and returns its class.
+    """
+    _, module_name, class_name = PARSER_CLASSES[parser_name]
+    return import_class(module_name, class_name)
+
+
+def metric_class(metric_type: MetricType) -> Any:
+    """Imports the module of a metric and returns its class.
+    """
+    module_name, class_name = METRIC_CLASSES[metric_type]
+    return import_class(module_name, class_name)
+
+
+def supported_languages() -> List[str]:
+    return [language_type for language_type, _, _ in PARSER_CLASSES.values()]
+
+
+class ParserRegistry(dict):
+    """A dictionary of parsers by parser name, that only contains the parsers that were needed so far.
+    A known parser is imported and instantiated on its first access, so iterating the registry only yields parsers that were used.
+    """
+
+    def __missing__(self, parser_name: str) -> AbstractParser:
+        if parser_name not in PARSER_CLASSES:
+            raise KeyError(parser_name)
+        parser = parser_class(parser_name)()
+        self[parser_name] = parser
+        return parser
+
+    def __contains__(self, parser_name) -> bool:
+        return parser_name in PARSER_CLASSES or dict.__contains__(self, parser_name)
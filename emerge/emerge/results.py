@@ -5,7 +5,7 @@ Defines non-abstract result classes, e.g. FileResult or EntityResult.
 # Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
 # License: MIT
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from pathlib import Path
 import logging
 import coloredlogs
@@ -15,6 +15,7 @@ from emerge.languages.abstractparser import ParsingMixin, CoreParsingKeyword, La
 from emerge.abstractresult import AbstractFileResult, AbstractEntityResult
 from emerge.log import Logger
 from emerge.stats import Statistics
+from emerge.tokens import TokenSequence
 
 LOGGER = Logger(logging.getLogger('parser'))
 coloredlogs.install(level='E', logger=LOGGER.logger(), fmt=Logger.log_format)
@@ -185,11 +186,12 @@ class FileResult(AbstractFileResult, ParsingMixin):
         self._module_name = module_name
         self._scanned_language = scanned_language
         self._scanned_by = scanned_by
-        self._scanned_tokens = scanned_tokens
+        self._scanned_tokens = TokenSequence.from_tokens(scanned_tokens, anaylsis.token_table)  # compact storage, a file result lives for the whole analysis
         self._source = source
         self._preprocessed_source = preprocessed_source
         self._scanned_import_dependencies: List[str] = []
         self._metrics: Dict = {}
+        self._cached_metrics: Dict = {}
 
     def __repr__(self):
         return f'''File result: {self.unique_name},
@@ -240,6 +242,13 @@ class FileResult(AbstractFileResult, ParsingMixin):
     def analysis(self):
         return self._analysis
 
+    @analysis.setter
+    def analysis(self, value):
+        self._analysis = value
+        # e.g. a result created by a parse worker, its tokens are interned into the token table of the analysis it is added to
+        if value is not None:
+            self._scanned_tokens = TokenSequence.from_tokens(self._scanned_tokens, value.token_table)
+
     @property
     def scanned_file_name(self) -> str:
         return self._scanned_file_name
@@ -281,13 +290,21 @@ class FileResult(AbstractFileResult, ParsingMixin):
         return self._scanned_language
 
     @property
-    def scanned_tokens(self) -> List[str]:
+    def scanned_tokens(self) -> TokenSequence:
         return self._scanned_tokens
 
     @property
     def source(self) -> str:
+        # a released source is read again from the scanned file
+        if self._source is None and self._analysis is not None:
+            return self._analysis.read_file_content(str(self._absolute_dir_path / self._scanned_file_name))
         return self._source
 
+    def release_source(self) -> None:
+        """Drops the source of this result from memory once the file is parsed, see source.
+        """
+        self._source = None
+
     @property
     def preprocessed_source(self) -> str:
         return self._preprocessed_source
@@ -308,6 +325,15 @@ class FileResult(AbstractFileResult, ParsingMixin):
     def metrics(self, value):
         self._metrics = value
 
+    @property
+    def cached_metrics(self) -> Dict:
+        """Per-file metric values that were restored from the parse cache, metrics can reuse them instead of recalculating."""
+        return self._cached_metrics
+
+    @cached_metrics.setter
+    def cached_metrics(self, value):
+        self._cached_metrics = value
+
     @property
     def absolute_name(self) -> str:
         return self._absolute_name
@@ -362,7 +388,10 @@ class FileResult(AbstractFileResult, ParsingMixin):
         return "\n".join(filtered_source_lines)
 
     def generate_entity_results_from_scopes(self, entity_keywords, entity_expression, comment_keywords) -> List[EntityResult]:
-        """Generate entity results by extracting everything within a scope that begins with an entity keyword."""
+        """Generate entity results by extracting everything within a scope that begins with an entity keyword.
+        The file is scanned once by token index: an entity header is only parsed up to the next opening scope (which ends every entity expression),
+        and the scope level of every entity that is not closed yet is tracked while scanning.
+        """
         open_scope_character: str = CoreParsingKeyword.OPENING_CURVED_BRACKET.value
         close_scope_character: str = CoreParsingKeyword.CLOSING_CURVED_BRACKET.value
 
@@ -381,37 +410,55 @@ class FileResult(AbstractFileResult, ParsingMixin):
         source_string_no_comments = source_string_no_comments.replace("{}", "")
         source_string_no_comments = source_string_no_comments.replace("{ }", "")
 
-        filtered_list_no_comments = self.preprocess_file_content_and_generate_token_list(source_string_no_comments)
+        tokens = self._as_token_list(self.preprocess_file_content_and_generate_token_list(source_string_no_comments))
+        number_of_tokens = len(tokens)
+
+        # index of the next token (at or after an index) that contains an opening scope, so that an entity header can be parsed from a bounded window
+        next_open_scope_index = [number_of_tokens] * (number_of_tokens + 1)
+        for index in range(number_of_tokens - 1, -1, -1):
+            next_open_scope_index[index] = index if open_scope_character in tokens[index] else next_open_scope_index[index + 1]
+
+        # scope level and tokens of every entity whose scope is not closed yet
+        open_entities: List[Tuple[List[int], List[str]]] = []
 
-        for _, obj, following in self._gen_word_read_ahead(filtered_list_no_comments):
+        for index, obj in enumerate(tokens):
             if obj in entity_keywords:
-                read_ahead_string = self.create_read_ahead_string(obj, following)
+                header_end = next_open_scope_index[index + 1] + 1
+                read_ahead_string = " ".join(tokens[index:header_end])
 
                 try:
                     parsing_result = entity_expression.parseString(read_ahead_string)
                 except pp.ParseException:
                     self.analysis.statistics.increment(Statistics.Key.PARSING_MISSES)
                     LOGGER.warning(f'warning: could not parse result {self=}')
-                    LOGGER.warning(f'next tokens: {[obj] + following[:ParsingMixin.Constants.MAX_DEBUG_TOKENS_READAHEAD.value]}')
-                    continue
-
-                LOGGER.debug(f'entity definition found: {parsing_result.entity_name}')
-                self.analysis.statistics.increment(Statistics.Key.PARSING_HITS)
-
-                scope_level = 0
-                found_entities[parsing_result.entity_name] = []
-                all_tokens = [obj] + following
-                for token in all_tokens:
-                    if token == open_scope_character:
-                        scope_level += 1
-
-                    if token == close_scope_character:
-                        scope_level -= 1
-                        if scope_level == 0:
-                            break
-
-                    if parsing_result.entity_name in found_entities:
-                        found_entities[parsing_result.entity_name].append(token)
+                    LOGGER.warning(f'next tokens: {tokens[index:index + ParsingMixin.Constants.MAX_DEBUG_TOKENS_READAHEAD.value + 1]}')
+                    parsing_result = None
+
+                if parsing_result is not None:
+                    LOGGER.debug(f'entity definition found: {parsing_result.entity_name}')
+                    self.analysis.statistics.increment(Statistics.Key.PARSING_HITS)
+
+                    found_entities[parsing_result.entity_name] = []
+                    open_entities.append(([0], found_entities[parsing_result.entity_name]))
+
+            if not open_entities:
+                continue
+
+            entity_closed = False
+            for scope_level, entity_tokens in open_entities:
+                if obj == open_scope_character:
+                    scope_level[0] += 1
+
+                if obj == close_scope_character:
+                    scope_level[0] -= 1
+                    if scope_level[0] == 0:
+                        entity_closed = True
+                        continue
+
+                entity_tokens.append(obj)
+
+            if entity_closed:
+                open_entities = [x for x in open_entities if x[0][0] != 0]
 
         for entity_name, tokens in found_entities.items():
 
@@ -40,6 +40,15 @@ class Statistics:
         EXTRACTED_ENTITY_RESULTS = auto()
         PARSING_HITS = auto()
         PARSING_MISSES = auto()
+        PARSE_WORKERS = auto()
+        PARSE_CACHE_HITS = auto()
+        PARSE_CACHE_MISSES = auto()
+        PARSE_CACHE_RESOLVED_IMPORTS = auto()
+        PARSE_CACHE_EVICTIONS = auto()
+        GIT_COMMITS_MINED = auto()
+        GIT_HISTORY_CACHE_HITS = auto()
+        GIT_SKIPPED_COMMITS = auto()
+        GIT_SKIPPED_COMMIT_FILES = auto()
         RUNTIME = auto()
 
     def add(self, *, key, value: Any, prefix: str = None) -> None:
@@ -58,3 +67,13 @@ class Statistics:
             self.data[k] = 1
         else:
             self.data[k] += 1
+
+    def merge(self, statistics: 'Statistics') -> None:
+        """Merges the data of another statistics instance into this one, e.g. collected by a worker process.
+        Numeric values are summed up, any other value is only taken if it does not exist yet.
+        """
+        for k, value in statistics.data.items():
+            if k not in self.data:
+                self.data[k] = value
+            elif isinstance(value, int) and isinstance(self.data[k], int):
+                self.data[k] += value
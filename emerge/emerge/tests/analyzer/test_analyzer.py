@@ -0,0 +1,207 @@
+"""
+All unit tests that are related to Analyzer.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+import unittest
+import tempfile
+import subprocess
+import sys
+import os
+from unittest import mock
+
+from tests.testdata.py import PYTHON_TEST_FILES
+from tests.testdata.java import JAVA_TEST_FILES
+
+from emerge.languages.pyparser import PythonParser
+from emerge.languages.javaparser import JavaParser
+from emerge.analyzer import Analyzer
+from emerge.appear import Emerge
+from emerge.graph import GraphType
+from emerge.analysis import Analysis
+from emerge.stats import Statistics
+from emerge.cache import ParseCache
+
+
+# pylint: disable=protected-access
+class AnalyzerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.source_directory = tempfile.TemporaryDirectory()
+        for file_name, file_content in {**PYTHON_TEST_FILES, **JAVA_TEST_FILES}.items():
+            for subdirectory in ['', 'sub']:
+                directory = os.path.join(self.source_directory.name, subdirectory)
+                os.makedirs(directory, exist_ok=True)
+                with open(os.path.join(directory, file_name), 'w', encoding='utf-8') as file:
+                    file.write(file_content)
+
+    def tearDown(self):
+        self.source_directory.cleanup()
+
+    def _create_file_results(self, parse_workers, parse_cache_directory=None) -> Analysis:
+        analysis = Analysis()
+        analysis.analysis_name = "test"
+        analysis.source_directory = self.source_directory.name
+        analysis.only_permit_file_extensions = ['.py', '.java']
+        analysis.parse_workers = parse_workers
+        analysis.parse_cache_directory = parse_cache_directory
+
+        analyzer = Analyzer(None, {PythonParser.parser_name(): PythonParser(), JavaParser.parser_name(): JavaParser()})
+        analyzer._create_filesystem_graph(analysis)
+        analyzer._create_file_results(analysis)
+        analyzer._close_parse_cache(analysis)
+        return analysis
+
+    def test_parallel_file_results_equal_serial_file_results(self):
+        """Create file results serially and with worker processes and check that both are identical."""
+        serial_analysis = self._create_file_results(parse_workers=1)
+        parallel_analysis = self._create_file_results(parse_workers=2)
+
+        self.assertEqual(serial_analysis.statistics.data[Statistics.Key.PARSE_WORKERS.name.lower()], 1)
+        self.assertEqual(parallel_analysis.statistics.data[Statistics.Key.PARSE_WORKERS.name.lower()], 2)
+
+        self.assertTrue(len(serial_analysis.results) == 2 * (len(PYTHON_TEST_FILES) + len(JAVA_TEST_FILES)))
+        self.assertEqual(list(serial_analysis.results.keys()), list(parallel_analysis.results.keys()))
+
+        for name, serial_result in serial_analysis.results.items():
+            parallel_result = parallel_analysis.results[name]
+            self.assertIs(parallel_result.analysis, parallel_analysis)
+            self.assertEqual(list(serial_result.scanned_tokens), list(parallel_result.scanned_tokens))
+            self.assertEqual(serial_result.scanned_import_dependencies, parallel_result.scanned_import_dependencies)
+            self.assertEqual(serial_result.module_name, parallel_result.module_name)
+
+        for key in [Statistics.Key.PARSING_HITS, Statistics.Key.PARSING_MISSES]:
+            self.assertEqual(serial_analysis.statistics.data.get(key.name.lower()),
+                             parallel_analysis.statistics.data.get(key.name.lower()))
+
+    def test_parse_cache_restores_file_results(self):
+        """Create file results twice with a parse cache and check that the second scan restores identical results from the cache."""
+        with tempfile.TemporaryDirectory() as parse_cache_directory:
+            first_analysis = self._create_file_results(parse_workers=1, parse_cache_directory=parse_cache_directory)
+            second_analysis = self._create_file_results(parse_workers=1, parse_cache_directory=parse_cache_directory)
+
+        number_of_files = len(first_analysis.results)
+        self.assertEqual(first_analysis.statistics.data[Statistics.Key.PARSE_CACHE_MISSES.name.lower()], number_of_files)
+        self.assertNotIn(Statistics.Key.PARSE_CACHE_HITS.name.lower(), first_analysis.statistics.data)
+        self.assertEqual(second_analysis.statistics.data[Statistics.Key.PARSE_CACHE_HITS.name.lower()], number_of_files)
+        self.assertNotIn(Statistics.Key.PARSE_CACHE_MISSES.name.lower(), second_analysis.statistics.data)
+
+        self.assertEqual(list(first_analysis.results.keys()), list(second_analysis.results.keys()))
+        for name, first_result in first_analysis.results.items():
+            second_result = second_analysis.results[name]
+            self.assertIs(second_result.analysis, second_analysis)
+            self.assertEqual(first_result.source, second_result.source)
+            self.assertEqual(list(first_result.scanned_tokens), list(second_result.scanned_tokens))
+            self.assertEqual(first_result.scanned_import_dependencies, second_result.scanned_import_dependencies)
+
+    def test_parse_cache_resolves_imports_again_for_other_scanned_files(self):
+        """Add a file that another file imports and check that cached file results are restored, but their imports are resolved again."""
+        with open(os.path.join(self.source_directory.name, 'app.py'), 'w', encoding='utf-8') as file:
+            file.write('from emergeimported import run\n')
+
+        with tempfile.TemporaryDirectory() as parse_cache_directory:
+            first_analysis = self._create_file_results(parse_workers=1, parse_cache_directory=parse_cache_directory)
+            with open(os.path.join(self.source_directory.name, 'emergeimported.py'), 'w', encoding='utf-8') as file:
+                file.write('def run():\n    pass\n')
+            second_analysis = self._create_file_results(parse_workers=1, parse_cache_directory=parse_cache_directory)
+            third_analysis = self._create_file_results(parse_workers=1, parse_cache_directory=parse_cache_directory)
+
+        number_of_files = len(first_analysis.results)
+        number_of_python_files = len([x for x in first_analysis.results.values() if x.scanned_by == PythonParser.parser_name()])
+        self.assertEqual(second_analysis.statistics.data[Statistics.Key.PARSE_CACHE_HITS.name.lower()], number_of_files)
+        self.assertEqual(second_analysis.statistics.data[Statistics.Key.PARSE_CACHE_MISSES.name.lower()], 1)
+        self.assertEqual(second_analysis.statistics.data[Statistics.Key.PARSE_CACHE_RESOLVED_IMPORTS.name.lower()], number_of_python_files)
+        self.assertNotIn(Statistics.Key.PARSE_CACHE_RESOLVED_IMPORTS.name.lower(), third_analysis.statistics.data)
+
+        source_directory_name = os.path.basename(self.source_directory.name)
+        app = f'{source_directory_name}/app.py'
+        self.assertEqual(first_analysis.results[app].scanned_import_dependencies, [f'{source_directory_name}/emergeimported'])
+        self.assertEqual(second_analysis.results[app].scanned_import_dependencies, [f'{source_directory_name}/emergeimported.py'])
+        self.assertEqual(third_analysis.results[app].scanned_import_dependencies, [f'{source_directory_name}/emergeimported.py'])
+
+        uncached_analysis = self._create_file_results(parse_workers=1)
+        for name, uncached_result in uncached_analysis.results.items():
+            self.assertEqual(uncached_result.scanned_import_dependencies, second_analysis.results[name].scanned_import_dependencies)
+
+    def test_parse_cache_configuration_depends_on_installed_python_modules(self):
+        """Change the installed python modules and check that only the parse cache configuration of a python analysis changes."""
+        analysis = Analysis()
+        analysis.source_directory = self.source_directory.name
+        analysis.only_permit_file_extensions = ['.py', '.java']
+        java_analysis = Analysis()
+        java_analysis.source_directory = self.source_directory.name
+        java_analysis.only_permit_file_extensions = ['.java']
+
+        fingerprints = [ParseCache.create_configuration_fingerprint(analysis), ParseCache.create_configuration_fingerprint(java_analysis)]
+        with mock.patch('emerge.languages.pymodules.site_packages_fingerprint', return_value='upgraded site-packages'):
+            self.assertNotEqual(ParseCache.create_configuration_fingerprint(analysis), fingerprints[0])
+            self.assertEqual(ParseCache.create_configuration_fingerprint(java_analysis), fingerprints[1])
+
+    def test_file_contents_are_read_on_demand(self):
+        """Create file results and check that neither filesystem nodes nor file results keep the file contents in memory."""
+        analysis = self._create_file_results(parse_workers=1)
+
+        filesystem_graph = analysis.graph_representations[GraphType.FILESYSTEM_GRAPH.name.lower()]
+        for _, node in filesystem_graph.filesystem_nodes.items():
+            self.assertIsNone(node._content)
+
+        for _, result in analysis.results.items():
+            self.assertIsNone(result._source)
+            file_name = os.path.basename(result.unique_name)
+            self.assertEqual(result.source, {**PYTHON_TEST_FILES, **JAVA_TEST_FILES}[file_name])
+
+        self.assertLessEqual(analysis.file_content_cache.size, analysis.file_content_cache_max_size * 1024 * 1024)
+
+    def test_analyze_returns_analyses_without_export(self):
+        """Run an analysis from an in-memory config and check that results are returned and nothing is exported."""
+        config = {
+            'project_name': 'test',
+            'analyses': [{
+                'analysis_name': 'test_analysis',
+                'source_directory': self.source_directory.name,
+                'only_permit_languages': ['py'],
+                'only_permit_file_extensions': ['.py'],
+                'file_scan': ['number_of_methods', 'source_lines_of_code', 'dependency_graph']
+            }]
+        }
+
+        emerge = Emerge()
+        self.assertEqual(len(emerge._parsers), 0)
+
+        with tempfile.TemporaryDirectory() as working_directory:
+            current_working_directory = os.getcwd()
+            os.chdir(working_directory)
+            try:
+                analyses = emerge.analyze(config)
+            finally:
+                os.chdir(current_working_directory)
+            self.assertEqual(os.listdir(working_directory), [])
+
+        # only the parser of the analyzed language was instantiated
+        self.assertEqual(list(emerge._parsers.keys()), [PythonParser.parser_name()])
+
+        self.assertEqual(len(analyses), 1)
+        analysis = analyses[0]
+        self.assertEqual(len(analysis.get_local_metric_results()), 2 * len(PYTHON_TEST_FILES))
+        self.assertIn('total-sloc-in-files', analysis.get_overall_metric_results())
+        self.assertEqual(analysis.get_statistics()[Statistics.Key.SCANNED_FILES.name.lower()], 2 * len(PYTHON_TEST_FILES))
+        self.assertIn(GraphType.FILESYSTEM_GRAPH.name.lower(), analysis.graph_representations)
+
+        # every Emerge instance has its own configuration
+        self.assertEqual(len(Emerge().config.analyses), 0)
+
+
+    def test_parsers_and_metrics_are_imported_on_demand(self):
+        """Import emerge in a fresh interpreter and check that no parser or metric module is imported before it is needed."""
+        code = 'import sys; from emerge.appear import Emerge; Emerge(); ' \
+            'print(sorted(x for x in sys.modules if x.startswith(("emerge.languages.", "emerge.metrics.", "sklearn", "lizard", "community"))))'
+        emerge_directory = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=emerge_directory).stdout
+
+        self.assertEqual(output.strip(), "['emerge.languages.abstractparser', 'emerge.metrics.abstractmetric']")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -35,6 +35,46 @@ class ConfigurationTestCase(unittest.TestCase):
         self.assertIs(type(self.configuration._yaml_loader), YamlLoader)
         LOGGER.info(f'completed testing of CurrentConfiguration init')
 
+    def test_load_config_from_dict(self):
+        config = {
+            'project_name': 'test',
+            'analyses': [{
+                'analysis_name': 'test_analysis',
+                'source_directory': '/tmp',
+                'only_permit_languages': ['py'],
+                'file_scan': ['number_of_methods']
+            }]
+        }
+        self.configuration.load_config_from_dict(config)
+        self.assertTrue(self.configuration.valid)
+        self.assertEqual(self.configuration.project_name, 'test')
+        self.assertEqual(len(self.configuration.analyses), 1)
+        self.assertEqual(self.configuration.analyses[0].analysis_name, 'test_analysis')
+        self.assertEqual(self.configuration.analyses[0].only_permit_languages, ['py'])
+        self.assertFalse(self.configuration.analyses[0].contains_export)
+
+        self.configuration = Configuration(self.version)
+        self.configuration.load_config_from_dict({'project_name': 'test'})
+        self.assertFalse(self.configuration.valid)
+
+    def test_load_louvain_backend_from_dict(self):
+        config = {
+            'project_name': 'test',
+            'analyses': [{
+                'analysis_name': 'test_analysis',
+                'source_directory': '/tmp',
+                'only_permit_languages': ['py'],
+                'louvain_backend': 'label_propagation',
+                'file_scan': ['louvain_modularity']
+            }]
+        }
+        self.configuration.load_config_from_dict(config)
+        self.assertEqual(self.configuration.analyses[0].louvain_backend, 'label_propagation')
+
+        config['analyses'][0]['louvain_backend'] = 'unknown'
+        with self.assertRaises(Exception):
+            Configuration(self.version).load_config_from_dict(config)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,69 @@
+"""
+All unit tests that are related to FileContentCache.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+import unittest
+import tempfile
+import os
+
+from emerge.content import FileContentCache
+
+
+class FileContentCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.source_directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        for file_name in ['a.py', 'b.py', 'c.py']:
+            path = os.path.join(self.source_directory.name, file_name)
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(file_name * 10)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.source_directory.cleanup()
+
+    def test_least_recently_used_contents_are_evicted(self):
+        """Read more content than fits into the cache and check that the least recently used content is dropped."""
+        cache = FileContentCache(max_size_in_bytes=80)
+        a_path, b_path, c_path = self.paths
+
+        self.assertEqual(cache.read(a_path), 'a.py' * 10)
+        cache.read(b_path)
+        cache.read(a_path)
+        cache.read(c_path)
+
+        self.assertEqual(cache.reads, 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.size, 80)
+
+        cache.read(a_path)
+        self.assertEqual(cache.reads, 3)
+        cache.read(b_path)
+        self.assertEqual(cache.reads, 4)
+
+    def test_changed_file_is_read_again(self):
+        """Change a cached file and check that its new content is returned."""
+        cache = FileContentCache(max_size_in_bytes=1024)
+        path = self.paths[0]
+        cache.read(path)
+
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('changed')
+        os.utime(path, (0, 0))
+
+        self.assertEqual(cache.read(path), 'changed')
+        self.assertEqual(cache.size, len('changed'))
+
+    def test_files_larger_than_the_cache_are_not_cached(self):
+        """Read a file that does not fit into the cache at all."""
+        cache = FileContentCache(max_size_in_bytes=10)
+        self.assertEqual(cache.read(self.paths[0]), 'a.py' * 10)
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
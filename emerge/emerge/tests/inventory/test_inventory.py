@@ -0,0 +1,64 @@
+"""
+All unit tests that are related to RepositoryInventory.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+import unittest
+import tempfile
+import os
+
+from emerge.inventory import RepositoryInventory, ESTIMATED_BYTES_PER_SOURCE_LINE
+
+
+class RepositoryInventoryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.source_directory = tempfile.TemporaryDirectory()
+        files = {
+            'main.py': 'print("main")\n',
+            'pkg/a.py': 'a = 1\n',
+            'pkg/b.js': 'const b = 2;\n',
+            'pkg/sub/c.py': 'c = 3\n',
+            'pkg/sub/notes.txt': 'notes\n',
+            'node_modules/dep/index.js': 'module.exports = {};\n',
+            'empty/.keep': '',
+        }
+        for file_name, file_content in files.items():
+            path = os.path.join(self.source_directory.name, file_name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(file_content)
+
+    def tearDown(self):
+        self.source_directory.cleanup()
+
+    def test_walk_equals_os_walk(self):
+        """Check that walking the inventory yields the same as os.walk."""
+        inventory = RepositoryInventory.scan(self.source_directory.name)
+        self.assertEqual(list(inventory.walk()), list(os.walk(self.source_directory.name)))
+
+    def test_ignored_directories_and_language_statistics(self):
+        """Check that ignored directories are skipped and files, bytes and sloc estimates are counted per language."""
+        inventory = RepositoryInventory.scan(self.source_directory.name, ignore_directories_containing=['node_modules'])
+
+        walked_directories = [os.path.relpath(root, self.source_directory.name) for root, _, _ in inventory.walk()]
+        self.assertNotIn('node_modules', walked_directories)
+        self.assertFalse(any(directory.startswith('node_modules') for directory in walked_directories))
+
+        self.assertEqual(set(inventory.languages.keys()), {'py', 'javascript'})
+        self.assertEqual(inventory.languages['py'].files, 3)
+        self.assertEqual(inventory.languages['javascript'].files, 1)
+        self.assertEqual(inventory.languages['py'].bytes, len('print("main")\n') + 2 * len('a = 1\n'))
+        self.assertEqual(inventory.languages['py'].estimated_sloc, inventory.languages['py'].bytes // ESTIMATED_BYTES_PER_SOURCE_LINE)
+        self.assertEqual(inventory.primary_language(), 'py')
+        self.assertEqual(inventory.primary_language(['javascript', 'go']), 'javascript')
+        self.assertEqual(inventory.number_of_files, 6)
+
+        self.assertTrue(inventory.matches(self.source_directory.name, ['node_modules'], []))
+        self.assertFalse(inventory.matches(self.source_directory.name, [], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
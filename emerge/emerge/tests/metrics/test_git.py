@@ -0,0 +1,215 @@
+"""
+All unit tests that are related to the git metrics and the git history miner.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+import unittest
+import os
+import subprocess
+import tempfile
+import logging
+import coloredlogs
+
+from emerge.analysis import Analysis
+from emerge.graph import GraphType
+from emerge.metrics.git.git import GitMetrics
+from emerge.metrics.git.history import GitHistoryMiner
+from emerge.metrics.metrics import CodeMetricPass, VisitorCodeMetric
+from emerge.metrics.whitespace.whitespace import WhitespaceMetric
+
+LOGGER = logging.getLogger('TESTS')
+coloredlogs.install(level='INFO', logger=LOGGER, fmt='\n%(asctime)s %(name)s %(levelname)s %(message)s')
+
+
+class GitMetricsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.git_directory = os.path.join(self.temporary_directory.name, 'repo')
+        os.makedirs(os.path.join(self.git_directory, 'src'))
+
+        self._git('init', '-q')
+        self._write('src/main.py', 'import helper\n\ndef main():\n    helper.run()\n')
+        self._write('src/helper.py', 'def run():\n    pass\n')
+        self._commit('add main and helper')
+
+        self._write('src/helper.py', 'def run():\n    print("run")\n    return 1\n')
+        self._git('mv', 'src/main.py', 'src/app.py')
+        self._write('README.md', 'not scanned\n')
+        self._commit('rename main to app')
+
+        self._git('rm', '-q', 'src/helper.py')
+        self._commit('delete helper')
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def _git(self, *args):
+        environment = dict(os.environ, GIT_AUTHOR_NAME='emerge', GIT_AUTHOR_EMAIL='emerge@example.com',
+                           GIT_COMMITTER_NAME='emerge', GIT_COMMITTER_EMAIL='emerge@example.com')
+        subprocess.run(['git', '-C', self.git_directory, *args], check=True, capture_output=True, env=environment)
+
+    def _write(self, path, content):
+        with open(os.path.join(self.git_directory, path), 'w', encoding='utf-8') as file:
+            file.write(content)
+
+    def _commit(self, message):
+        self._git('add', '-A')
+        self._git('commit', '-q', '-m', message)
+
+    def _create_analysis(self, parse_cache_directory=None) -> Analysis:
+        analysis = Analysis()
+        analysis.source_directory = os.path.join(self.git_directory, 'src')
+        analysis.git_directory = self.git_directory
+        analysis.only_permit_file_extensions = ['.py']
+        analysis.parse_cache_directory = parse_cache_directory
+        return analysis
+
+    def test_mine_commits_with_renames_and_deletions(self):
+        """Mine the history and check if added, modified, renamed and deleted files are found with their line counts, newest commit first."""
+        miner = GitHistoryMiner.from_analysis(self._create_analysis())
+        commits = list(miner.gen_commits())
+        miner.close()
+
+        self.assertEqual(len(commits), 3)
+        self.assertTrue(all(commit.author_email == 'emerge@example.com' for commit in commits))
+
+        deletion, rename, initial = [{(x.old_path, x.new_path): (x.added_lines, x.deleted_lines) for x in commit.modified_files} for commit in commits]
+        self.assertEqual(deletion, {('src/helper.py', None): (0, 3)})
+        self.assertEqual(rename, {(None, 'README.md'): (1, 0), ('src/helper.py', 'src/helper.py'): (2, 1), ('src/main.py', 'src/app.py'): (0, 0)})
+        self.assertEqual(initial, {(None, 'src/helper.py'): (2, 0), (None, 'src/main.py'): (4, 0)})
+
+    def test_git_metrics_are_restored_from_the_cache(self):
+        """Calculate the git metrics twice with a cache and check if the second analysis does not mine any commit again."""
+        results = {'src/app.py': None, 'src/helper.py': None, 'src/main.py': None}
+
+        with tempfile.TemporaryDirectory() as cache_directory:
+            overall_data = []
+            for _ in range(2):
+                analysis = self._create_analysis(cache_directory)
+                ws_complexity_metric = WhitespaceMetric(analysis)
+                analysis.metrics_for_file_results[ws_complexity_metric.metric_name] = ws_complexity_metric
+
+                git_metrics = GitMetrics(analysis)
+                git_metrics.calculate_from_results(results)
+                overall_data.append((git_metrics.overall_data, analysis.statistics.data))
+
+        (first_data, first_statistics), (second_data, second_statistics) = overall_data
+        self.assertEqual(first_data, second_data)
+        self.assertEqual(first_statistics['git_commits_mined'], 3)
+        self.assertEqual(second_statistics['git_commits_mined'], 0)
+        self.assertEqual(second_statistics['git_history_cache_hits'], 3)
+
+        commit_metrics = first_data[GitMetrics.Keys.COMMIT_METRICS.value]
+        self.assertEqual([x['filepaths'] for x in commit_metrics], [['src/helper.py', 'src/main.py'], ['src/app.py', 'src/helper.py']])
+        self.assertEqual(commit_metrics[1]['churn'], {'src/helper.py': 3, 'src/app.py': 0})
+        self.assertEqual(commit_metrics[1]['ws_complexity'], {'src/helper.py': 2.0, 'src/app.py': 1.0})
+        self.assertNotIn('links', commit_metrics[1])
+
+    def test_commit_links_are_exported_if_requested(self):
+        """Request the links of every commit and check if they link all file results changed together by the commit."""
+        analysis = self._create_analysis()
+        analysis.git_export_commit_links = True
+
+        git_metrics = GitMetrics(analysis)
+        git_metrics.calculate_from_results({'src/app.py': None, 'src/helper.py': None, 'src/main.py': None})
+
+        commit_metrics = git_metrics.overall_data[GitMetrics.Keys.COMMIT_METRICS.value]
+        self.assertEqual([x['links'] for x in commit_metrics], [
+            [{'source': 'src/helper.py', 'target': 'src/main.py', 'temporal': True}],
+            [{'source': 'src/app.py', 'target': 'src/helper.py', 'temporal': True}]
+        ])
+
+    def test_git_metrics_are_calculated_in_a_code_metric_pass(self):
+        """Calculate the git metrics together with a visitor code metric in one pass and check that the commits are mined."""
+        class VisitCountMetric(VisitorCodeMetric):
+            def visit_result(self, result, view):
+                self.overall_data['visits'] = self.overall_data.get('visits', 0) + 1
+
+        analysis = self._create_analysis()
+        git_metrics = GitMetrics(analysis)
+        visit_count_metric = VisitCountMetric(analysis)
+        metric_pass = CodeMetricPass([visit_count_metric, git_metrics])
+        metric_pass.calculate_from_results({'src/app.py': None, 'src/helper.py': None, 'src/main.py': None})
+
+        self.assertEqual(visit_count_metric.overall_data['visits'], 3)
+        self.assertEqual(len(git_metrics.overall_data[GitMetrics.Keys.COMMIT_METRICS.value]), 2)
+
+    def test_commit_paths_are_matched_to_results_by_index(self):
+        """Check if result keys are indexed by their exact path from the git directory, without matching files of the same name elsewhere."""
+        analysis = self._create_analysis()
+        analysis.source_directory = os.path.join(self.git_directory, 'sub', 'src')
+        git_metrics = GitMetrics(analysis)
+        git_metrics.init()
+
+        self.assertEqual(git_metrics.file_result_prefix, 'sub')
+        self.assertEqual(git_metrics.create_result_path_index(['src/sub.py', 'src/lib/sub.py']),
+                         {'sub/src/sub.py': 'src/sub.py', 'sub/src/lib/sub.py': 'src/lib/sub.py'})
+
+        git_metrics = GitMetrics(self._create_analysis())
+        git_metrics.init()
+        result_path_index = git_metrics.create_result_path_index(['src/app.py'])
+        self.assertEqual(result_path_index, {'src/app.py': 'src/app.py'})
+        self.assertNotIn('app.py', result_path_index)
+
+        analysis = self._create_analysis()
+        analysis.source_directory = self.git_directory
+        git_metrics = GitMetrics(analysis)
+        git_metrics.init()
+        result_path_index = git_metrics.create_result_path_index(['repo/pkg/__init__.py', 'repo/__init__.py'])
+        self.assertEqual(result_path_index, {'pkg/__init__.py': 'repo/pkg/__init__.py', '__init__.py': 'repo/__init__.py'})
+
+    def test_commits_with_too_many_files_are_skipped(self):
+        """Limit the number of files per commit and check if larger commits are skipped and counted in the statistics."""
+        analysis = self._create_analysis()
+        analysis.git_max_files_per_commit = 1
+
+        git_metrics = GitMetrics(analysis)
+        git_metrics.calculate_from_results({'src/app.py': None, 'src/helper.py': None, 'src/main.py': None})
+
+        self.assertEqual(git_metrics.overall_data[GitMetrics.Keys.COMMIT_METRICS.value], [])
+        self.assertEqual(analysis.statistics.data['git_skipped_commits'], 2)
+        self.assertEqual(analysis.statistics.data['git_skipped_commit_files'], 4)
+
+    def test_commits_are_aggregated_into_a_change_coupling_graph(self):
+        """Check if the change coupling graph sums up co-changes, commits, churn and authors of the file results over all commits."""
+        self._write('src/app.py', 'def main():\n    pass\n')
+        self._write('src/util.py', 'def util():\n    pass\n')
+        self._git('add', '-A')
+        self._git('-c', 'user.email=other@example.com', 'commit', '-q', '-m', 'change app and add util', '--author', 'other <other@example.com>')
+
+        analysis = self._create_analysis()
+        git_metrics = GitMetrics(analysis)
+        git_metrics.calculate_from_results({'src/app.py': None, 'src/helper.py': None, 'src/main.py': None, 'src/util.py': None})
+
+        digraph = analysis.graph_representations[GraphType.FILE_RESULT_CHANGE_COUPLING_GRAPH.name.lower()].digraph
+        self.assertEqual(sorted(digraph.edges(data='weight')), [
+            ('src/app.py', 'src/helper.py', 1), ('src/app.py', 'src/util.py', 1), ('src/helper.py', 'src/main.py', 1)
+        ])
+
+        app = digraph.nodes['src/app.py']
+        self.assertEqual((app['commits'], app['churn'], app['authors'], app['main_author']), (2, 4, 2, 'other@example.com'))
+        helper = digraph.nodes['src/helper.py']
+        self.assertEqual((helper['commits'], helper['churn'], helper['authors'], helper['main_author']), (2, 5, 1, 'emerge@example.com'))
+
+
+    def test_files_outside_of_the_source_directory_are_not_aggregated(self):
+        """Change a file with the name of a file result outside of the source directory and check if the file result is not credited with it."""
+        self._write('app.py', 'def main():\n    pass\n')
+        self._write('src/util.py', 'def util():\n    pass\n')
+        self._commit('add root app and util')
+
+        analysis = self._create_analysis()
+        git_metrics = GitMetrics(analysis)
+        git_metrics.calculate_from_results({'src/app.py': None, 'src/helper.py': None, 'src/main.py': None, 'src/util.py': None})
+
+        digraph = analysis.graph_representations[GraphType.FILE_RESULT_CHANGE_COUPLING_GRAPH.name.lower()].digraph
+        self.assertEqual(sorted(digraph.edges(data='weight')), [('src/app.py', 'src/helper.py', 1), ('src/helper.py', 'src/main.py', 1)])
+        self.assertEqual((digraph.nodes['src/app.py']['commits'], digraph.nodes['src/app.py']['churn']), (1, 0))
+        self.assertEqual((digraph.nodes['src/util.py']['commits'], digraph.nodes['src/util.py']['churn']), (1, 2))
+        self.assertEqual(git_metrics.overall_data[GitMetrics.Keys.COMMIT_METRICS.value][-1]['filepaths'], ['src/util.py'])
+
+if __name__ == '__main__':
+    unittest.main()
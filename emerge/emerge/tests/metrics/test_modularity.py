@@ -0,0 +1,125 @@
+"""
+All unit tests that are related to the louvain modularity metric.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+import unittest
+import importlib.util
+import sys
+import types
+from unittest import mock
+import logging
+import coloredlogs
+import networkx as nx
+import numpy as np
+import community as community_louvain
+
+from emerge.analysis import Analysis
+from emerge.graph import GraphRepresentation, GraphType
+from emerge.metrics.modularity.modularity import LouvainModularityMetric
+from emerge.metrics.modularity.communities import CompactAdjacency, LabelPropagationBackend, LeidenBackend
+
+LOGGER = logging.getLogger('TESTS')
+coloredlogs.install(level='INFO', logger=LOGGER, fmt='\n%(asctime)s %(name)s %(levelname)s %(message)s')
+
+
+class LouvainModularityTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # a ring of cliques with different sizes, connected by single edges
+        self.digraph = nx.DiGraph()
+        clique_sizes = [8, 3, 6, 4, 5, 7]
+        first_nodes = []
+        for clique, size in enumerate(clique_sizes):
+            nodes = [f'clique{clique}/file{i}.py' for i in range(size)]
+            first_nodes.append(nodes[0])
+            self.digraph.add_edges_from((source, target) for source in nodes for target in nodes if source != target)
+        for clique, node in enumerate(first_nodes):
+            self.digraph.add_edge(node, first_nodes[(clique + 1) % len(first_nodes)])
+
+    def _calculate(self, louvain_seed: int = 0, louvain_workers: int = 1, louvain_backend: str = 'louvain') -> LouvainModularityMetric:
+        analysis = Analysis()
+        analysis.louvain_seed = louvain_seed
+        analysis.louvain_workers = louvain_workers
+        analysis.louvain_backend = louvain_backend
+
+        dependency_graph = GraphRepresentation(GraphType.FILE_RESULT_DEPENDENCY_GRAPH)
+        dependency_graph.digraph = self.digraph
+        metric = LouvainModularityMetric(analysis, {GraphType.FILE_RESULT_DEPENDENCY_GRAPH.name.lower(): dependency_graph})
+        metric.calculate_from_results({})
+        return metric
+
+    def test_communities_are_reproducible_for_a_seed(self):
+        """Calculate the communities serially and in parallel with the same seed and check if they are identical."""
+        serial_metric = self._calculate(louvain_seed=42, louvain_workers=1)
+        parallel_metric = self._calculate(louvain_seed=42, louvain_workers=2)
+
+        self.assertEqual(serial_metric.local_data, parallel_metric.local_data)
+        self.assertEqual(list(serial_metric.local_data), list(parallel_metric.local_data))
+        self.assertEqual(serial_metric.overall_data, parallel_metric.overall_data)
+        self.assertEqual(serial_metric.overall_data, self._calculate(louvain_seed=42).overall_data)
+
+    def _assert_cliques_are_communities_ordered_by_size(self, metric: LouvainModularityMetric):
+        key = 'file_result_dependency_graph_louvain-modularity-in-file'
+
+        community_ids = {name: data[key] for name, data in metric.local_data.items()}
+        self.assertEqual(metric.overall_data[LouvainModularityMetric.Keys.LOUVAIN_COMMUNITIES_DEPENDENCY_GRAPH.value], 6)
+        self.assertEqual([community_ids[f'clique{clique}/file1.py'] for clique in [0, 5, 2, 4, 3, 1]], [0, 1, 2, 3, 4, 5])
+        self.assertEqual(list(metric.overall_data[LouvainModularityMetric.Keys.LOUVAIN_BIGGEST_COMMUNITIES_DEPENDENCY_GRAPH.value].values()),
+                         [round(size / 33, 2) for size in [8, 7, 6, 5, 4]])
+
+    def test_community_ids_are_ordered_by_community_size(self):
+        """Check if the cliques are found as communities and numbered by decreasing size."""
+        self._assert_cliques_are_communities_ordered_by_size(self._calculate())
+
+    def test_label_propagation_backend(self):
+        """Check if the label propagation backend writes the same metric keys as louvain, with a similar modularity and reproducibly for a seed."""
+        metric = self._calculate(louvain_backend='label_propagation')
+        louvain_metric = self._calculate()
+
+        self.assertEqual(metric.overall_data.keys(), louvain_metric.overall_data.keys())
+        self.assertEqual(metric.local_data.keys(), louvain_metric.local_data.keys())
+        self.assertGreaterEqual(metric.overall_data[LouvainModularityMetric.Keys.LOUVAIN_MODULARITY_DEPENDENCY_GRAPH.value],
+                                louvain_metric.overall_data[LouvainModularityMetric.Keys.LOUVAIN_MODULARITY_DEPENDENCY_GRAPH.value] - 0.05)
+        self.assertEqual(metric.local_data, self._calculate(louvain_backend='label_propagation', louvain_workers=2).local_data)
+
+    def test_label_propagation_finds_disconnected_cliques(self):
+        """Remove the edges between the cliques and check if label propagation finds every clique as a community for any seed."""
+        undirected_graph = self.digraph.to_undirected()
+        undirected_graph.remove_edges_from([(source, target) for source, target in undirected_graph.edges() if source.split('/')[0] != target.split('/')[0]])
+        backend = LabelPropagationBackend(undirected_graph)
+
+        for seed in range(5):
+            partition, _ = backend.partition(seed)
+            communities = {}
+            for node, community_id in partition.items():
+                communities.setdefault(community_id, set()).add(node.split('/')[0])
+            self.assertEqual(sorted(len(cliques) for cliques in communities.values()), [1] * 6)
+            self.assertEqual(len(set.union(*communities.values())), 6)
+
+    @unittest.skipUnless(importlib.util.find_spec('leidenalg'), 'the optional package leidenalg is not installed')
+    def test_leiden_backend(self):
+        """Check if the leiden backend finds the cliques as communities."""
+        self._assert_cliques_are_communities_ordered_by_size(self._calculate(louvain_backend='leiden'))
+
+    def test_leiden_backend_needs_leidenalg(self):
+        """Check if the leiden backend can't be created without leidenalg, even if igraph is installed."""
+        with mock.patch.dict(sys.modules, {'igraph': types.ModuleType('igraph'), 'leidenalg': None}):
+            with self.assertRaises(ImportError):
+                LeidenBackend(self.digraph.to_undirected())
+
+    def test_modularity_of_compact_adjacency_equals_python_louvain(self):
+        """Calculate the modularity of a partition on the compact adjacency and check if it equals the modularity by python-louvain, also with self-loops."""
+        undirected_graph = self.digraph.to_undirected()
+        undirected_graph.add_edge('clique0/file0.py', 'clique0/file0.py')
+        undirected_graph.add_edge('clique3/file2.py', 'clique3/file2.py')
+
+        adjacency = CompactAdjacency(undirected_graph)
+        labels = np.array([hash(node.split('/')[0]) % 4 for node in adjacency.nodes])
+        self.assertAlmostEqual(adjacency.modularity(labels), community_louvain.modularity(adjacency.partition(labels), undirected_graph), places=12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -40,6 +40,8 @@ from emerge.languages.abstractparser import AbstractParser
 from emerge.analysis import Analysis
 from emerge.analyzer import Analyzer
 from emerge.metrics.numberofmethods.numberofmethods import NumberOfMethodsMetric
+from emerge.metrics.sloc.sloc import SourceLinesOfCodeMetric
+from emerge.metrics.whitespace.whitespace import WhitespaceMetric
 from emerge.results import FileResult
 
 LOGGER = logging.getLogger('TESTS')
@@ -157,3 +159,27 @@ class NumberOfMethodsTestCase(unittest.TestCase):
         self.analyzer._calculate_code_metric_results(self.analysis)
         self.assertTrue(self.analysis.local_metric_results)
         self.assertTrue(self.analysis.overall_metric_results)
+
+    def test_code_metrics_in_one_pass_equal_separate_calculation(self):
+        """Calculate several code metrics in one pass over the results and check if they equal the metrics calculated one after another."""
+        analyses = [Analysis(), Analysis()]
+
+        for analysis in analyses:
+            analysis.source_directory = "/source"
+            for parser_name, test_data_dict in self.test_data.items():
+                parser = type(self.parsers[parser_name])()
+                for file_name, file_content in test_data_dict.items():
+                    parser.generate_file_result_from_analysis(analysis, file_name=file_name, full_file_path="/source/tests/" + file_name, file_content=file_content)
+                analysis.collect_results_from_parser(parser)
+
+            for metric in [NumberOfMethodsMetric(analysis), SourceLinesOfCodeMetric(analysis), WhitespaceMetric(analysis)]:
+                analysis.metrics_for_file_results[metric.metric_name] = metric
+
+        separate_analysis, one_pass_analysis = analyses
+        for metric in separate_analysis.metrics_for_file_results.values():
+            separate_analysis.calculate_metric(metric)
+        one_pass_analysis.calculate_code_metrics(list(one_pass_analysis.metrics_for_file_results.values()))
+
+        self.assertTrue(one_pass_analysis.local_metric_results)
+        self.assertEqual(separate_analysis.local_metric_results, one_pass_analysis.local_metric_results)
+        self.assertEqual(separate_analysis.overall_metric_results, one_pass_analysis.overall_metric_results)
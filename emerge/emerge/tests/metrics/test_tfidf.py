@@ -155,3 +155,25 @@ class TFIDFTestCase(unittest.TestCase):
         self.assertFalse(self.analysis.overall_metric_results)
         self.analyzer._calculate_code_metric_results(self.analysis)
         self.assertTrue(self.analysis.local_metric_results)
+
+    def test_top_tokens_of_every_result(self):
+        """Calculate tf-idf for several results and check that only the highest scores above the minimum score are kept, in descending order."""
+        self.tfidf_metric.result_tokens = {
+            'first': 'alpha alpha alpha beta gamma delta epsilon zeta eta theta iota kappa lambda ',
+            'second': 'alpha beta beta beta ',
+            'third': 'alpha ',
+            'empty': ''
+        }
+        self.tfidf_metric.calculate_tfidf()
+
+        self.assertEqual(list(self.tfidf_metric.local_data), ['first', 'second', 'third', 'empty'])
+        self.assertEqual(len(self.tfidf_metric.local_data['first']), 7)
+        self.assertEqual(list(self.tfidf_metric.local_data['first'])[0], 'tag_alpha')
+        self.assertEqual(list(self.tfidf_metric.local_data['second']), ['tag_beta', 'tag_alpha'])
+        self.assertEqual(list(self.tfidf_metric.local_data['third']), ['tag_alpha'])
+        self.assertEqual(self.tfidf_metric.local_data['empty'], {})
+
+        for tokens in self.tfidf_metric.local_data.values():
+            scores = list(tokens.values())
+            self.assertEqual(scores, sorted(scores, reverse=True))
+            self.assertTrue(all(score > 0.2 for score in scores))
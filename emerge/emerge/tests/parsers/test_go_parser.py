@@ -6,6 +6,8 @@ All unit tests that are related to GoParser.
 # License: MIT
 
 import unittest
+import tempfile
+import os
 from typing import Dict
 
 from tests.testdata.go import GO_TEST_FILES
@@ -54,3 +56,32 @@ class GoParserTestCase(unittest.TestCase):
             self.assertTrue(result.scanned_file_name.strip())
             self.assertTrue(result.scanned_by.strip())
             self.assertTrue(result.scanned_language == LanguageType.GO)
+
+    def test_imports_are_resolved_to_package_files(self):
+        """Resolve imports to the files of a package that declare used symbols, and to single scanned files."""
+        files = {
+            'greeting/hello.go': 'package greeting\n\nfunc Hello() string {\n\treturn "hello"\n}\n',
+            'greeting/bye.go': 'package greeting\n\ntype Farewell struct {\n\ttext string\n}\n',
+            'cmd/main.go': 'package main\n\nimport (\n\t"fmt"\n\t"example.com/proj/greeting"\n\t"example.com/proj/greeting/bye"\n\t"example.com/proj/missing"\n)\n\n'
+                           'func main() {\n\tfmt.Println(greeting.Hello())\n}\n',
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            source_directory = os.path.join(directory, 'proj')
+            for file_name, file_content in files.items():
+                os.makedirs(os.path.dirname(os.path.join(source_directory, file_name)), exist_ok=True)
+                with open(os.path.join(source_directory, file_name), 'w', encoding='utf-8') as file:
+                    file.write(file_content)
+
+            self.analysis.source_directory = source_directory
+            self.analysis.only_permit_file_extensions = ['.go']
+            self.analysis.create_graph_representation(GraphType.FILESYSTEM_GRAPH)
+            self.analysis.create_filesystem_graph()
+
+            for file_name, file_content in files.items():
+                full_file_path = os.path.join(source_directory, file_name)
+                self.parser.generate_file_result_from_analysis(self.analysis, file_name=os.path.basename(file_name), full_file_path=full_file_path, file_content=file_content)
+            self.parser.after_generated_file_results(self.analysis)
+
+        self.assertEqual(self.parser.results['proj/cmd/main.go'].scanned_import_dependencies, [
+            'fmt', 'proj/greeting/hello.go', 'proj/greeting/bye.go', 'example.com/proj/missing'
+        ])
@@ -74,3 +74,44 @@ class JavaParserTestCase(unittest.TestCase):
             self.assertTrue(result.scanned_file_name.strip())
             self.assertTrue(result.scanned_by.strip())
             self.assertTrue(result.scanned_language == LanguageType.JAVA)
+
+    def test_after_generated_file_results_curates_dependencies(self):
+        """Curate imports of scanned files to their file result names and keep all other imports."""
+        self.analysis.source_directory = "/src/com"
+        files = {
+            "/src/com/facebook/datasource/RetainingDataSourceSupplier.java": self.example_data["RetainingDataSourceSupplier.java"],
+            "/src/com/facebook/common/internal/Supplier.java": "package com.facebook.common.internal;\nimport java.util.Map;\n",
+            "/src/com/facebook/common/executors/CallerThreadExecutor.java": "package com.facebook.common.executors;\n",
+        }
+        for full_file_path, file_content in files.items():
+            self.parser.generate_file_result_from_analysis(self.analysis, file_name=full_file_path.rsplit('/', 1)[-1], full_file_path=full_file_path, file_content=file_content)
+
+        self.parser.after_generated_file_results(self.analysis)
+
+        self.assertEqual(self.parser.results['com/facebook/datasource/RetainingDataSourceSupplier.java'].scanned_import_dependencies, [
+            'com/facebook/common/executors/CallerThreadExecutor.java', 'com/facebook/common/internal/Supplier.java', 'java.util.Collections',
+            'java.util.Set', 'java.util.WeakHashMap', 'javax.annotation.Nullable', 'javax.annotation.concurrent.GuardedBy',
+            'javax.annotation.concurrent.NotThreadSafe'
+        ])
+        self.assertEqual(self.parser.results['com/facebook/common/internal/Supplier.java'].scanned_import_dependencies, ['java.util.Map'])
+
+    def test_generate_entity_results_from_nested_scopes(self):
+        """Extract the tokens of nested entities and ignore an entity keyword without any following scope."""
+        file_content = "package com.example;\n" \
+                       "public class Outer extends Base {\n" \
+                       "    class Inner {\n" \
+                       "        void run() { count = 1; }\n" \
+                       "    }\n" \
+                       "    int count;\n" \
+                       "}\n" \
+                       "class Trailing\n"
+        self.parser.generate_file_result_from_analysis(self.analysis, file_name="Outer.java", full_file_path="/tests/Outer.java", file_content=file_content)
+
+        self.parser.generate_entity_results_from_analysis(self.analysis)
+        self.analysis.collect_results_from_parser(self.parser)
+        # tokens by entity name, without newline tokens
+        entity_tokens = {x.entity_name: [token for token in x.scanned_tokens if token.strip()] for x in self.analysis.entity_results.values()}
+
+        self.assertEqual(list(entity_tokens.keys()), ['Outer', 'Inner'])
+        self.assertEqual(entity_tokens['Inner'], ['class', 'Inner', '{', 'void', 'run', '(', ')', '{', 'count', '=', '1', ';', '}'])
+        self.assertEqual(entity_tokens['Outer'], ['class', 'Outer', 'extends', 'Base', '{'] + entity_tokens['Inner'] + ['}', 'int', 'count', ';'])
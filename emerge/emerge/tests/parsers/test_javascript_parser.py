@@ -48,3 +48,16 @@ class JavaScriptParserTestCase(unittest.TestCase):
             self.assertTrue(result.scanned_file_name.strip())
             self.assertTrue(result.scanned_by.strip())
             self.assertTrue(result.scanned_language == LanguageType.JAVASCRIPT)
+
+    def test_dependencies_are_resolved_against_scanned_files(self):
+        """Resolve imports only by the scanned files of the analysis, none of them exists on disk."""
+        self.analysis.absolute_scanned_file_names = {'tests/app/main.js', 'tests/app/index.js', 'tests/app/util.js', 'tests/shared/model/index.js'}
+
+        file_content = "const index = require('.');\n" \
+                       "const util = require('./util');\n" \
+                       "import { model } from '../shared/model';\n" \
+                       "import React from 'react';\n"
+        self.parser.generate_file_result_from_analysis(self.analysis, file_name='main.js', full_file_path='tests/app/main.js', file_content=file_content)
+
+        result = self.parser.results['tests/app/main.js']
+        self.assertEqual(result.scanned_import_dependencies, ['tests/app/index.js', 'tests/app/util.js', 'tests/shared/model/index.js', 'react'])
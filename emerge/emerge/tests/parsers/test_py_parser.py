@@ -6,11 +6,15 @@ All unit tests that are related to PythonParser.
 # License: MIT
 
 from typing import Dict
+import os
+import sys
+import tempfile
 import unittest
 
 from tests.testdata.py import PYTHON_TEST_FILES
 
 from emerge.languages.pyparser import PythonParser
+from emerge.languages import pymodules
 from emerge.results import FileResult
 from emerge.languages.abstractparser import LanguageType
 from emerge.analysis import Analysis
@@ -48,3 +52,92 @@ class PythonParserTestCase(unittest.TestCase):
             self.assertTrue(result.scanned_file_name.strip())
             self.assertTrue(result.scanned_by.strip())
             self.assertTrue(result.scanned_language == LanguageType.PY)
+
+    def test_scanned_import_dependencies(self):
+        """Generate file results and check the exact import dependencies, so that changes to the import grammars keep the results identical."""
+        self.parser.global_dependency_autodetect_set = {'os', 'sys', 'warnings'}  # independent of the installed packages
+        for file_name, file_content in self.example_data.items():
+            self.parser.generate_file_result_from_analysis(self.analysis, file_name=file_name, full_file_path="/tests/" + file_name, file_content=file_content)
+
+        self.assertEqual(self.parser.results['/tests/types.py'].scanned_import_dependencies, [
+            'tests/imp', 'os', 'sys', 'tests/logs', '/tests/shells.py', '/tests/conf.py', '/tests/const.py',
+            '/tests/exceptions.py', '/tests/utils.py', '/tests/output_readers.py'
+        ])
+        self.assertEqual(self.parser.results['/tests/conf.py'].scanned_import_dependencies, [
+            'tests/imp', 'os', 'sys', 'warnings', 'tests/six', 'tests/const', '/tests/system.py', '/tests/logs.py'
+        ])
+
+    def test_syntax_tree_and_token_imports_are_equal(self):
+        """Extract imports from the syntax tree and from tokens, both must resolve the same dependencies."""
+        self.parser.global_dependency_autodetect_set = {'os', 'sys', 'warnings'}
+        token_parser = PythonParser()
+        token_parser.global_dependency_autodetect_set = {'os', 'sys', 'warnings'}
+        token_parser.syntax_tree_import_extraction = False
+
+        for file_name, file_content in self.example_data.items():
+            self.parser.generate_file_result_from_analysis(self.analysis, file_name=file_name, full_file_path="/tests/" + file_name, file_content=file_content)
+            token_parser.generate_file_result_from_analysis(self.analysis, file_name=file_name, full_file_path="/tests/" + file_name, file_content=file_content)
+
+        for unique_name, result in self.parser.results.items():
+            self.assertEqual(result.scanned_import_dependencies, token_parser.results[unique_name].scanned_import_dependencies)
+
+    def test_imports_from_syntax_tree_with_token_fallback(self):
+        """Extract multi-line and nested imports from the syntax tree and fall back to tokens for files that can not be parsed."""
+        self.parser.global_dependency_autodetect_set = {'json'}
+        multi_line_imports = 'from foo import (\n    bar,\n    baz,\n)\ntry:\n    import json\nexcept ImportError:\n    import simplejson\n'
+        python2_imports = 'import json\nfrom foo import bar\nprint "python 2"\n'
+
+        self.parser.generate_file_result_from_analysis(self.analysis, file_name='a.py', full_file_path='/tests/a.py', file_content=multi_line_imports)
+        self.parser.generate_file_result_from_analysis(self.analysis, file_name='b.py', full_file_path='/tests/b.py', file_content=python2_imports)
+
+        self.assertEqual(self.parser.results['/tests/a.py'].scanned_import_dependencies, ['tests/foo', 'json', 'simplejson'])
+        self.assertEqual(self.parser.results['/tests/b.py'].scanned_import_dependencies, ['json', 'tests/foo'])
+
+    def test_global_modules_are_detected_on_first_use_and_cached(self):
+        """Detect global modules only on first use and load them from the disk cache in a new process."""
+        self.assertIsNone(self.parser._global_dependency_autodetect_set)  # pylint: disable=protected-access
+
+        pymodules._GLOBAL_MODULE_NAMES.clear()  # pylint: disable=protected-access
+        with tempfile.TemporaryDirectory() as cache_directory:
+            global_modules = pymodules.load_global_module_names(cache_directory)
+            self.assertTrue({'os', 'sys', 'json', 'pyparsing'}.issubset(global_modules))
+
+            cache_files = os.listdir(cache_directory)
+            self.assertEqual(len(cache_files), 1)
+            self.assertIn(pymodules.site_packages_fingerprint(), cache_files[0])
+
+            # a new process only knows the cache file
+            pymodules._GLOBAL_MODULE_NAMES.clear()  # pylint: disable=protected-access
+            with open(os.path.join(cache_directory, cache_files[0]), 'w', encoding='utf-8') as cache_file:
+                cache_file.write('["cached_module"]')
+            self.assertEqual(pymodules.load_global_module_names(cache_directory), {'cached_module'})
+            pymodules._GLOBAL_MODULE_NAMES.clear()  # pylint: disable=protected-access
+
+    def test_global_modules_fingerprint_ignores_the_working_directory(self):
+        """Write a file into the working directory on sys.path and check that the fingerprint stays the same, then check that outdated cache files are removed."""
+        current_working_directory = os.getcwd()
+        with tempfile.TemporaryDirectory() as working_directory, tempfile.TemporaryDirectory() as cache_directory:
+            os.chdir(working_directory)
+            sys.path.insert(0, '')
+            try:
+                fingerprint = pymodules.site_packages_fingerprint()
+                with open(os.path.join(working_directory, 'script.py'), 'w', encoding='utf-8') as file:
+                    file.write('print("changed")\n')
+                self.assertEqual(pymodules.site_packages_fingerprint(), fingerprint)
+            finally:
+                sys.path.remove('')
+                os.chdir(current_working_directory)
+
+            outdated_cache_file = f'python-global-modules-{pymodules.interpreter_fingerprint()}-outdated.json'
+            other_interpreter_cache_file = 'python-global-modules-0000000000000000-other.json'
+            for cache_file_name in [outdated_cache_file, other_interpreter_cache_file]:
+                with open(os.path.join(cache_directory, cache_file_name), 'w', encoding='utf-8') as cache_file:
+                    cache_file.write('[]')
+
+            pymodules._GLOBAL_MODULE_NAMES.clear()  # pylint: disable=protected-access
+            pymodules.load_global_module_names(cache_directory)
+            pymodules._GLOBAL_MODULE_NAMES.clear()  # pylint: disable=protected-access
+
+            self.assertEqual(sorted(os.listdir(cache_directory)), sorted([
+                other_interpreter_cache_file, f'python-global-modules-{pymodules.interpreter_fingerprint()}-{fingerprint}.json'
+            ]))
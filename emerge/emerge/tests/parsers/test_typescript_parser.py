@@ -48,3 +48,21 @@ class TypeScriptParserTestCase(unittest.TestCase):
             self.assertTrue(result.scanned_file_name.strip())
             self.assertTrue(result.scanned_by.strip())
             self.assertTrue(result.scanned_language == LanguageType.TYPESCRIPT)
+
+    def test_dependencies_are_resolved_against_scanned_files(self):
+        """Resolve imports only by the scanned files of the analysis (none of them exists on disk) and resolve every import once per directory."""
+        self.analysis.absolute_scanned_file_names = {'tests/app/main.ts', 'tests/app/util/index.ts', 'tests/shared/model.ts', 'tests/lib/index.ts'}
+        self.analysis.import_aliases_available = True
+        self.analysis.import_aliases = {'@lib': 'tests/lib'}
+
+        file_content = "import { a } from './util';\n" \
+                       "import { b } from '../shared/model';\n" \
+                       "import { c } from '@lib';\n" \
+                       "import { d } from '@angular/core';\n" \
+                       "import { e } from './util';\n"
+        self.parser.generate_file_result_from_analysis(self.analysis, file_name='main.ts', full_file_path='tests/app/main.ts', file_content=file_content)
+
+        result = self.parser.results['tests/app/main.ts']
+        self.assertEqual(result.scanned_import_dependencies,
+                         ['tests/app/util/index.ts', 'tests/shared/model.ts', 'tests/lib/index.ts', '@angular/core', 'tests/app/util/index.ts'])
+        self.assertEqual(len(self.parser._resolver.resolved_dependencies), 4)  # pylint: disable=protected-access
@@ -0,0 +1,26 @@
+"""
+All unit tests that are related to PathSuffixIndex.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+import unittest
+
+from emerge.pathindex import PathSuffixIndex
+
+
+class PathSuffixIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.paths = ['src/com/foo/Bar.java', 'com/foo/Bar.java', 'foo/Bar.java', 'Bar.java', 'ar.java', 'com/foo/Baz.java', 'com/foo/Bar.java']
+
+    def test_suffixes_equal_linear_scan(self):
+        """Find all paths that other paths end with and compare them with a linear scan in insertion order."""
+        index = PathSuffixIndex(self.paths)
+        self.assertEqual(len(index), 6)
+
+        for path in ['com/foo/Bar.java', 'x/com/foo/Bar.java', 'oo/Bar.java', 'com/foo/Baz.java', 'Foo.java', 'java', '']:
+            expected = list(dict.fromkeys(x for x in self.paths if path.endswith(x)))
+            self.assertEqual(index.suffixes_of(path), expected)
+            self.assertEqual(index.first_suffix_of(path), expected[0] if expected else None)
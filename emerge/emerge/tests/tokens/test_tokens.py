@@ -0,0 +1,113 @@
+"""
+All unit tests that are related to Tokenizer and TokenSequence.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+import unittest
+import pickle
+
+from tests.testdata.c import C_TEST_FILES
+from tests.testdata.cpp import CPP_TEST_FILES
+from tests.testdata.go import GO_TEST_FILES
+from tests.testdata.groovy import GROOVY_TEST_FILES
+from tests.testdata.java import JAVA_TEST_FILES
+from tests.testdata.javascript import JAVASCRIPT_TEST_FILES
+from tests.testdata.kotlin import KOTLIN_TEST_FILES
+from tests.testdata.objc import OBJC_TEST_FILES
+from tests.testdata.py import PYTHON_TEST_FILES
+from tests.testdata.ruby import RUBY_TEST_FILES
+from tests.testdata.swift import SWIFT_TEST_FILES
+from tests.testdata.typescript import TYPESCRIPT_TEST_FILES
+
+from emerge.languages.abstractparser import ParsingMixin
+from emerge.languages.cparser import CParser
+from emerge.languages.cppparser import CPPParser
+from emerge.languages.goparser import GoParser
+from emerge.languages.groovyparser import GroovyParser
+from emerge.languages.javaparser import JavaParser
+from emerge.languages.javascriptparser import JavaScriptParser
+from emerge.languages.kotlinparser import KotlinParser
+from emerge.languages.objcparser import ObjCParser
+from emerge.languages.pyparser import PythonParser
+from emerge.languages.rubyparser import RubyParser
+from emerge.languages.swiftparser import SwiftParser
+from emerge.languages.typescriptparser import TypeScriptParser
+from emerge.tokens import Tokenizer, TokenSequence, TokenTable
+
+TEST_CORPORA = [C_TEST_FILES, CPP_TEST_FILES, GO_TEST_FILES, GROOVY_TEST_FILES, JAVA_TEST_FILES, JAVASCRIPT_TEST_FILES,
+                KOTLIN_TEST_FILES, OBJC_TEST_FILES, PYTHON_TEST_FILES, RUBY_TEST_FILES, SWIFT_TEST_FILES, TYPESCRIPT_TEST_FILES]
+
+PARSERS = [CParser, CPPParser, GoParser, GroovyParser, JavaParser, JavaScriptParser,
+           KotlinParser, ObjCParser, PythonParser, RubyParser, SwiftParser, TypeScriptParser]
+
+
+class TokenizerTestCase(unittest.TestCase):
+
+    def test_single_pass_equals_replacements(self):
+        """Tokenize all test files with the mappings of all parsers and check that both tokenizers create identical tokens."""
+        mappings = [ParsingMixin.DEFAULT_TOKEN_MAPPINGS] + [parser()._token_mappings for parser in PARSERS]
+        contents = [content for corpus in TEST_CORPORA for content in corpus.values()]
+        contents.append('a....b ...c x::y\r\n\t<<a>>!!\u00a0 "s" \'c\'\n\n')
+
+        for mapping in mappings:
+            tokenizer = Tokenizer(mapping)
+            self.assertIsNotNone(tokenizer.expression)
+            for content in contents:
+                self.assertEqual(tokenizer.tokenize(content), tokenizer.tokenize_by_replacements(content))
+
+    def test_falls_back_to_replacements(self):
+        """Check mappings that can not be tokenized in a single pass."""
+        for mapping in [{'::': ' :: ', ':': ' : '}, {'->': '.'}, {' ': '  '}]:
+            tokenizer = Tokenizer(mapping)
+            self.assertIsNone(tokenizer.expression)
+            self.assertEqual(tokenizer.tokenize('a::b->c d'), tokenizer.tokenize_by_replacements('a::b->c d'))
+
+
+class TokenSequenceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tokens = ParsingMixin.preprocess_file_content_and_generate_token_list(''.join(PYTHON_TEST_FILES.values()))
+        self.token_table = TokenTable()
+        self.token_sequence = TokenSequence(self.tokens, self.token_table)
+
+    def test_behaves_like_the_token_list(self):
+        """Check that iterating, indexing, slicing and searching give the same results as on the original token list."""
+        self.assertEqual(list(self.token_sequence), self.tokens)
+        self.assertEqual(self.token_sequence, self.tokens)
+        self.assertEqual(len(self.token_sequence), len(self.tokens))
+        self.assertEqual(self.token_sequence[3], self.tokens[3])
+        self.assertEqual(self.token_sequence[-1], self.tokens[-1])
+        self.assertEqual(self.token_sequence[5:25], self.tokens[5:25])
+        self.assertEqual(" ".join(self.token_sequence), " ".join(self.tokens))
+        self.assertEqual(self.token_sequence.count('\n'), self.tokens.count('\n'))
+        self.assertIn('import', self.token_sequence)
+        self.assertNotIn('token-that-does-not-occur', self.token_sequence)
+
+    def test_equal_tokens_are_shared(self):
+        """Check that every distinct token string is only stored once per token table."""
+        other_sequence = TokenSequence(list(self.tokens), self.token_table)
+        self.assertIs(self.token_sequence[0], other_sequence[0])
+        self.assertEqual(self.token_sequence.nbytes, 4 * len(self.tokens))
+
+    def test_token_tables_are_independent(self):
+        """Check that sequences of another token table do not add to this table, but are still equal to sequences with the same tokens."""
+        number_of_tokens = len(self.token_table)
+        other_sequence = TokenSequence(self.tokens + ['token-of-another-table'])
+        self.assertEqual(len(self.token_table), number_of_tokens)
+        self.assertNotIn('token-of-another-table', self.token_sequence)
+        self.assertEqual(TokenSequence(self.tokens), self.token_sequence)
+        self.assertNotEqual(other_sequence, self.token_sequence)
+        self.assertIs(TokenSequence.from_tokens(other_sequence, self.token_table).table, self.token_table)
+        self.assertIs(TokenSequence.from_tokens(self.token_sequence, self.token_table), self.token_sequence)
+
+    def test_pickles_as_tokens(self):
+        """Check that a sequence can be handed over to another process."""
+        restored = pickle.loads(pickle.dumps(self.token_sequence))
+        self.assertIsInstance(restored, TokenSequence)
+        self.assertEqual(restored, self.token_sequence)
+
+
+if __name__ == '__main__':
+    unittest.main()
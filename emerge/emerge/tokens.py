@@ -0,0 +1,181 @@
+"""
+Contains a single-pass tokenizer for source files and a compact token representation,
+that stores interned token ids in an array instead of a list of strings.
+"""
+
+# Authors: Grzegorz Lato <grzegorz.lato@gmail.com>
+# License: MIT
+
+from array import array
+from collections.abc import Sequence
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Tuple, Union
+import re
+import threading
+
+
+class Tokenizer:
+    """Splits source code into tokens, after every occurrence of a mapping key was replaced by its mapped value.
+    The result is the same as applying all replacements one after another with str.replace
+    and splitting by re.findall(r'\\S+|\\n'), but if every mapping only separates its key by blanks (e.g. '(' -> ' ( '),
+    all single character keys are separated by one compiled expression in the same pass that finds the tokens.
+    Only multi character keys (e.g. '...') are still replaced beforehand.
+    """
+
+    _tokenizers: Dict[Tuple[Tuple[str, str], ...], 'Tokenizer'] = {}
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.mapping: Dict[str, str] = dict(mapping)
+        self.multi_character_keys: List[str] = [key for key in self.mapping if len(key) > 1]
+        self.expression: Optional[Pattern] = self.compile(self.mapping)
+
+    @classmethod
+    def for_mapping(cls, mapping: Dict[str, str]) -> 'Tokenizer':
+        """Returns a tokenizer for the given mapping, that is only compiled once.
+        """
+        key = tuple(mapping.items())
+        tokenizer = cls._tokenizers.get(key)
+        if tokenizer is None:
+            tokenizer = cls(mapping)
+            cls._tokenizers[key] = tokenizer
+        return tokenizer
+
+    @staticmethod
+    def compile(mapping: Dict[str, str]) -> Optional[Pattern]:
+        """Compiles a single expression that matches a separated character, a run of other non-whitespace characters or a newline.
+        Returns None if the mapping can not be tokenized this way, e.g. if a key is changed or keys share characters.
+        """
+        keys = list(mapping.keys())
+        for key, value in mapping.items():
+            if not key or value != f' {key} ' or any(character.isspace() for character in key):
+                return None
+
+        # a multi character key could be split by a single character replacement, so its replacement would depend on the order
+        for key in keys:
+            if len(key) > 1 and set(''.join(x for x in keys if x != key)).intersection(key):
+                return None
+
+        separated_characters = ''.join(re.escape(key) for key in keys if len(key) == 1)
+        if not separated_characters:
+            return re.compile(r'\S+|\n')
+
+        return re.compile(f'[^\\s{separated_characters}]+|[{separated_characters}\\n]')
+
+    def tokenize(self, content: str) -> List[str]:
+        if self.expression is None:
+            return self.tokenize_by_replacements(content)
+        for key in self.multi_character_keys:
+            content = content.replace(key, self.mapping[key])
+        return self.expression.findall(content)
+
+    def tokenize_by_replacements(self, content: str) -> List[str]:
+        for origin, mapped in self.mapping.items():
+            content = content.replace(origin, mapped)
+        return re.findall(r'\S+|\n', content)
+
+
+class TokenTable:
+    """Interns token strings and maps every distinct token to an integer id.
+    Tokens are never removed, so ids stay valid for the lifetime of the table. Every analysis has its own table (see Analysis.token_table),
+    that is released together with the analysis and its results.
+    """
+
+    def __init__(self):
+        self.tokens: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def id_for(self, token: str) -> int:
+        token_id = self._ids.get(token)
+        if token_id is None:
+            with self._lock:
+                token_id = self._ids.get(token)
+                if token_id is None:
+                    token_id = len(self.tokens)
+                    self.tokens.append(token)
+                    self._ids[token] = token_id
+        return token_id
+
+    def find_id(self, token: str) -> int:
+        """Returns the id of an already interned token or -1.
+        """
+        return self._ids.get(token, -1)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __reduce__(self):
+        # ids are not portable between processes (see TokenSequence.__reduce__), so a table is handed over as a new empty table
+        return (TokenTable, ())
+
+
+class TokenSequence(Sequence):
+    """An immutable sequence of tokens, stored as 4 byte ids into a token table.
+    Every distinct token string exists only once per table, no matter how often it occurs in all scanned files of an analysis.
+    Without a given table, the sequence interns its tokens into a table of its own.
+    Indexing returns tokens, slicing returns a list of tokens (like the token lists of the parsers).
+    """
+
+    __slots__ = ['_ids', '_table']
+
+    def __init__(self, tokens: Iterable[str] = (), table: Optional[TokenTable] = None):
+        self._table = table if table is not None else TokenTable()
+        self._ids = array('I', map(self._table.id_for, tokens))
+
+    @classmethod
+    def from_tokens(cls, tokens: Union['TokenSequence', Iterable[str]], table: Optional[TokenTable] = None) -> 'TokenSequence':
+        """Returns the given tokens as a sequence in the given table, a sequence that already is in this table is returned as it is.
+        """
+        if isinstance(tokens, TokenSequence) and (table is None or tokens.table is table):
+            return tokens
+        return cls(tokens, table)
+
+    @property
+    def table(self) -> TokenTable:
+        return self._table
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(map(self._table.tokens.__getitem__, self._ids[index]))
+        return self._table.tokens[self._ids[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self._table.tokens.__getitem__, self._ids)
+
+    def __contains__(self, token) -> bool:
+        if not isinstance(token, str):
+            return False
+        token_id = self._table.find_id(token)
+        return token_id >= 0 and token_id in self._ids
+
+    def count(self, token) -> int:
+        token_id = self._table.find_id(token) if isinstance(token, str) else -1
+        return self._ids.count(token_id) if token_id >= 0 else 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TokenSequence) and other.table is self._table:
+            return self._ids == other._ids
+        if isinstance(other, TokenSequence):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # token ids are only valid within this process, so pickle the plain tokens and intern them again on unpickling
+        return (TokenSequence, (list(self),))
+
+    def __repr__(self) -> str:
+        preview = list(islice(self, 10))
+        return f'TokenSequence({preview}{", ..." if len(self) > 10 else ""})'
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the token ids in bytes (without the token table).
+        """
+        return self._ids.itemsize * len(self._ids)
@@ -47,6 +47,7 @@ setup(
         "networkx",
         "scikit-learn",
         "numpy",
+        "scipy",
         "prettytable",
         "py",
         "pycodestyle",
@@ -55,9 +56,12 @@ setup(
         "python-louvain",
         "PyYAML",
         "tabulate",
-        "PyDriller",
+        "lizard",
         "pyperclip"
     ],
+    extras_require={
+        "leiden": ["leidenalg"]
+    },
     package_dir={
         "emerge": "emerge",
         "emerge/languages": "./emerge/languages",